@@ -0,0 +1,102 @@
+"""
+Benchmark del códec de sesiones comprimidas.
+
+Graba una sesión realista (acelerómetro, giroscopio y gravedad con
+ruido de sensor, trazos y sacudidas), la comprime con distintos
+cuantos y mide la razón de compresión, el rendimiento de
+codificación y decodificación (MB/s de registros en bruto) y el
+error máximo de reconstrucción.
+
+Uso:
+    python benchmarks/bench_codec.py [--rate HZ] [--seconds S] [--block N]
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import argparse
+import math
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorType, SENSOR_DTYPE
+from recording import SessionRecorder, SessionReader
+from compression import CompressedSessionReader, compress_session
+
+SENSORS = (SensorType.ACCELEROMETER, SensorType.GYROSCOPE, SensorType.GRAVITY)
+
+
+def synthetic_trace(sensor_index: int, rate: float, seconds: float) -> np.ndarray:
+    """Traza SENSOR_DTYPE con gravedad lenta, trazos, sacudidas y ruido."""
+    rng = np.random.default_rng(sensor_index)
+    n = int(rate * seconds)
+    t = np.arange(n) / rate
+    block = np.empty(n, dtype=SENSOR_DTYPE)
+    # Jitter de reloj como en un dispositivo real
+    block["timestamp"] = 1_700_000_000.0 + t + rng.normal(0.0, 20e-6, n)
+    tilt = 0.3 * np.sin(2 * math.pi * 0.05 * t)
+    phase = t % 6.0
+    motion = np.where((phase > 2.0) & (phase < 4.0), 0.4 * np.sin(2 * math.pi * 1.2 * t), 0.0)
+    shake = np.where(phase > 5.2, 1.5 * np.sin(2 * math.pi * 6.0 * t), 0.0)
+    block["x"] = np.sin(tilt) + motion + shake + rng.normal(0.0, 0.004, n)
+    block["y"] = 0.5 * motion + rng.normal(0.0, 0.004, n)
+    block["z"] = -np.cos(tilt) + rng.normal(0.0, 0.004, n)
+    return block
+
+
+def record(path: Path, rate: float, seconds: float) -> None:
+    """Grabar la sesión intercalando bloques de 10 ms de cada sensor."""
+    traces = [synthetic_trace(i, rate, seconds) for i in range(len(SENSORS))]
+    step = max(int(rate / 100), 1)
+    with SessionRecorder(path, SENSORS, rate_hz=rate) as recorder:
+        for start in range(0, len(traces[0]), step):
+            for sensor_type, trace in zip(SENSORS, traces):
+                recorder.record_block(sensor_type, trace[start:start + step])
+
+
+def main():
+    """Ejecutar el benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rate", type=float, default=100.0)
+    parser.add_argument("--seconds", type=float, default=600.0)
+    parser.add_argument("--block", type=int, default=8192)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_path = Path(tmp) / "session.snsr"
+        record(raw_path, args.rate, args.seconds)
+        reader = SessionReader(raw_path)
+        raw = np.array(reader.records)
+        raw_mb = raw.nbytes / 1e6
+        print(f"Registros: {len(raw)}  en bruto: {raw_mb:.1f} MB")
+
+        for value_quantum, level in ((1e-3, 6), (1e-4, 6), (1e-4, 1), (1e-5, 6)):
+            packed_path = Path(tmp) / "session.snsz"
+            start = time.perf_counter()
+            info = compress_session(reader, packed_path, block_records=args.block,
+                                    value_quantum=value_quantum, level=level)
+            encode_s = time.perf_counter() - start
+
+            with CompressedSessionReader(packed_path) as packed:
+                start = time.perf_counter()
+                decoded = np.concatenate(list(packed.iter_blocks()))
+                decode_s = time.perf_counter() - start
+                seek_start = time.perf_counter()
+                packed.read_block(packed.block_for_time(float(raw["timestamp"][len(raw) // 2])))
+                seek_ms = (time.perf_counter() - seek_start) * 1e3
+
+            error = max(float(np.abs(decoded[name] - raw[name]).max()) for name in ("x", "y", "z"))
+            time_error = float(np.abs(decoded["timestamp"] - raw["timestamp"]).max())
+            print(f"cuanto={value_quantum:g} zlib={level}: razón {info['ratio']:.1f}x  "
+                  f"codificar {raw_mb / encode_s:.0f} MB/s  decodificar {raw_mb / decode_s:.0f} MB/s  "
+                  f"salto {seek_ms:.2f} ms  error máx {error:.1e} (t {time_error:.1e} s)")
+
+
+if __name__ == "__main__":
+    main()
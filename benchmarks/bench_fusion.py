@@ -0,0 +1,77 @@
+"""
+Benchmark del coste de la fusión de orientación.
+
+Mide el coste por actualización de MadgwickFilter y MahonyFilter
+(IMU y MARG) por muestra y por bloques, y de OrientationEngine
+completo, y lo compara con el periodo de muestreo objetivo.
+
+Uso:
+    python benchmarks/bench_fusion.py [--rate HZ] [--samples N]
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorManager, SensorType
+from fusion import MadgwickFilter, MahonyFilter, OrientationEngine
+
+
+def report(name: str, elapsed: float, samples: int, rate: float) -> None:
+    """Mostrar el coste por actualización y la fracción del presupuesto."""
+    per_update_us = elapsed / samples * 1e6
+    budget_us = 1e6 / rate
+    print(f"{name:<32} {per_update_us:>8.2f} µs/act  "
+          f"{100 * per_update_us / budget_us:>6.2f}% del periodo a {rate:.0f} Hz")
+
+
+def main():
+    """Ejecutar el benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rate", type=float, default=200.0)
+    parser.add_argument("--samples", type=int, default=20_000)
+    args = parser.parse_args()
+    
+    n = args.samples
+    dt = 1.0 / args.rate
+    rng = np.random.default_rng(0)
+    gyros, accels, mags = rng.normal(size=(3, n, 3))
+    
+    for fusion_cls in (MadgwickFilter, MahonyFilter):
+        for label, mag in (("IMU", None), ("MARG", mags)):
+            fusion = fusion_cls()
+            start = time.perf_counter()
+            for i in range(n):
+                fusion.update(gyros[i], accels[i], None if mag is None else mag[i], dt)
+            report(f"{fusion_cls.__name__} {label} muestra", time.perf_counter() - start, n, args.rate)
+            
+            fusion = fusion_cls()
+            start = time.perf_counter()
+            for i in range(0, n, 50):
+                fusion.update_block(gyros[i:i + 50], accels[i:i + 50],
+                                    None if mag is None else mag[i:i + 50], dt)
+            report(f"{fusion_cls.__name__} {label} bloque 50", time.perf_counter() - start, n, args.rate)
+    
+    manager = SensorManager(history_size=4096)
+    engine = OrientationEngine(manager)
+    timestamps = np.arange(n) * dt
+    start = time.perf_counter()
+    for i in range(0, n, 50):
+        ts = timestamps[i:i + 50]
+        manager.record_batch(SensorType.ACCELEROMETER, *accels[i:i + 50].T, ts)
+        manager.record_batch(SensorType.MAGNETOMETER, *mags[i:i + 50].T, ts)
+        manager.record_batch(SensorType.GYROSCOPE, *gyros[i:i + 50].T, ts)
+    report("OrientationEngine (ingesta incl.)", time.perf_counter() - start, n, args.rate)
+    print(f"OrientationEngine stats: {engine.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark de latencia y memoria de la detección de gestos.
+
+Mide, por muestra, el coste de GestureDetector.process (media y
+percentil 99) y los bytes reservados (tracemalloc) sobre una señal
+realista con quietud, trazos, golpes y sacudidas, y lo compara con
+el periodo de muestreo objetivo.
+
+Uso:
+    python benchmarks/bench_gestures.py [--rate HZ] [--seconds S]
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import argparse
+import math
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gestures import GestureDetector
+
+
+def synthetic_session(rate: float, seconds: float) -> np.ndarray:
+    """Señal (n, 4) x, y, z, t alternando quietud, trazos, taps y sacudidas."""
+    rng = np.random.default_rng(0)
+    n = int(rate * seconds)
+    t = np.arange(n) / rate
+    xyz = rng.normal(0.0, 0.01, (n, 3))
+    phase = (t % 4.0)
+    stroke = (phase >= 1.0) & (phase < 2.0)
+    xyz[stroke] += 0.3 * np.sin(2 * math.pi * 1.5 * t[stroke, None] + [0.0, 1.0, 2.0])
+    shake = (phase >= 3.0) & (phase < 3.8)
+    xyz[shake, 0] += 1.5 * np.sin(2 * math.pi * 5 * t[shake])
+    taps = np.flatnonzero(np.isclose(phase, 2.5, atol=0.5 / rate))
+    xyz[taps, 2] += 2.0
+    return np.column_stack((xyz, t))
+
+
+def main():
+    """Ejecutar el benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rate", type=float, default=200.0)
+    parser.add_argument("--seconds", type=float, default=120.0)
+    args = parser.parse_args()
+    
+    rows = synthetic_session(args.rate, args.seconds).tolist()
+    
+    detector = GestureDetector()
+    costs = np.empty(len(rows))
+    events = 0
+    for i, (x, y, z, t) in enumerate(rows):
+        start = time.perf_counter_ns()
+        events += len(detector.process(x, y, z, t))
+        costs[i] = time.perf_counter_ns() - start
+    
+    detector = GestureDetector()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for x, y, z, t in rows:
+        detector.process(x, y, z, t)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    budget_us = 1e6 / args.rate
+    mean_us = costs.mean() / 1e3
+    p99_us = np.percentile(costs, 99) / 1e3
+    print(f"Muestras: {len(rows)}  eventos: {events}")
+    print(f"Latencia media: {mean_us:.2f} µs  p99: {p99_us:.2f} µs  "
+          f"({100 * p99_us / budget_us:.3f}% del periodo a {args.rate:.0f} Hz)")
+    print(f"Memoria retenida por muestra: {(after - before) / len(rows):.2f} B  "
+          f"pico: {(peak - before) / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark de memoria y construcción de objetos de datos.
+
+Compara SensorData, OSCMessage y MIDIEvent actuales (con __slots__
+y marca de tiempo monotónica) con sus versiones anteriores (dataclass
+con __dict__ y datetime.now() en el constructor): tamaño por objeto,
+memoria asignada por objeto y objetos construidos por segundo.
+
+Uso:
+    python benchmarks/bench_objects.py [--count N]
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorData, SensorType
+from communication import OSCMessage, MIDIEvent
+
+
+@dataclass
+class LegacySensorData:
+    """SensorData anterior: dataclass con __dict__."""
+    type: SensorType
+    x: float
+    y: float
+    z: float
+    timestamp: float
+
+
+class LegacyOSCMessage:
+    """OSCMessage anterior: __dict__ y datetime.now() en el constructor."""
+    
+    def __init__(self, address: str, args: List = None):
+        self.address = address
+        self.args = args or []
+        self.timestamp = datetime.now()
+
+
+class LegacyMIDIEvent:
+    """MIDIEvent anterior: __dict__ y datetime.now() en el constructor."""
+    
+    def __init__(self, note: int, velocity: int, channel: int = 0):
+        self.note = note
+        self.velocity = velocity
+        self.channel = channel
+        self.timestamp = datetime.now()
+
+
+def deep_size(obj) -> int:
+    """Tamaño del objeto más su __dict__ (si lo tiene)."""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def measure(name: str, factory: Callable, count: int) -> None:
+    """
+    Medir tamaño, memoria asignada y ritmo de construcción.
+    
+    Args:
+        name: Nombre a mostrar
+        factory: Función que construye un objeto
+        count: Número de objetos a construir
+    """
+    tracemalloc.start()
+    objects = [factory() for _ in range(count)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    size = deep_size(objects[0])
+    del objects
+    
+    start = time.perf_counter()
+    for _ in range(count):
+        factory()
+    elapsed = time.perf_counter() - start
+    
+    print(f"{name:<20} {size:>8d} B/obj {allocated / count:>10.1f} B asig/obj "
+          f"{count / elapsed / 1e6:>8.2f} M obj/s")
+
+
+def main():
+    """Ejecutar el benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+    
+    accel = SensorType.ACCELEROMETER
+    cases = [
+        ("SensorData (antes)", lambda: LegacySensorData(accel, 0.1, 0.2, 0.3, 1.0)),
+        ("SensorData", lambda: SensorData(accel, 0.1, 0.2, 0.3, 1.0)),
+        ("OSCMessage (antes)", lambda: LegacyOSCMessage("/sensor/accelerometer", [0.1, 0.2, 0.3])),
+        ("OSCMessage", lambda: OSCMessage("/sensor/accelerometer", [0.1, 0.2, 0.3])),
+        ("MIDIEvent (antes)", lambda: LegacyMIDIEvent(60, 100)),
+        ("MIDIEvent", lambda: MIDIEvent(60, 100)),
+    ]
+    for name, factory in cases:
+        measure(name, factory, args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark de codificación OSC.
+
+Compara OscMessageBuilder (construcción y build() por envío) con
+OSCEncoder (plantillas precompiladas por dirección y tipos) en los
+mensajes típicos de la demo: tres floats por sensor. Mide mensajes
+por segundo solo de codificación y de send_osc completo hacia un
+socket UDP local, y el reparto a varios destinos con un send_osc por
+destino frente a un grupo de destinos (add_target_group).
+
+Uso:
+    python benchmarks/bench_osc.py [--messages N] [--targets N]
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import argparse
+import logging
+import socket
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from communication import CommunicationManager, OSCEncoder, OSCMessage, OSC_AVAILABLE
+
+ADDRESSES = ("/sensor/accelerometer", "/sensor/gyroscope", "/sensor/gravity")
+
+
+def encode_builder(count: int) -> float:
+    """Codificar con OscMessageBuilder; devuelve mensajes por segundo."""
+    from pythonosc.osc_message_builder import OscMessageBuilder
+    start = time.perf_counter()
+    for i in range(count):
+        builder = OscMessageBuilder(ADDRESSES[i % 3])
+        for arg in (0.1 * i, 0.2, -0.3):
+            builder.add_arg(arg)
+        builder.build().dgram
+    return count / (time.perf_counter() - start)
+
+
+def encode_templates(count: int) -> float:
+    """Codificar con OSCEncoder; devuelve mensajes por segundo."""
+    encoder = OSCEncoder()
+    start = time.perf_counter()
+    for i in range(count):
+        encoder.encode(ADDRESSES[i % 3], [0.1 * i, 0.2, -0.3])
+    return count / (time.perf_counter() - start)
+
+
+class BuilderEncoder(OSCEncoder):
+    """Codificador con el camino anterior: OscMessageBuilder en cada envío."""
+
+    def encode(self, address, args):
+        return memoryview(self._build(address, args))
+
+
+def send_path(count: int, legacy: bool) -> float:
+    """send_osc completo a un socket local; devuelve mensajes por segundo."""
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+    target = f"127.0.0.1:{receiver.getsockname()[1]}"
+    manager = CommunicationManager()
+    if legacy:
+        manager.osc_encoder = BuilderEncoder()
+    messages = [OSCMessage(ADDRESSES[i % 3], [0.1 * i, 0.2, -0.3]) for i in range(count)]
+    start = time.perf_counter()
+    for message in messages:
+        manager.send_osc(message, target)
+    elapsed = time.perf_counter() - start
+    receiver.close()
+    return count / elapsed
+
+
+def fan_out(count: int, targets: int, grouped: bool) -> float:
+    """Reparto a varios destinos locales; devuelve mensajes por segundo."""
+    receivers = []
+    for _ in range(targets):
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(("127.0.0.1", 0))
+        receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+        receivers.append(receiver)
+    addresses = [f"127.0.0.1:{r.getsockname()[1]}" for r in receivers]
+    manager = CommunicationManager()
+    manager.add_target_group("mirrors", addresses)
+    messages = [OSCMessage(ADDRESSES[i % 3], [0.1 * i, 0.2, -0.3]) for i in range(count)]
+    start = time.perf_counter()
+    for message in messages:
+        if grouped:
+            manager.send_osc(message, "mirrors")
+        else:
+            for target in addresses:
+                manager.send_osc(message, target)
+    elapsed = time.perf_counter() - start
+    for receiver in receivers:
+        receiver.close()
+    return count / elapsed
+
+
+def main():
+    """Ejecutar el benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--targets", type=int, default=4)
+    args = parser.parse_args()
+    if not OSC_AVAILABLE:
+        sys.exit("python-osc no disponible")
+    logging.disable(logging.INFO)
+
+    builder_rate = encode_builder(args.messages)
+    template_rate = encode_templates(args.messages)
+    print(f"Codificación  builder: {builder_rate:>12,.0f} msg/s")
+    print(f"Codificación  plantillas: {template_rate:>9,.0f} msg/s  ({template_rate / builder_rate:.1f}×)")
+
+    count = min(args.messages, 50_000)
+    legacy_rate = send_path(count, legacy=True)
+    fast_rate = send_path(count, legacy=False)
+    print(f"send_osc      builder: {legacy_rate:>12,.0f} msg/s")
+    print(f"send_osc      plantillas: {fast_rate:>9,.0f} msg/s  ({fast_rate / legacy_rate:.1f}×)")
+
+    per_target = fan_out(count, args.targets, grouped=False)
+    grouped = fan_out(count, args.targets, grouped=True)
+    print(f"{args.targets} destinos    por destino: {per_target:>8,.0f} msg/s")
+    print(f"{args.targets} destinos    grupo: {grouped:>14,.0f} msg/s  ({grouped / per_target:.1f}×)")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ Fecha: 2025-10-26
 import sys
 import time
 import logging
+import argparse
+import tempfile
 from pathlib import Path
 
 # Agregar src al path
@@ -18,6 +20,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from sensors import SensorManager, SensorType, SensorData
 from communication import CommunicationManager, OSCMessage, MIDIEvent
+from recording import SessionRecorder
+from replay import SessionReplayer, ReplayMode
 from utils.helpers import normalize_vector, map_value
 
 # Configurar logging
@@ -45,7 +49,8 @@ def sensor_to_osc_callback(data: SensorData):
     )
     
     # Enviar a un receptor OSC (por ejemplo, Pure Data, Max, etc.)
-    comm_manager.send_osc(msg, target="localhost:8000")
+    # Con bundles activos el timetag conserva el instante de la muestra
+    comm_manager.send_osc(msg, target="localhost:8000", timetag=data.timestamp)
     logger.info(f"OSC enviado: {msg}")
 
 
@@ -74,26 +79,47 @@ def sensor_to_midi_callback(data: SensorData):
     logger.info(f"MIDI enviado: {event}")
 
 
-def simulate_sensor_data():
+def record_synthetic_session(path: Path, samples: int = 10, rate_hz: float = 10.0) -> Path:
     """
-    Simula datos de sensores para testing.
+    Graba una sesión sintética de acelerómetro.
     
-    En una app real, estos datos vendrían del dispositivo iOS.
+    En una app real, la sesión se grabaría desde el dispositivo iOS
+    con SessionRecorder.attach(); aquí se generan muestras aleatorias.
+    
+    Args:
+        path: Ruta del archivo de sesión
+        samples: Número de muestras
+        rate_hz: Frecuencia de muestreo simulada
+        
+    Returns:
+        Ruta de la sesión grabada
     """
     import random
     
-    # Simular acelerómetro
-    for i in range(10):
-        data = SensorData(
-            type=SensorType.ACCELEROMETER,
-            x=random.uniform(-2, 2),
-            y=random.uniform(-2, 2),
-            z=random.uniform(-2, 2),
-            timestamp=time.time()
-        )
-        
-        sensor_manager.record_data(SensorType.ACCELEROMETER, data)
-        time.sleep(0.1)  # Simular intervalo de muestreo
+    start = time.time()
+    with SessionRecorder(path, [SensorType.ACCELEROMETER], rate_hz=rate_hz) as recorder:
+        for i in range(samples):
+            data = SensorData(
+                type=SensorType.ACCELEROMETER,
+                x=random.uniform(-2, 2),
+                y=random.uniform(-2, 2),
+                z=random.uniform(-2, 2),
+                timestamp=start + i / rate_hz
+            )
+            recorder.record(SensorType.ACCELEROMETER, data)
+    return path
+
+
+def parse_args():
+    """Argumentos de línea de comandos de la demo."""
+    parser = argparse.ArgumentParser(description="Demo Sensores → OSC/MIDI")
+    parser.add_argument("--session", type=Path, default=None,
+                        help="Sesión grabada a reproducir (por defecto, una sintética)")
+    parser.add_argument("--mode", choices=[m.value for m in ReplayMode],
+                        default=ReplayMode.REALTIME.value, help="Modo de reproducción")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Factor de velocidad en modo scaled")
+    return parser.parse_args()
 
 
 def main():
@@ -101,6 +127,7 @@ def main():
     Función principal que ejecuta la demostración.
     """
     global sensor_manager, comm_manager
+    args = parse_args()
     
     logger.info("=== DEMO: Sensores → OSC/MIDI ===")
     
@@ -108,25 +135,41 @@ def main():
     sensor_manager = SensorManager()
     comm_manager = CommunicationManager()
     
-    # Registrar callbacks
+    # Registrar callbacks (OSC: sin reenviar ruido, máx. 60 mensajes/s)
     sensor_manager.register_callback(
         SensorType.ACCELEROMETER, 
-        sensor_to_osc_callback
+        sensor_to_osc_callback,
+        deadband=0.02,
+        max_rate=60.0
     )
     sensor_manager.register_callback(
         SensorType.ACCELEROMETER,
         sensor_to_midi_callback
     )
     
+    # Un bundle OSC por tick: los callbacks por lotes van tras los de muestra
+    comm_manager.set_bundling(True)
+    sensor_manager.register_callback(
+        SensorType.ACCELEROMETER,
+        lambda sensor_type, block: comm_manager.flush_osc(),
+        batch=True
+    )
+    
     # Iniciar captura
     sensor_manager.start()
     comm_manager.start()
     
-    logger.info("Iniciando captura de sensores...")
-    logger.info("Simulando datos de acelerómetro...")
-    
-    # Simular datos
-    simulate_sensor_data()
+    # Reproducir una sesión grabada (o una sintética)
+    with tempfile.TemporaryDirectory() as tmp:
+        session = args.session or record_synthetic_session(Path(tmp) / "demo.snsr")
+        logger.info(f"Reproduciendo sesión {session} ({args.mode})...")
+        replayer = SessionReplayer(session, sensor_manager, mode=ReplayMode(args.mode),
+                                   speed=args.speed)
+        report = replayer.run()
+    
+    logger.info("\n=== Informe de Reproducción ===")
+    for key, value in report.to_dict().items():
+        logger.info(f"{key}: {value}")
     
     # Mostrar historial
     logger.info("\n=== Historial de Mensajes ===")
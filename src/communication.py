@@ -8,12 +8,42 @@ Autor: Assiz Alcaraz Baxter
 Fecha: 2025-10-26
 """
 
+import asyncio
+import json
 import logging
-from typing import Dict, Optional, List
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, List, Tuple, Union
 from datetime import datetime
 
+from osc_transport import AsyncOSCTransport, OverflowPolicy, parse_target
+
 logger = logging.getLogger(__name__)
 
+# Ancla reloj de pared / reloj monotónico para convertir marcas
+# perf_counter_ns() a datetime solo cuando se necesitan
+_WALL_ANCHOR_NS = time.time_ns()
+_PERF_ANCHOR_NS = time.perf_counter_ns()
+
+
+def _ns_to_datetime(timestamp_ns: int) -> datetime:
+    """
+    Convertir una marca perf_counter_ns() a datetime local.
+    
+    Args:
+        timestamp_ns: Marca de tiempo monotónica en nanosegundos
+        
+    Returns:
+        Fecha y hora equivalente en el reloj de pared
+    """
+    return datetime.fromtimestamp((_WALL_ANCHOR_NS + timestamp_ns - _PERF_ANCHOR_NS) / 1e9)
+
+
 # Intentar importar bibliotecas OSC y MIDI
 try:
     from pythonosc import udp_client
@@ -31,8 +61,256 @@ except ImportError:
     logger.warning("python-rtmidi no disponible, solo envío simulado")
 
 
+# Bundles OSC: 1500 bytes de MTU Ethernet menos cabeceras IPv4 (20) y UDP (8)
+OSC_BUNDLE_MTU = 1472
+OSC_IMMEDIATE = 1                   # Timetag OSC "ejecutar al recibir"
+_NTP_EPOCH_OFFSET = 2208988800      # Segundos entre 1900-01-01 y 1970-01-01
+_BUNDLE_PREFIX = b"#bundle\x00"
+_BUNDLE_HEADER_SIZE = 16            # "#bundle\0" + timetag de 8 bytes
+
+
+def unix_to_timetag(seconds: float) -> int:
+    """
+    Convertir segundos Unix (time.time()) a timetag NTP de 64 bits.
+    
+    Args:
+        seconds: Marca de tiempo Unix en segundos
+        
+    Returns:
+        Timetag NTP (32 bits de segundos, 32 bits de fracción)
+    """
+    whole = int(seconds // 1)
+    fraction = int((seconds - whole) * (1 << 32))
+    return ((whole + _NTP_EPOCH_OFFSET) << 32) | min(fraction, 0xFFFFFFFF)
+
+
+def _ns_to_timetag(timestamp_ns: int) -> int:
+    """Convertir una marca perf_counter_ns() a timetag NTP."""
+    return unix_to_timetag((_WALL_ANCHOR_NS + timestamp_ns - _PERF_ANCHOR_NS) / 1e9)
+
+
+def _encode_bundle(timetag: int, elements: List[bytes]) -> bytes:
+    """Codificar un bundle OSC con sus elementos ya codificados."""
+    parts = [_BUNDLE_PREFIX, struct.pack(">Q", timetag)]
+    for element in elements:
+        parts.append(struct.pack(">i", len(element)))
+        parts.append(element)
+    return b"".join(parts)
+
+
+def pack_osc_bundles(items: List[Tuple[int, bytes]], mtu: int = OSC_BUNDLE_MTU) -> List[bytes]:
+    """
+    Empaquetar mensajes OSC codificados en bundles que caben en la MTU.
+    
+    Los mensajes se ordenan por timetag (de forma estable). Cada
+    datagrama es un bundle cuyo timetag es el del primer mensaje; los
+    mensajes con otro timetag van en sub-bundles anidados con el suyo,
+    de modo que el receptor conserva el tiempo exacto de cada muestra.
+    Un mensaje que por sí solo supera la MTU se envía en su propio
+    bundle.
+    
+    Args:
+        items: Pares (timetag NTP, datagrama del mensaje)
+        mtu: Tamaño máximo de cada datagrama en bytes
+        
+    Returns:
+        Datagramas listos para enviar
+    """
+    groups: List[Tuple[int, List[bytes]]] = []
+    for timetag, dgram in sorted(items, key=lambda item: item[0]):
+        if groups and groups[-1][0] == timetag:
+            groups[-1][1].append(dgram)
+        else:
+            groups.append((timetag, [dgram]))
+    
+    packets = []
+    outer: Optional[int] = None
+    elements: List[bytes] = []
+    size = _BUNDLE_HEADER_SIZE
+    for timetag, dgrams in groups:
+        i = 0
+        while i < len(dgrams):
+            if outer is None:
+                outer, elements, size = timetag, [], _BUNDLE_HEADER_SIZE
+            if timetag == outer:
+                needed = 4 + len(dgrams[i])
+                if elements and size + needed > mtu:
+                    packets.append(_encode_bundle(outer, elements))
+                    outer = None
+                    continue
+                elements.append(dgrams[i])
+                size += needed
+                i += 1
+                continue
+            # Sub-bundle con tantos mensajes de este timetag como quepan
+            room = mtu - size - 4 - _BUNDLE_HEADER_SIZE
+            taken, used = [], 0
+            while i < len(dgrams) and used + 4 + len(dgrams[i]) <= room:
+                taken.append(dgrams[i])
+                used += 4 + len(dgrams[i])
+                i += 1
+            if not taken:
+                packets.append(_encode_bundle(outer, elements))
+                outer = None
+                continue
+            elements.append(_encode_bundle(timetag, taken))
+            size += 4 + _BUNDLE_HEADER_SIZE + used
+    if elements:
+        packets.append(_encode_bundle(outer, elements))
+    return packets
+
+
+def _osc_string(value: str) -> bytes:
+    """Codificar una cadena OSC: ASCII terminada en nulo y alineada a 4 bytes."""
+    raw = value.encode("utf-8")
+    return raw + b"\x00" * (4 - len(raw) % 4)
+
+
+class OSCEncoder:
+    """
+    Codificador OSC con plantillas precompiladas.
+    
+    Las direcciones (/sensor/accelerometer, ...) y la forma de los
+    argumentos no cambian entre envíos, así que para cada par
+    (dirección, tipos de los argumentos) se precompila una vez un
+    struct.Struct con la dirección y los type tags ya alineados como
+    prefijo fijo. Cada mensaje se codifica con un único pack_into
+    sobre un buffer reutilizable, sin OscMessageBuilder. Cada hilo
+    tiene su propio buffer, por lo que encode() puede llamarse desde
+    varios hilos a la vez (p. ej. callbacks de ThreadPoolDispatcher).
+    
+    Las plantillas cubren argumentos float ('f') e int ('i'); el
+    resto de tipos (cadenas, blobs, bool, enteros de 64 bits) se
+    codifican con OscMessageBuilder.
+    """
+    
+    __slots__ = ("max_templates", "_templates", "_local", "hits", "misses", "fallbacks")
+    
+    def __init__(self, max_templates: int = 1024):
+        """
+        Inicializar el codificador.
+        
+        Args:
+            max_templates: Plantillas máximas en caché (se vacía al llenarse)
+        """
+        self.max_templates = max_templates
+        self._templates: Dict[tuple, Optional[Tuple[struct.Struct, bytes]]] = {}
+        # Buffer de trabajo por hilo: una vista no la sobrescribe otro hilo
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+    
+    @staticmethod
+    def _compile(address: str, types: tuple) -> Optional[Tuple[struct.Struct, bytes]]:
+        """Precompilar la plantilla de una firma (None si no es compilable)."""
+        tags = []
+        for arg_type in types:
+            if issubclass(arg_type, bool):
+                return None
+            if issubclass(arg_type, float):
+                tags.append("f")
+            elif issubclass(arg_type, int):
+                tags.append("i")
+            else:
+                return None
+        prefix = _osc_string(address) + _osc_string("," + "".join(tags))
+        # El prefijo va como campo "Ns" del propio Struct: un solo pack_into
+        return struct.Struct(f">{len(prefix)}s{''.join(tags)}"), prefix
+    
+    def _template(self, address: str, args: List) -> Optional[Tuple[struct.Struct, bytes]]:
+        """Obtener (o precompilar) la plantilla de un mensaje."""
+        key = (address, tuple(map(type, args)))
+        template = self._templates.get(key, False)
+        if template is False:
+            self.misses += 1
+            if len(self._templates) >= self.max_templates:
+                self._templates.clear()
+            template = self._compile(address, key[1])
+            self._templates[key] = template
+        else:
+            self.hits += 1
+        return template
+    
+    def encode(self, address: str, args: List) -> memoryview:
+        """
+        Codificar un mensaje en el buffer reutilizable del hilo actual.
+        
+        Args:
+            address: Dirección OSC
+            args: Argumentos del mensaje
+            
+        Returns:
+            Vista del datagrama; es válida hasta la siguiente llamada
+            desde el mismo hilo
+            
+        Raises:
+            ValueError: Si hay argumentos no compilables y python-osc
+                no está disponible
+        """
+        template = self._template(address, args)
+        if template is not None:
+            packer, prefix = template
+            buffer = getattr(self._local, "buffer", None)
+            if buffer is None or packer.size > len(buffer):
+                # Buffer nuevo: las vistas entregadas antes siguen siendo válidas
+                buffer = bytearray(max(packer.size, 256 if buffer is None else 2 * len(buffer)))
+                self._local.buffer = buffer
+            try:
+                packer.pack_into(buffer, 0, prefix, *args)
+                return memoryview(buffer)[:packer.size]
+            except struct.error:
+                pass  # Entero fuera de 32 bits: lo codifica OscMessageBuilder
+        return memoryview(self._build(address, args))
+    
+    def encode_bytes(self, address: str, args: List) -> bytes:
+        """
+        Codificar un mensaje en bytes propios (p. ej. para encolarlo).
+        
+        Args:
+            address: Dirección OSC
+            args: Argumentos del mensaje
+            
+        Returns:
+            Datagrama del mensaje
+        """
+        return bytes(self.encode(address, args))
+    
+    def _build(self, address: str, args: List) -> bytes:
+        """Codificar con OscMessageBuilder (tipos sin plantilla)."""
+        if not OSC_AVAILABLE:
+            raise ValueError(f"Argumentos OSC sin plantilla y python-osc no disponible: {args}")
+        self.fallbacks += 1
+        builder = OscMessageBuilder(address)
+        for arg in args:
+            builder.add_arg(arg)
+        return builder.build().dgram
+
+
+async def _all_sent(gathered) -> bool:
+    """Resolver un envío a grupo: True si todos los destinos lo recibieron."""
+    return all(await gathered)
+
+
+class _Datagram:
+    """Datagrama ya codificado, con la interfaz que espera UDPClient.send()."""
+    
+    __slots__ = ("dgram",)
+    
+    def __init__(self, dgram):
+        self.dgram = dgram
+
+
 class OSCMessage:
-    """Representa un mensaje OSC."""
+    """
+    Representa un mensaje OSC.
+    
+    Usa __slots__ y guarda una marca monotónica en nanosegundos
+    (timestamp_ns); el datetime y su formato ISO se calculan solo
+    al consultarlos.
+    """
+    
+    __slots__ = ("address", "args", "timestamp_ns")
     
     def __init__(self, address: str, args: List = None):
         """
@@ -44,7 +322,12 @@ class OSCMessage:
         """
         self.address = address
         self.args = args or []
-        self.timestamp = datetime.now()
+        self.timestamp_ns = time.perf_counter_ns()
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Marca de tiempo de creación como datetime (calculada al consultar)."""
+        return _ns_to_datetime(self.timestamp_ns)
     
     def to_dict(self) -> Dict:
         """Convertir a diccionario."""
@@ -60,7 +343,14 @@ class OSCMessage:
 
 
 class MIDIEvent:
-    """Representa un evento MIDI."""
+    """
+    Representa un evento MIDI.
+    
+    Igual que OSCMessage, usa __slots__ y una marca monotónica
+    (timestamp_ns) con conversión a datetime bajo demanda.
+    """
+    
+    __slots__ = ("note", "velocity", "channel", "timestamp_ns")
     
     def __init__(self, note: int, velocity: int, channel: int = 0):
         """
@@ -74,7 +364,12 @@ class MIDIEvent:
         self.note = note
         self.velocity = velocity
         self.channel = channel
-        self.timestamp = datetime.now()
+        self.timestamp_ns = time.perf_counter_ns()
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Marca de tiempo de creación como datetime (calculada al consultar)."""
+        return _ns_to_datetime(self.timestamp_ns)
     
     def to_dict(self) -> Dict:
         """Convertir a diccionario."""
@@ -90,6 +385,224 @@ class MIDIEvent:
         return f"MIDI[ch{self.channel}] note={self.note} vel={self.velocity}"
 
 
+class TargetGroup:
+    """
+    Grupo de destinos OSC que reciben el mismo flujo.
+    
+    Las direcciones se resuelven una sola vez al crear el grupo; los
+    envíos reutilizan un socket UDP por familia de direcciones con
+    sendto(), sin clientes por destino.
+    """
+    
+    __slots__ = ("name", "targets", "addresses", "sent", "errors")
+    
+    def __init__(self, name: str, targets: List[str]):
+        """
+        Inicializar el grupo.
+        
+        Args:
+            name: Nombre del grupo (sin ":", para no confundirlo con un destino)
+            targets: Destinos en formato "host:port"
+            
+        Raises:
+            ValueError: Si el nombre, algún destino o su resolución no son válidos
+        """
+        if not name or ":" in name:
+            raise ValueError(f"Nombre de grupo OSC no válido: {name!r}")
+        if not targets:
+            raise ValueError(f"El grupo OSC {name} no tiene destinos")
+        self.name = name
+        self.targets = list(targets)
+        self.addresses: List[Tuple[int, tuple]] = []
+        for target in self.targets:
+            host, port = parse_target(target)
+            try:
+                family, _, _, _, sockaddr = socket.getaddrinfo(host, port, type=socket.SOCK_DGRAM)[0]
+            except socket.gaierror as e:
+                raise ValueError(f"No se pudo resolver el destino OSC {target}: {e}") from e
+            self.addresses.append((family, sockaddr))
+        self.sent = 0
+        self.errors = 0
+
+
+DEFAULT_MESSAGE_HISTORY = 10000
+
+
+class MessageHistory:
+    """
+    Historial de mensajes de capacidad fija con registros compactos.
+    
+    Cada envío guarda una tupla (tipo, dirección o nota, argumentos,
+    marca monotónica en ns, id de destino, enviado); los diccionarios
+    con fecha ISO se construyen solo al leer el historial. Al llenarse
+    se descarta el registro más antiguo.
+    
+    Con spill_path cada registro se añade además a un archivo JSON
+    Lines (con la marca en ns de reloj de pared) para auditorías
+    completas; se lee con read_spill().
+    
+    Se comporta como una secuencia de entradas (len, índices, slices,
+    iteración) en el formato histórico de message_history.
+    """
+    
+    __slots__ = ("capacity", "_records", "_targets", "_target_ids", "spill_path", "_spill")
+    
+    def __init__(self, capacity: int = DEFAULT_MESSAGE_HISTORY,
+                 spill_path: Optional[Union[str, Path]] = None):
+        """
+        Inicializar el historial.
+        
+        Args:
+            capacity: Registros máximos en memoria
+            spill_path: Archivo JSON Lines donde volcar todos los registros
+            
+        Raises:
+            ValueError: Si la capacidad no es positiva
+        """
+        if capacity <= 0:
+            raise ValueError(f"La capacidad debe ser positiva: {capacity}")
+        self.capacity = capacity
+        self._records: deque = deque(maxlen=capacity)
+        self._targets: List[Optional[str]] = []
+        self._target_ids: Dict[Optional[str], int] = {}
+        self.spill_path = Path(spill_path) if spill_path is not None else None
+        self._spill = None
+        self.open()
+    
+    def append(self, kind: str, key, args: tuple, timestamp_ns: int,
+               target: Optional[str], sent: bool) -> tuple:
+        """
+        Añadir un registro.
+        
+        Args:
+            kind: "osc" o "midi"
+            key: Dirección OSC o nota MIDI
+            args: Argumentos OSC o (velocidad, canal) MIDI
+            timestamp_ns: Marca perf_counter_ns() del mensaje
+            target: Destino OSC (None en MIDI)
+            sent: Si el mensaje se envió realmente
+            
+        Returns:
+            Registro compacto añadido
+        """
+        target_id = self._target_ids.get(target)
+        if target_id is None:
+            target_id = len(self._targets)
+            self._targets.append(target)
+            self._target_ids[target] = target_id
+        record = (kind, key, args, timestamp_ns, target_id, sent)
+        self._records.append(record)
+        if self._spill is not None:
+            wall_ns = _WALL_ANCHOR_NS + timestamp_ns - _PERF_ANCHOR_NS
+            self._spill.write(json.dumps([kind, key, list(args), wall_ns, target, sent]) + "\n")
+        return record
+    
+    def to_entry(self, record: tuple) -> Dict:
+        """
+        Materializar un registro en el formato de entrada de historial.
+        
+        Args:
+            record: Registro compacto
+            
+        Returns:
+            Diccionario con type, message, target (solo OSC) y sent
+        """
+        kind, key, args, timestamp_ns, target_id, sent = record
+        return _entry(kind, key, args, _ns_to_datetime(timestamp_ns).isoformat(),
+                      self._targets[target_id], sent)
+    
+    def flush(self) -> None:
+        """Vaciar el búfer del archivo de volcado."""
+        if self._spill is not None:
+            self._spill.flush()
+    
+    def open(self) -> None:
+        """Abrir (o reabrir en modo añadir) el archivo de volcado."""
+        if self.spill_path is not None and self._spill is None:
+            self._spill = open(self.spill_path, "a", encoding="utf-8")
+    
+    def close(self) -> None:
+        """Cerrar el archivo de volcado (open() lo reabre)."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+    
+    def clear(self) -> None:
+        """Vaciar el historial en memoria."""
+        self._records.clear()
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict, List[Dict]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._records))
+            return [self.to_entry(r) for r in islice(self._records, start, stop, step)]
+        return self.to_entry(self._records[index])
+    
+    def __iter__(self) -> Iterator[Dict]:
+        for record in list(self._records):
+            yield self.to_entry(record)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, MessageHistory)):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    __hash__ = None
+
+
+def _entry(kind: str, key, args, timestamp: str, target: Optional[str], sent: bool) -> Dict:
+    """Construir una entrada de historial a partir de sus campos."""
+    if kind == "osc":
+        return {
+            "type": "osc",
+            "message": {"address": key, "args": list(args), "timestamp": timestamp},
+            "target": target,
+            "sent": sent
+        }
+    velocity, channel = args
+    return {
+        "type": "midi",
+        "message": {"note": key, "velocity": velocity, "channel": channel, "timestamp": timestamp},
+        "sent": sent
+    }
+
+
+def read_spill(path: Union[str, Path]) -> Iterator[Dict]:
+    """
+    Leer un volcado de MessageHistory.
+    
+    Args:
+        path: Archivo JSON Lines escrito con spill_path
+        
+    Yields:
+        Entradas en el formato de message_history, en orden de envío
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield record_to_entry(*json.loads(line))
+
+
+def record_to_entry(kind: str, key, args, wall_ns: int, target: Optional[str],
+                    sent: bool) -> Dict:
+    """
+    Construir una entrada de historial a partir de un registro con marca de pared.
+    
+    Args:
+        kind: "osc" o "midi"
+        key: Dirección OSC o nota MIDI
+        args: Argumentos OSC o (velocidad, canal) MIDI
+        wall_ns: Marca de reloj de pared (ns desde la época Unix)
+        target: Destino OSC (None en MIDI)
+        sent: Si el mensaje se envió realmente
+        
+    Returns:
+        Entrada en el formato de message_history
+    """
+    return _entry(kind, key, args, datetime.fromtimestamp(wall_ns / 1e9).isoformat(), target, sent)
+
+
 class CommunicationManager:
     """
     Gestor de comunicación MIDI/OSC.
@@ -98,11 +611,29 @@ class CommunicationManager:
     instalaciones artísticas externas.
     """
     
-    def __init__(self):
-        """Inicializar el gestor de comunicación."""
+    def __init__(self, history_size: int = DEFAULT_MESSAGE_HISTORY,
+                 history_spill: Optional[Union[str, Path]] = None):
+        """
+        Inicializar el gestor de comunicación.
+        
+        Args:
+            history_size: Mensajes máximos en el historial en memoria
+            history_spill: Archivo donde volcar el historial completo
+                (ver MessageHistory)
+        """
         self.osc_clients: Dict[str, any] = {}  # Guardará clientes OSC
         self.midi_output = None  # Guardará salida MIDI
-        self.message_history: List[Dict] = []
+        self.message_history = MessageHistory(history_size, history_spill)
+        self.history_callbacks: List[Callable] = []
+        self.record_callbacks: List[Callable] = []
+        self.bundling = False
+        self.bundle_mtu = OSC_BUNDLE_MTU
+        self._pending_osc: Dict[str, List[Tuple[int, bytes]]] = {}
+        self.osc_stats = {"messages": 0, "datagrams": 0}
+        self.osc_encoder = OSCEncoder()
+        self.osc_transport: Optional[AsyncOSCTransport] = None
+        self.target_groups: Dict[str, TargetGroup] = {}
+        self._group_sockets: Dict[int, socket.socket] = {}
         self.is_active = False
         
         # Inicializar MIDI si está disponible
@@ -148,39 +679,280 @@ class CommunicationManager:
             logger.error(f"Error creando cliente OSC para {target}: {e}")
             return None
     
-    def send_osc(self, message: OSCMessage, target: str = "localhost:8000") -> None:
+    def add_target_group(self, name: str, targets: List[str]) -> TargetGroup:
+        """
+        Registrar un grupo de destinos OSC.
+        
+        Después, send_osc(), send_osc_async() y los bundles aceptan el
+        nombre del grupo como target: el mensaje se codifica una vez,
+        se envía a todos los destinos y deja un solo registro en el
+        historial.
+        
+        Args:
+            name: Nombre del grupo
+            targets: Destinos en formato "host:port"
+            
+        Returns:
+            Grupo registrado (reemplaza a uno anterior con el mismo nombre)
+            
+        Raises:
+            ValueError: Si el nombre o algún destino no son válidos
+        """
+        group = TargetGroup(name, targets)
+        for family, _ in group.addresses:
+            self._group_socket(family)
+        self.target_groups[name] = group
+        logger.info(f"Grupo OSC {name} registrado: {', '.join(group.targets)}")
+        return group
+    
+    def remove_target_group(self, name: str) -> bool:
+        """
+        Eliminar un grupo de destinos.
+        
+        Los mensajes del grupo pendientes de empaquetar en bundles se
+        envían antes de eliminarlo.
+        
+        Args:
+            name: Nombre del grupo
+            
+        Returns:
+            True si el grupo estaba registrado
+        """
+        group = self.target_groups.get(name)
+        if group is None:
+            return False
+        items = self._pending_osc.pop(name, None)
+        if items:
+            sent = 0
+            for packet in pack_osc_bundles(items, self.bundle_mtu):
+                sent += self._send_to_group(group, packet)
+            self.osc_stats["datagrams"] += sent
+        del self.target_groups[name]
+        return True
+    
+    def _group_socket(self, family: int) -> socket.socket:
+        """Obtener (o abrir) el socket no bloqueante de una familia de direcciones."""
+        sock = self._group_sockets.get(family)
+        if sock is None:
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            sock.setblocking(False)
+            self._group_sockets[family] = sock
+        return sock
+    
+    def _send_to_group(self, group: TargetGroup, dgram) -> int:
+        """
+        Enviar un datagrama ya codificado a todos los destinos de un grupo.
+        
+        Returns:
+            Destinos a los que se entregó el datagrama
+        """
+        sockets = self._group_sockets
+        delivered = 0
+        for family, sockaddr in group.addresses:
+            try:
+                sock = sockets.get(family) or self._group_socket(family)
+                sock.sendto(dgram, sockaddr)
+                delivered += 1
+            except OSError as e:
+                # Socket lleno (BlockingIOError) o destino inalcanzable
+                group.errors += 1
+                logger.debug(f"Error enviando OSC al grupo {group.name} ({sockaddr}): {e}")
+        group.sent += delivered
+        return delivered
+    
+    def _send_osc_group(self, message: OSCMessage, group: TargetGroup,
+                        timetag: Optional[float]) -> None:
+        """Enviar (o encolar en bundle) un mensaje a un grupo de destinos."""
+        try:
+            self.osc_stats["messages"] += 1
+            if self.bundling:
+                tag = (unix_to_timetag(timetag) if timetag is not None
+                       else _ns_to_timetag(message.timestamp_ns))
+                dgram = self.osc_encoder.encode_bytes(message.address, message.args)
+                self._pending_osc.setdefault(group.name, []).append((tag, dgram))
+                sent = True
+            else:
+                delivered = self._send_to_group(group, self.osc_encoder.encode(message.address,
+                                                                               message.args))
+                self.osc_stats["datagrams"] += delivered
+                sent = delivered > 0
+            self._record_history("osc", message.address, tuple(message.args),
+                                 message.timestamp_ns, group.name, sent)
+        except Exception as e:
+            logger.error(f"Error enviando OSC al grupo {group.name}: {e}")
+    
+    def send_osc(self, message: OSCMessage, target: str = "localhost:8000",
+                 timetag: Optional[float] = None) -> None:
         """
         Enviar mensaje OSC.
         
+        Con el modo bundle activo (ver set_bundling) el mensaje se
+        acumula por destino y se envía en la siguiente llamada a
+        flush_osc() dentro de un bundle con timetag NTP.
+        
         Args:
             message: Mensaje OSC a enviar
-            target: Destino en formato "host:port"
+            target: Destino en formato "host:port" o nombre de un grupo
+                (ver add_target_group)
+            timetag: Instante del mensaje en segundos Unix (p. ej. el
+                timestamp de la muestra); por defecto, su creación
         """
+        group = self.target_groups.get(target)
+        if group is not None:
+            self._send_osc_group(message, group, timetag)
+            return
         try:
             logger.info(f"Enviando OSC: {message}")
             
             # Intentar envío real si está disponible
             client = self._get_or_create_osc_client(target)
             if client is not None and OSC_AVAILABLE:
-                builder = OscMessageBuilder(message.address)
-                for arg in message.args:
-                    builder.add_arg(arg)
-                osc_msg = builder.build()
-                client.send(osc_msg)
-                logger.debug(f"OSC enviado realmente a {target}")
+                self.osc_stats["messages"] += 1
+                if self.bundling:
+                    tag = (unix_to_timetag(timetag) if timetag is not None
+                           else _ns_to_timetag(message.timestamp_ns))
+                    dgram = self.osc_encoder.encode_bytes(message.address, message.args)
+                    self._pending_osc.setdefault(target, []).append((tag, dgram))
+                    logger.debug(f"OSC encolado para bundle a {target}")
+                else:
+                    client.send(_Datagram(self.osc_encoder.encode(message.address, message.args)))
+                    self.osc_stats["datagrams"] += 1
+                    logger.debug(f"OSC enviado realmente a {target}")
             else:
                 logger.debug(f"OSC simulado (sin cliente real)")
             
             # Registrar en historial
-            self.message_history.append({
-                "type": "osc",
-                "message": message.to_dict(),
-                "target": target,
-                "sent": client is not None
-            })
+            self._record_history("osc", message.address, tuple(message.args),
+                                 message.timestamp_ns, target, client is not None)
         except Exception as e:
             logger.error(f"Error enviando OSC: {e}")
     
+    async def start_async(self, maxsize: int = 4096,
+                          policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST) -> None:
+        """
+        Iniciar la comunicación con el transporte OSC asíncrono.
+        
+        Debe llamarse dentro del bucle de eventos que enviará los
+        mensajes de send_osc_async().
+        
+        Args:
+            maxsize: Capacidad de la cola de cada destino
+            policy: Política de desbordamiento de las colas
+        """
+        if self.osc_transport is None:
+            self.osc_transport = AsyncOSCTransport(maxsize, policy)
+        await self.osc_transport.start()
+        self.start()
+    
+    async def stop_async(self, drain: bool = True) -> None:
+        """
+        Detener el transporte OSC asíncrono y la comunicación.
+        
+        Args:
+            drain: Si True, enviar lo pendiente antes de cerrar
+        """
+        if self.osc_transport is not None:
+            await self.osc_transport.stop(drain)
+        self.stop()
+    
+    def send_osc_async(self, message: OSCMessage, target: str = "localhost:8000",
+                       wait: bool = False) -> Optional[asyncio.Future]:
+        """
+        Enviar mensaje OSC por el transporte asíncrono sin bloquear.
+        
+        El mensaje se codifica y se encola en la cola del destino; la
+        tarea del destino lo envía. Sin wait puede llamarse desde
+        cualquier hilo (p. ej. un callback de sensor). Con wait debe
+        llamarse en el hilo del bucle y devuelve un futuro que se
+        resuelve con True al entregar el datagrama al socket (False
+        si la cola lo descartó).
+        
+        Args:
+            message: Mensaje OSC a enviar
+            target: Destino en formato "host:port" o nombre de un grupo
+                (un futuro por destino del grupo, agrupados con gather)
+            wait: Si True, devolver un futuro esperable
+            
+        Returns:
+            Futuro del envío con wait, None sin wait
+            
+        Raises:
+            RuntimeError: Si el transporte asíncrono no está iniciado
+        """
+        transport = self.osc_transport
+        if transport is None or not transport.is_running:
+            raise RuntimeError("Transporte OSC asíncrono no iniciado (ver start_async)")
+        dgram = self.osc_encoder.encode_bytes(message.address, message.args)
+        group = self.target_groups.get(target)
+        targets = group.targets if group is not None else (target,)
+        futures = []
+        for member in targets:
+            future = asyncio.get_running_loop().create_future() if wait else None
+            transport.submit(member, dgram, future)
+            futures.append(future)
+        if wait and group is not None:
+            future = asyncio.ensure_future(_all_sent(asyncio.gather(*futures)))
+        else:
+            future = futures[0]
+        self.osc_stats["messages"] += 1
+        self._record_history("osc", message.address, tuple(message.args),
+                             message.timestamp_ns, target, True)
+        return future
+    
+    def set_bundling(self, enabled: bool, mtu: int = OSC_BUNDLE_MTU) -> None:
+        """
+        Activar o desactivar el envío OSC por bundles.
+        
+        Con el modo activo, send_osc() acumula los mensajes y
+        flush_osc() los envía una vez por tick (p. ej. por fotograma)
+        como bundles que caben en la MTU. Al desactivarlo se envían
+        los mensajes pendientes.
+        
+        Args:
+            enabled: Si True, acumular los mensajes en bundles
+            mtu: Tamaño máximo de cada datagrama en bytes
+            
+        Raises:
+            ValueError: Si la MTU no admite ni la cabecera de un bundle
+        """
+        if mtu <= _BUNDLE_HEADER_SIZE + 4:
+            raise ValueError(f"MTU demasiado pequeña para un bundle OSC: {mtu}")
+        if not enabled:
+            self.flush_osc()
+        self.bundling = enabled
+        self.bundle_mtu = mtu
+        logger.info(f"Bundles OSC {'activados' if enabled else 'desactivados'} (MTU {mtu})")
+    
+    def flush_osc(self) -> int:
+        """
+        Enviar los mensajes OSC acumulados como bundles.
+        
+        Returns:
+            Número de datagramas enviados
+        """
+        pending, self._pending_osc = self._pending_osc, {}
+        sent = 0
+        for target, items in pending.items():
+            group = self.target_groups.get(target)
+            if group is not None:
+                # Bundles empaquetados una vez para todos los destinos del grupo
+                for packet in pack_osc_bundles(items, self.bundle_mtu):
+                    sent += self._send_to_group(group, packet)
+                continue
+            client = self.osc_clients.get(target)
+            if client is None:
+                logger.warning(f"Destino OSC {target} no disponible: se descartan "
+                               f"{len(items)} mensajes pendientes")
+                continue
+            for packet in pack_osc_bundles(items, self.bundle_mtu):
+                try:
+                    client.send(_Datagram(packet))
+                    sent += 1
+                except Exception as e:
+                    logger.error(f"Error enviando bundle OSC a {target}: {e}")
+        self.osc_stats["datagrams"] += sent
+        return sent
+    
     def send_midi(self, event: MIDIEvent) -> None:
         """
         Enviar evento MIDI.
@@ -208,14 +980,59 @@ class CommunicationManager:
                 logger.debug("MIDI simulado (sin salida real)")
             
             # Registrar en historial
-            self.message_history.append({
-                "type": "midi",
-                "message": event.to_dict(),
-                "sent": sent
-            })
+            self._record_history("midi", event.note, (event.velocity, event.channel),
+                                 event.timestamp_ns, None, sent)
         except Exception as e:
             logger.error(f"Error enviando MIDI: {e}")
     
+    def on_message(self, callback: Callable, record: bool = False) -> None:
+        """
+        Registrar un callback de historial.
+        
+        Con record=True el callback recibe los campos del registro
+        (kind, key, args, wall_ns, target, sent), con la marca de reloj
+        de pared en ns, sin construir la entrada en diccionario; la
+        entrada se obtiene después con record_to_entry().
+        
+        Args:
+            callback: Recibe cada entrada (o registro) añadido al historial
+            record: Si True, recibir los registros en lugar de las entradas
+        """
+        registry = self.record_callbacks if record else self.history_callbacks
+        registry.append(callback)
+    
+    def _record_history(self, kind: str, key, args: tuple, timestamp_ns: int,
+                        target: Optional[str], sent: bool) -> None:
+        """
+        Añadir un registro al historial y notificar a los callbacks.
+        
+        La entrada en diccionario solo se construye si hay callbacks.
+        
+        Args:
+            kind: "osc" o "midi"
+            key: Dirección OSC o nota MIDI
+            args: Argumentos OSC o (velocidad, canal) MIDI
+            timestamp_ns: Marca monotónica del mensaje
+            target: Destino OSC (None en MIDI)
+            sent: Si el mensaje se envió realmente
+        """
+        record = self.message_history.append(kind, key, args, timestamp_ns, target, sent)
+        if self.record_callbacks:
+            wall_ns = _WALL_ANCHOR_NS + timestamp_ns - _PERF_ANCHOR_NS
+            for callback in self.record_callbacks:
+                try:
+                    callback(kind, key, args, wall_ns, target, sent)
+                except Exception as e:
+                    logger.error(f"Error en callback de historial: {e}")
+        if not self.history_callbacks:
+            return
+        entry = self.message_history.to_entry(record)
+        for callback in self.history_callbacks:
+            try:
+                callback(entry)
+            except Exception as e:
+                logger.error(f"Error en callback de historial: {e}")
+    
     def map_sensor_to_osc(self, sensor_value: float, osc_min: float, osc_max: float) -> float:
         """
         Mapear valor de sensor a rango OSC.
@@ -248,13 +1065,21 @@ class CommunicationManager:
     
     def start(self) -> None:
         """Iniciar comunicación."""
+        self.message_history.open()
         self.is_active = True
         logger.info("Comunicación iniciada")
     
     def stop(self) -> None:
         """Detener comunicación."""
+        self.flush_osc()
+        self.message_history.close()
         self.is_active = False
         
+        # Cerrar los sockets de los grupos (se reabren al volver a enviar)
+        for sock in self._group_sockets.values():
+            sock.close()
+        self._group_sockets.clear()
+        
         # Cerrar salida MIDI
         if self.midi_output is not None:
             try:
@@ -265,10 +1090,20 @@ class CommunicationManager:
         
         logger.info("Comunicación detenida")
     
+    def __enter__(self) -> "CommunicationManager":
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+    
     def get_history(self, count: Optional[int] = None) -> List[Dict]:
         """
         Obtener historial de mensajes.
         
+        Las entradas se construyen en esta llamada a partir de los
+        registros compactos del historial.
+        
         Args:
             count: Número de mensajes a obtener (None para todos)
             
@@ -276,5 +1111,5 @@ class CommunicationManager:
             Lista de mensajes
         """
         if count is None:
-            return self.message_history
+            return self.message_history[:]
         return self.message_history[-count:]
@@ -0,0 +1,407 @@
+"""
+Módulo de compresión de sesiones grabadas.
+
+Códec opcional para archivar sesiones de recording.py: los valores
+se cuantizan (x, y, z a value_quantum; marcas de tiempo a
+time_quantum respecto al inicio del bloque), se codifican como
+diferencias (por sensor para x, y, z; entre registros consecutivos
+para el tiempo), se guardan en el entero más estrecho que cabe,
+con los bytes reordenados por plano, y se comprimen con zlib.
+
+Cada bloque es independiente (su propia base de tiempo y sus
+propias diferencias), de modo que se puede saltar a cualquier
+bloque sin decodificar los anteriores. El índice de bloques va al
+final del archivo.
+
+Formato (little-endian):
+    [0:4]    magia b"SNSZ"
+    [4:6]    versión (uint16)
+    [8:16]   posición del pie (uint64)
+    [16:...] bloques: cabecera _BLOCK_HEADER + datos zlib
+    [pie]    JSON con sensores, frecuencia, inicio, cuantos e índice
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import bisect
+import itertools
+import json
+import logging
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from sensors import SensorType, SENSOR_DTYPE
+from recording import SessionReader, RECORD_DTYPE
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SNSZ"
+FORMAT_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sHxxQ")
+# Registros, base de tiempo y ancho en bytes de cada columna codificada
+_BLOCK_HEADER = struct.Struct("<Id5B")
+_WIDTHS = {1: np.uint8, 2: np.uint16, 4: np.uint32, 8: np.uint64}
+
+
+def _zigzag(values: np.ndarray) -> np.ndarray:
+    """Entero con signo a sin signo (valores pequeños → códigos pequeños)."""
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def _unzigzag(codes: np.ndarray) -> np.ndarray:
+    """Inversa de _zigzag."""
+    codes = codes.astype(np.uint64)
+    return (codes >> np.uint64(1)).view(np.int64) ^ -(codes & np.uint64(1)).view(np.int64)
+
+
+def _pack_column(codes: np.ndarray) -> tuple:
+    """Estrechar una columna sin signo y reordenar sus bytes por plano."""
+    top = int(codes.max()) if len(codes) else 0
+    width = next(w for w in (1, 2, 4, 8) if top < 1 << (8 * w))
+    narrow = codes.astype(_WIDTHS[width])
+    return width, narrow.view(np.uint8).reshape(-1, width).T.tobytes()
+
+
+def _unpack_column(data: memoryview, count: int, width: int) -> np.ndarray:
+    """Inversa de _pack_column."""
+    planes = np.frombuffer(data, dtype=np.uint8, count=count * width).reshape(width, count)
+    return np.ascontiguousarray(planes.T).view(_WIDTHS[width]).reshape(count)
+
+
+class CompressedSessionWriter:
+    """
+    Escritor de sesiones comprimidas por bloques.
+
+    Las pérdidas están acotadas por los cuantos: error máximo de
+    value_quantum / 2 en x, y, z y de time_quantum / 2 en el tiempo.
+    """
+
+    def __init__(self, path: Union[str, Path], sensor_types: Sequence[SensorType],
+                 rate_hz: Optional[float] = None, start_time: Optional[float] = None,
+                 value_quantum: float = 1e-4, time_quantum: float = 1e-6, level: int = 6):
+        """
+        Crear el archivo comprimido.
+
+        Args:
+            path: Ruta del archivo (se sobrescribe si existe)
+            sensor_types: Sensores de la sesión (índice = id de sensor)
+            rate_hz: Frecuencia nominal de muestreo (informativa)
+            start_time: Inicio de la sesión (informativo)
+            value_quantum: Resolución de x, y, z
+            time_quantum: Resolución de las marcas de tiempo (s)
+            level: Nivel de compresión zlib (1-9)
+
+        Raises:
+            ValueError: Si algún cuanto no es positivo
+        """
+        if value_quantum <= 0 or time_quantum <= 0:
+            raise ValueError("value_quantum y time_quantum deben ser positivos")
+        self.path = Path(path)
+        self.sensor_types: List[SensorType] = list(sensor_types)
+        self.rate_hz = rate_hz
+        self.start_time = start_time
+        self.value_quantum = value_quantum
+        self.time_quantum = time_quantum
+        self.level = level
+        self.count = 0
+        self.raw_bytes = 0
+        self._index: List[list] = []
+        self._file = open(self.path, "wb")
+        self._file.write(_FILE_HEADER.pack(MAGIC, FORMAT_VERSION, 0))
+
+    @property
+    def num_blocks(self) -> int:
+        """Número de bloques escritos."""
+        return len(self._index)
+
+    def write_block(self, records: np.ndarray) -> None:
+        """
+        Codificar y escribir un bloque de registros.
+
+        Args:
+            records: Array RECORD_DTYPE (en orden de grabación)
+
+        Raises:
+            ValueError: Si hay valores no finitos
+        """
+        n = len(records)
+        if n == 0:
+            return
+        timestamps = records["timestamp"]
+        if not all(np.isfinite(records[name]).all() for name in SENSOR_DTYPE.names):
+            raise ValueError("La sesión contiene valores no finitos")
+
+        base = float(timestamps[0])
+        ids = records["sensor"]
+        columns = [ids.astype(np.uint64)]
+        ticks = np.rint((timestamps - base) / self.time_quantum).astype(np.int64)
+        columns.append(_zigzag(np.diff(ticks, prepend=0)))
+        groups = [np.flatnonzero(ids == sensor_id) for sensor_id in np.unique(ids)]
+        for name in ("x", "y", "z"):
+            quantized = np.rint(records[name] / self.value_quantum).astype(np.int64)
+            deltas = np.empty(n, dtype=np.int64)
+            for rows in groups:
+                deltas[rows] = np.diff(quantized[rows], prepend=0)
+            columns.append(_zigzag(deltas))
+
+        widths, planes = zip(*(_pack_column(c) for c in columns))
+        payload = zlib.compress(b"".join(planes), self.level)
+        offset = self._file.tell()
+        self._file.write(_BLOCK_HEADER.pack(n, base, *widths))
+        self._file.write(payload)
+        self._index.append([offset, _BLOCK_HEADER.size + len(payload), n,
+                            float(timestamps.min()), float(timestamps.max())])
+        self.count += n
+        self.raw_bytes += n * RECORD_DTYPE.itemsize
+
+    def close(self) -> None:
+        """Escribir el índice y cerrar el archivo."""
+        if self._file.closed:
+            return
+        footer_offset = self._file.tell()
+        self._file.write(json.dumps({
+            "sensors": [t.value for t in self.sensor_types],
+            "rate_hz": self.rate_hz,
+            "start_time": self.start_time,
+            "value_quantum": self.value_quantum,
+            "time_quantum": self.time_quantum,
+            "count": self.count,
+            "blocks": self._index,
+        }).encode("utf-8"))
+        self._file.seek(0)
+        self._file.write(_FILE_HEADER.pack(MAGIC, FORMAT_VERSION, footer_offset))
+        self._file.close()
+        logger.info(f"Sesión comprimida: {self.count} registros en {self.path}")
+
+    def __enter__(self) -> "CompressedSessionWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class CompressedSessionReader:
+    """
+    Lector de sesiones comprimidas.
+
+    Solo lee el índice al abrir; cada bloque se lee y decodifica
+    bajo demanda, por lo que buscar un instante cuesta un bloque.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Abrir una sesión comprimida.
+
+        Args:
+            path: Ruta del archivo
+
+        Raises:
+            ValueError: Si el archivo no es una sesión comprimida válida
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        prefix = self._file.read(_FILE_HEADER.size)
+        if len(prefix) < _FILE_HEADER.size:
+            self._file.close()
+            raise ValueError(f"Archivo de sesión truncado: {self.path}")
+        magic, version, footer_offset = _FILE_HEADER.unpack(prefix)
+        if magic != MAGIC or footer_offset == 0:
+            self._file.close()
+            raise ValueError(f"No es una sesión comprimida válida: {self.path}")
+        if version != FORMAT_VERSION:
+            self._file.close()
+            raise ValueError(f"Versión de sesión no soportada: {version}")
+        self._file.seek(footer_offset)
+        metadata = json.loads(self._file.read().decode("utf-8"))
+
+        self.sensor_types: List[SensorType] = [SensorType(v) for v in metadata["sensors"]]
+        self.rate_hz: Optional[float] = metadata["rate_hz"]
+        self.start_time: Optional[float] = metadata["start_time"]
+        self.value_quantum: float = metadata["value_quantum"]
+        self.time_quantum: float = metadata["time_quantum"]
+        self.count: int = metadata["count"]
+        self._blocks: List[list] = metadata["blocks"]
+        # Los bloques de sensores intercalados se solapan en el tiempo:
+        # máximo acumulado de los finales y mínimo por la cola de los
+        # inicios, ambos monótonos, acotan por bisección los candidatos
+        self._max_ends = list(itertools.accumulate((block[4] for block in self._blocks), max))
+        self._min_starts = list(itertools.accumulate((block[3] for block in reversed(self._blocks)),
+                                                     min))[::-1]
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def num_blocks(self) -> int:
+        """Número de bloques de la sesión."""
+        return len(self._blocks)
+
+    def read_block(self, index: int) -> np.ndarray:
+        """
+        Leer y decodificar un bloque.
+
+        Args:
+            index: Índice del bloque
+
+        Returns:
+            Array RECORD_DTYPE con los registros del bloque
+        """
+        offset, size, _, _, _ = self._blocks[index]
+        self._file.seek(offset)
+        data = self._file.read(size)
+        n, base, *widths = _BLOCK_HEADER.unpack_from(data)
+        planes = memoryview(zlib.decompress(data[_BLOCK_HEADER.size:]))
+
+        columns = []
+        position = 0
+        for width in widths:
+            columns.append(_unpack_column(planes[position:], n, width))
+            position += n * width
+
+        records = np.empty(n, dtype=RECORD_DTYPE)
+        ids = columns[0].astype(np.uint16)
+        records["sensor"] = ids
+        records["timestamp"] = base + np.cumsum(_unzigzag(columns[1])) * self.time_quantum
+        groups = [np.flatnonzero(ids == sensor_id) for sensor_id in np.unique(ids)]
+        for name, codes in zip(("x", "y", "z"), columns[2:]):
+            deltas = _unzigzag(codes)
+            quantized = np.empty(n, dtype=np.int64)
+            for rows in groups:
+                quantized[rows] = np.cumsum(deltas[rows])
+            records[name] = quantized * self.value_quantum
+        return records
+
+    def iter_blocks(self, start: int = 0) -> Iterator[np.ndarray]:
+        """
+        Recorrer la sesión bloque a bloque.
+
+        Args:
+            start: Primer bloque
+
+        Yields:
+            Bloques decodificados RECORD_DTYPE
+        """
+        for index in range(start, len(self._blocks)):
+            yield self.read_block(index)
+
+    def block_for_time(self, timestamp: float) -> int:
+        """
+        Encontrar el primer bloque que puede contener un instante.
+
+        Args:
+            timestamp: Marca de tiempo buscada
+
+        Returns:
+            Índice del primer bloque cuya última muestra es posterior o
+            igual a timestamp (el último bloque si no hay ninguno)
+        """
+        return min(bisect.bisect_left(self._max_ends, timestamp), max(len(self._blocks) - 1, 0))
+
+    def _sensor_id(self, sensor_type: SensorType) -> int:
+        try:
+            return self.sensor_types.index(sensor_type)
+        except ValueError:
+            raise KeyError(f"Sensor no grabado en la sesión: {sensor_type.value}") from None
+
+    @staticmethod
+    def _select(block: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Copiar a SENSOR_DTYPE los registros seleccionados de un bloque."""
+        selected = block[mask]
+        part = np.empty(len(selected), dtype=SENSOR_DTYPE)
+        for name in SENSOR_DTYPE.names:
+            part[name] = selected[name]
+        return part
+
+    def read_range(self, sensor_type: SensorType, t0: float, t1: float) -> np.ndarray:
+        """
+        Leer las muestras de un sensor en un intervalo temporal.
+
+        Solo se decodifican los bloques cuyo intervalo [mínimo, máximo]
+        del índice se solapa con [t0, t1]; con sensores intercalados un
+        bloque anterior puede contener muestras posteriores a t0.
+
+        Args:
+            sensor_type: Tipo de sensor
+            t0: Marca de tiempo inicial (incluida)
+            t1: Marca de tiempo final (incluida)
+
+        Returns:
+            Array SENSOR_DTYPE con las muestras del intervalo en orden
+
+        Raises:
+            KeyError: Si el sensor no forma parte de la sesión
+        """
+        sensor_id = self._sensor_id(sensor_type)
+        parts = []
+        if t1 >= t0:
+            start = bisect.bisect_left(self._max_ends, t0)
+            stop = bisect.bisect_right(self._min_starts, t1)
+            for index in range(start, stop):
+                _, _, _, first, last = self._blocks[index]
+                if last < t0 or first > t1:
+                    continue
+                block = self.read_block(index)
+                t = block["timestamp"]
+                parts.append(self._select(block, (block["sensor"] == sensor_id) & (t >= t0) & (t <= t1)))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=SENSOR_DTYPE)
+
+    def sensor_array(self, sensor_type: SensorType) -> np.ndarray:
+        """
+        Extraer todas las muestras de un sensor.
+
+        Args:
+            sensor_type: Tipo de sensor
+
+        Returns:
+            Array SENSOR_DTYPE con las muestras del sensor en orden
+
+        Raises:
+            KeyError: Si el sensor no forma parte de la sesión
+        """
+        sensor_id = self._sensor_id(sensor_type)
+        parts = [self._select(block, block["sensor"] == sensor_id) for block in self.iter_blocks()]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=SENSOR_DTYPE)
+
+    def close(self) -> None:
+        """Cerrar el archivo."""
+        self._file.close()
+
+    def __enter__(self) -> "CompressedSessionReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def compress_session(source: Union[SessionReader, str, Path], destination: Union[str, Path],
+                     block_records: int = 8192, **codec_options) -> Dict:
+    """
+    Comprimir una sesión grabada con SessionRecorder.
+
+    Args:
+        source: Sesión abierta o ruta del archivo de sesión
+        destination: Ruta del archivo comprimido
+        block_records: Registros por bloque (granularidad de búsqueda)
+        **codec_options: value_quantum, time_quantum y level
+
+    Returns:
+        Registros, bloques, bytes en bruto, bytes comprimidos y razón
+    """
+    reader = source if isinstance(source, SessionReader) else SessionReader(source)
+    with CompressedSessionWriter(destination, reader.sensor_types, rate_hz=reader.rate_hz,
+                                 start_time=reader.start_time, **codec_options) as writer:
+        for block in reader.iter_blocks(block_records):
+            writer.write_block(block)
+    compressed = Path(destination).stat().st_size
+    return {
+        "records": writer.count,
+        "blocks": writer.num_blocks,
+        "raw_bytes": writer.raw_bytes,
+        "compressed_bytes": compressed,
+        "ratio": writer.raw_bytes / compressed if compressed else 0.0,
+    }
@@ -0,0 +1,370 @@
+"""
+Módulo de diezmado para visualización.
+
+Reduce historiales de sensores y sesiones grabadas a unos pocos
+miles de puntos que conservan la forma de la señal al dibujarla:
+
+- min/max: por cada cubeta, la muestra mínima y la máxima del canal
+  (conserva picos y envolvente; totalmente vectorizado).
+- LTTB (Largest-Triangle-Three-Buckets): por cada cubeta, la muestra
+  que forma el triángulo de mayor área con la elegida en la cubeta
+  anterior y la media de la siguiente.
+
+StreamingDecimator aplica lo mismo de forma incremental para
+gráficas en vivo: cada muestra nueva solo cuesta su cubeta.
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import logging
+from typing import Callable, Optional
+
+import numpy as np
+
+from sensors import SensorManager, SensorType, SENSOR_DTYPE
+from rolling import CHANNELS
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("lttb", "minmax")
+
+
+def _check(method: str, channel: str) -> None:
+    if method not in METHODS:
+        raise ValueError(f"Método desconocido: {method} (válidos: {METHODS})")
+    if channel not in CHANNELS:
+        raise ValueError(f"Canal desconocido: {channel} (válidos: {CHANNELS})")
+
+
+def channel_values(block: np.ndarray, channel: str = "magnitude") -> np.ndarray:
+    """
+    Obtener los valores de un canal de un bloque de muestras.
+
+    Args:
+        block: Array estructurado con campos x, y, z
+        channel: "x", "y", "z" o "magnitude"
+
+    Returns:
+        Array float64 con los valores del canal
+    """
+    if channel == "magnitude":
+        return np.sqrt(block["x"] ** 2 + block["y"] ** 2 + block["z"] ** 2)
+    return np.asarray(block[channel], dtype=np.float64)
+
+
+def minmax_indices(values: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Índices del mínimo y el máximo de cada cubeta.
+
+    Args:
+        values: Valores del canal
+        n_out: Número aproximado de puntos de salida (2 por cubeta)
+
+    Returns:
+        Índices crecientes seleccionados
+    """
+    n = len(values)
+    if n <= n_out:
+        return np.arange(n)
+    buckets = max(n_out // 2, 1)
+    size = -(-n // buckets)
+    # Rellenar con el último valor para poder reorganizar en (cubetas, tamaño)
+    padded = np.empty(buckets * size)
+    padded[:n] = values
+    padded[n:] = values[-1]
+    grid = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    lows = np.minimum(offsets + grid.argmin(axis=1), n - 1)
+    highs = np.minimum(offsets + grid.argmax(axis=1), n - 1)
+    return np.unique(np.concatenate((lows, highs)))
+
+
+def _lttb_pick(prev_t: float, prev_v: float, t: np.ndarray, v: np.ndarray,
+               next_t: float, next_v: float) -> int:
+    """Índice de la muestra de mayor triángulo dentro de una cubeta."""
+    areas = np.abs((prev_t - next_t) * (v - prev_v) - (prev_t - t) * (next_v - prev_v))
+    return int(areas.argmax())
+
+
+def lttb_indices(times: np.ndarray, values: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Índices seleccionados por LTTB.
+
+    Las áreas de cada cubeta se calculan vectorizadas; el recorrido
+    entre cubetas es secuencial porque cada elección depende de la
+    anterior (n_out iteraciones, no n).
+
+    Args:
+        times: Eje horizontal (marcas de tiempo)
+        values: Valores del canal
+        n_out: Número de puntos de salida (incluye primero y último)
+
+    Returns:
+        Índices crecientes seleccionados
+    """
+    n = len(values)
+    if n <= n_out or n_out < 3:
+        return np.arange(n) if n <= n_out else np.array([0, n - 1])
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        following_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        following = slice(stop, max(following_stop, stop + 1))
+        pick = start + _lttb_pick(times[previous], values[previous],
+                                  times[start:stop], values[start:stop],
+                                  times[following].mean(), values[following].mean())
+        selected[bucket + 1] = previous = pick
+    return selected
+
+
+def decimate(block: np.ndarray, n_out: int, method: str = "lttb",
+             channel: str = "magnitude") -> np.ndarray:
+    """
+    Reducir un bloque de muestras a unos n_out puntos.
+
+    Args:
+        block: Array estructurado con campos x, y, z, timestamp
+        n_out: Número de puntos deseado
+        method: "lttb" o "minmax"
+        channel: Canal que guía la selección ("x", "y", "z", "magnitude")
+
+    Returns:
+        Subconjunto de filas de block, en orden
+
+    Raises:
+        ValueError: Si el método o el canal no son válidos
+    """
+    _check(method, channel)
+    values = channel_values(block, channel)
+    if method == "minmax":
+        return block[minmax_indices(values, n_out)]
+    return block[lttb_indices(np.asarray(block["timestamp"], dtype=np.float64), values, n_out)]
+
+
+def decimate_history(manager: SensorManager, sensor_type: SensorType, n_out: int,
+                     method: str = "lttb", channel: str = "magnitude") -> np.ndarray:
+    """
+    Reducir el historial de un sensor de SensorManager.
+
+    Args:
+        manager: Gestor de sensores
+        sensor_type: Tipo de sensor
+        n_out: Número de puntos deseado
+        method: "lttb" o "minmax"
+        channel: Canal que guía la selección
+
+    Returns:
+        Array SENSOR_DTYPE con los puntos seleccionados
+    """
+    return decimate(manager.get_array(sensor_type), n_out, method, channel)
+
+
+class StreamingDecimator:
+    """
+    Diezmador incremental para gráficas en vivo.
+
+    Las muestras se agrupan en cubetas de bucket_size; cada cubeta
+    completa se reduce una sola vez (2 puntos en min/max; 1 en LTTB,
+    elegido cuando llega la cubeta siguiente). Si los puntos superan
+    max_points, se fusionan las cubetas de dos en dos y bucket_size
+    se duplica, de modo que la salida queda acotada por muy larga
+    que sea la captura.
+    """
+
+    def __init__(self, bucket_size: int = 64, method: str = "minmax",
+                 channel: str = "magnitude", max_points: Optional[int] = 4000):
+        """
+        Inicializar el diezmador.
+
+        Args:
+            bucket_size: Muestras por cubeta (>= 2)
+            method: "lttb" o "minmax"
+            channel: Canal que guía la selección
+            max_points: Límite de puntos conservados (None: sin límite)
+
+        Raises:
+            ValueError: Si los parámetros no son válidos
+        """
+        _check(method, channel)
+        if bucket_size < 2:
+            raise ValueError(f"bucket_size debe ser al menos 2: {bucket_size}")
+        if max_points is not None and max_points < 8:
+            raise ValueError(f"max_points debe ser al menos 8: {max_points}")
+        self.bucket_size = bucket_size
+        self.method = method
+        self.channel = channel
+        self.max_points = max_points
+        self.reset()
+
+    def reset(self) -> None:
+        """Olvidar todas las muestras."""
+        self._partial = np.empty(0, dtype=SENSOR_DTYPE)
+        self._chunks: list = []
+        self._count = 0  # Puntos en _chunks
+        self._pending: Optional[np.ndarray] = None  # LTTB: cubeta a la espera de la siguiente
+        self._first: Optional[np.ndarray] = None
+        self._last: Optional[np.ndarray] = None
+        self.samples = 0
+
+    def _as_sensor_block(self, block: np.ndarray) -> np.ndarray:
+        if block.dtype == SENSOR_DTYPE:
+            return block
+        converted = np.empty(len(block), dtype=SENSOR_DTYPE)
+        for name in SENSOR_DTYPE.names:
+            converted[name] = block[name]
+        return converted
+
+    def push(self, block: np.ndarray) -> None:
+        """
+        Añadir un bloque de muestras.
+
+        Args:
+            block: Array estructurado con campos x, y, z, timestamp
+        """
+        if len(block) == 0:
+            return
+        block = self._as_sensor_block(block)
+        if self._first is None:
+            self._first = block[:1].copy()
+        self._last = block[-1:].copy()
+        self.samples += len(block)
+
+        data = np.concatenate((self._partial, block)) if len(self._partial) else block
+        size = self.bucket_size
+        full = len(data) // size * size
+        self._partial = data[full:].copy()
+        if full:
+            grid = data[:full].reshape(-1, size)
+            if self.method == "minmax":
+                self._reduce_minmax(grid)
+            else:
+                for bucket in grid:
+                    self._reduce_lttb(bucket)
+        if self.max_points is not None and self._count > self.max_points:
+            self._compact()
+
+    def _reduce_minmax(self, grid: np.ndarray) -> None:
+        """Reducir cubetas completas (n, bucket_size) a mínimo y máximo ordenados."""
+        values = channel_values(grid, self.channel)
+        lows = values.argmin(axis=1)
+        highs = values.argmax(axis=1)
+        # Cubeta constante: primera y última muestra
+        highs = np.where(lows == highs, grid.shape[1] - 1, highs)
+        first = np.minimum(lows, highs)
+        second = np.maximum(lows, highs)
+        rows = np.arange(len(grid))
+        pairs = np.stack((grid[rows, first], grid[rows, second]), axis=1)
+        self._chunks.append(pairs.reshape(-1))
+        self._count += 2 * len(grid)
+
+    def _reduce_lttb(self, bucket: np.ndarray) -> None:
+        """Elegir el punto de la cubeta pendiente ahora que llega la siguiente."""
+        if self._pending is not None:
+            previous = self._chunks[-1][-1:] if self._chunks else self._first
+            pick = _lttb_pick(previous["timestamp"][0], channel_values(previous, self.channel)[0],
+                              self._pending["timestamp"], channel_values(self._pending, self.channel),
+                              bucket["timestamp"].mean(), channel_values(bucket, self.channel).mean())
+            self._chunks.append(self._pending[pick:pick + 1].copy())
+            self._count += 1
+        self._pending = bucket.copy()
+
+    def _compact(self) -> None:
+        """Fusionar cubetas de dos en dos y duplicar bucket_size."""
+        points = np.concatenate(self._chunks)
+        if self.method == "minmax":
+            merged = len(points) // 4 * 4
+            grid = points[:merged].reshape(-1, 4)
+            values = channel_values(grid, self.channel)
+            lows = values.argmin(axis=1)
+            highs = values.argmax(axis=1)
+            first = np.minimum(lows, highs)
+            second = np.maximum(lows, highs)
+            rows = np.arange(len(grid))
+            pairs = np.stack((grid[rows, first], grid[rows, second]), axis=1).reshape(-1)
+            self._chunks = [pairs, points[merged:]]
+        else:
+            keep = lttb_indices(points["timestamp"], channel_values(points, self.channel),
+                                max(len(points) // 2, 3))
+            self._chunks = [points[keep]]
+        self._count = sum(len(chunk) for chunk in self._chunks)
+        self.bucket_size *= 2
+
+    def points(self) -> np.ndarray:
+        """
+        Obtener los puntos actuales para dibujar.
+
+        Incluye la primera y la última muestra vistas, de modo que la
+        gráfica cubre todo el intervalo aunque la última cubeta no
+        esté completa.
+
+        Returns:
+            Array SENSOR_DTYPE en orden temporal
+        """
+        if self._first is None:
+            return np.empty(0, dtype=SENSOR_DTYPE)
+        parts = [self._first, *self._chunks]
+        if self.method == "minmax" and len(self._partial):
+            parts.append(decimate(self._partial, 2, "minmax", self.channel))
+        parts.append(self._last)
+        points = np.concatenate(parts)
+        # Quitar repeticiones de la misma muestra en las uniones
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = points["timestamp"][1:] != points["timestamp"][:-1]
+        return points[keep]
+
+    def attach(self, manager: SensorManager, sensor_type: SensorType) -> Callable:
+        """
+        Diezmar en vivo un flujo de SensorManager.
+
+        Args:
+            manager: Gestor de sensores
+            sensor_type: Tipo de sensor
+
+        Returns:
+            El callback por lotes registrado en el gestor
+        """
+        def on_block(block_type: SensorType, block: np.ndarray) -> None:
+            self.push(block)
+
+        manager.register_callback(sensor_type, on_block, batch=True)
+        return on_block
+
+
+def decimate_session(session, sensor_type: SensorType, n_out: int, method: str = "minmax",
+                     channel: str = "magnitude") -> np.ndarray:
+    """
+    Reducir un sensor de una sesión grabada sin cargarla entera.
+
+    Una primera pasada cuenta las muestras del sensor para fijar el
+    tamaño de cubeta; la segunda diezma en flujo bloque a bloque.
+
+    Args:
+        session: SessionReader o CompressedSessionReader
+        sensor_type: Tipo de sensor
+        n_out: Número aproximado de puntos deseado
+        method: "lttb" o "minmax"
+        channel: Canal que guía la selección
+
+    Returns:
+        Array SENSOR_DTYPE con los puntos seleccionados
+
+    Raises:
+        KeyError: Si el sensor no forma parte de la sesión
+    """
+    _check(method, channel)
+    if sensor_type not in session.sensor_types:
+        raise KeyError(f"Sensor no grabado en la sesión: {sensor_type.value}")
+    sensor_id = session.sensor_types.index(sensor_type)
+    total = sum(int(np.count_nonzero(block["sensor"] == sensor_id))
+                for block in session.iter_blocks())
+    per_bucket = 2 if method == "minmax" else 1
+    bucket_size = max(-(-total // max(n_out // per_bucket, 1)), 2)
+    decimator = StreamingDecimator(bucket_size, method, channel, max_points=None)
+    for block in session.iter_blocks():
+        decimator.push(block[block["sensor"] == sensor_id])
+    return decimator.points()
@@ -0,0 +1,393 @@
+"""
+Módulo de despacho de callbacks de sensores.
+
+Proporciona despachadores que desacoplan la captura de sensores de
+la ejecución de los callbacks registrados en SensorManager, de modo
+que un callback lento (envío OSC o MIDI) no detenga la captura.
+
+Un despachador expone submit(sensor_type, callback, *args), que
+debe retornar en tiempo constante, y stats() con contadores por
+suscriptor. Cada suscriptor es un par (sensor_type, callback).
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from overflow import OverflowPolicy
+from sensors import SensorType
+
+logger = logging.getLogger(__name__)
+
+
+class _AsyncSubscription:
+    """Cola acotada y tarea consumidora de un suscriptor."""
+
+    __slots__ = ("sensor_type", "callback", "queue", "event", "task", "delivered", "dropped")
+
+    def __init__(self, sensor_type: SensorType, callback: Callable, maxlen: Optional[int]):
+        self.sensor_type = sensor_type
+        self.callback = callback
+        self.queue: deque = deque(maxlen=maxlen)
+        self.event = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.dropped = 0
+
+
+class AsyncDispatcher:
+    """
+    Despachador de callbacks basado en asyncio.
+
+    Cada suscriptor tiene su propia cola acotada y una tarea que la
+    consume en el bucle de eventos. submit() solo encola (O(1)) y
+    aplica la política de desbordamiento; puede llamarse desde el
+    hilo del bucle o desde otro hilo. Los callbacks pueden ser
+    funciones normales o corrutinas.
+    """
+
+    def __init__(self, maxsize: int = 64, policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        """
+        Inicializar el despachador.
+
+        Args:
+            maxsize: Capacidad de la cola de cada suscriptor
+            policy: Política de desbordamiento de las colas
+
+        Raises:
+            ValueError: Si maxsize no es positivo
+        """
+        if maxsize <= 0:
+            raise ValueError(f"maxsize debe ser positivo: {maxsize}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._subscriptions: Dict[Tuple[SensorType, Callable], _AsyncSubscription] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._closing = False
+
+    @property
+    def is_running(self) -> bool:
+        """Indica si el despachador está asociado a un bucle activo."""
+        return self._loop is not None and not self._closing
+
+    async def start(self) -> None:
+        """Asociar el despachador al bucle actual y lanzar los consumidores."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._closing = False
+        for subscription in self._subscriptions.values():
+            self._start_consumer(subscription)
+        logger.info("AsyncDispatcher iniciado")
+
+    async def stop(self, drain: bool = True) -> None:
+        """
+        Detener los consumidores.
+
+        Args:
+            drain: Si True, entregar lo pendiente antes de terminar
+        """
+        self._closing = True
+        tasks = []
+        for subscription in self._subscriptions.values():
+            if not drain:
+                subscription.queue.clear()
+            subscription.event.set()
+            if subscription.task is not None:
+                tasks.append(subscription.task)
+                subscription.task = None
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop = None
+        self._loop_thread = None
+        logger.info("AsyncDispatcher detenido")
+
+    def submit(self, sensor_type: SensorType, callback: Callable, *args) -> None:
+        """
+        Encolar una invocación de callback.
+
+        Args:
+            sensor_type: Tipo de sensor de la suscripción
+            callback: Callback a invocar
+            *args: Argumentos para el callback
+        """
+        subscription = self._subscriptions.get((sensor_type, callback))
+        if subscription is None:
+            subscription = self._subscribe(sensor_type, callback)
+
+        queue = subscription.queue
+        if self.policy is OverflowPolicy.DROP_NEWEST:
+            if len(queue) >= self.maxsize:
+                subscription.dropped += 1
+                return
+        elif len(queue) == queue.maxlen:
+            # DROP_OLDEST y COALESCE: la deque descarta el más antiguo
+            subscription.dropped += 1
+        queue.append(args)
+
+        if self._loop is not None and not subscription.event.is_set():
+            if threading.get_ident() == self._loop_thread:
+                subscription.event.set()
+            else:
+                self._loop.call_soon_threadsafe(subscription.event.set)
+
+    def stats(self) -> List[Dict]:
+        """
+        Obtener contadores por suscriptor.
+
+        Returns:
+            Lista con sensor, callback, profundidad de cola,
+            entregas y descartes de cada suscriptor
+        """
+        return [
+            {
+                "sensor_type": s.sensor_type.value,
+                "callback": getattr(s.callback, "__qualname__", repr(s.callback)),
+                "queue_depth": len(s.queue),
+                "delivered": s.delivered,
+                "dropped": s.dropped,
+            }
+            for s in self._subscriptions.values()
+        ]
+
+    def _subscribe(self, sensor_type: SensorType, callback: Callable) -> _AsyncSubscription:
+        """Crear la suscripción de un par (sensor_type, callback)."""
+        maxlen = 1 if self.policy is OverflowPolicy.COALESCE else (
+            None if self.policy is OverflowPolicy.DROP_NEWEST else self.maxsize)
+        subscription = _AsyncSubscription(sensor_type, callback, maxlen)
+        self._subscriptions[(sensor_type, callback)] = subscription
+        if self._loop is not None:
+            if threading.get_ident() == self._loop_thread:
+                self._start_consumer(subscription)
+            else:
+                self._loop.call_soon_threadsafe(self._start_consumer, subscription)
+        return subscription
+
+    def _start_consumer(self, subscription: _AsyncSubscription) -> None:
+        """Lanzar la tarea consumidora de una suscripción."""
+        if subscription.task is None:
+            subscription.task = self._loop.create_task(self._consume(subscription))
+            if subscription.queue:
+                subscription.event.set()
+
+    async def _consume(self, subscription: _AsyncSubscription) -> None:
+        """Entregar los elementos encolados de un suscriptor."""
+        queue = subscription.queue
+        while True:
+            while queue:
+                args = queue.popleft()
+                try:
+                    result = subscription.callback(*args)
+                    if inspect.isawaitable(result):
+                        await result
+                    subscription.delivered += 1
+                except Exception as e:
+                    logger.error(f"Error en callback para {subscription.sensor_type.value}: {e}")
+                # Ceder el bucle entre elementos para no acaparar la CPU
+                await asyncio.sleep(0)
+            if self._closing:
+                return
+            subscription.event.clear()
+            if not queue:
+                await subscription.event.wait()
+
+
+class _ThreadSubscription:
+    """Cola de un suscriptor y estado de su drenado en el pool."""
+
+    __slots__ = ("sensor_type", "callback", "queue", "lock", "scheduled",
+                 "delivered", "dropped", "last_lag_ns", "max_lag_ns")
+
+    def __init__(self, sensor_type: SensorType, callback: Callable):
+        self.sensor_type = sensor_type
+        self.callback = callback
+        self.queue: deque = deque()
+        self.lock = threading.Lock()
+        self.scheduled = False
+        self.delivered = 0
+        self.dropped = 0
+        self.last_lag_ns = 0
+        self.max_lag_ns = 0
+
+
+class ThreadPoolDispatcher:
+    """
+    Despachador de callbacks sobre un pool de hilos.
+
+    Pensado para callbacks con E/S bloqueante (envíos rtmidi, UDP).
+    Las invocaciones de un mismo suscriptor (sensor_type, callback)
+    se ejecutan en orden y nunca en paralelo entre sí; suscriptores
+    distintos se ejecutan en paralelo. Cada suscriptor tiene a lo
+    sumo una tarea de drenado en el pool, que procesa hasta
+    batch_size elementos antes de ceder el hilo a otros suscriptores.
+    """
+
+    def __init__(self, max_workers: int = 4, maxsize: int = 1024,
+                 policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+                 executor: Optional[Executor] = None, batch_size: int = 32):
+        """
+        Inicializar el despachador.
+
+        Args:
+            max_workers: Hilos del pool (ignorado si se pasa executor)
+            maxsize: Capacidad de la cola de cada suscriptor
+            policy: Política de desbordamiento de las colas
+            executor: Executor externo a reutilizar (no se cierra en shutdown)
+            batch_size: Elementos por tarea de drenado antes de ceder el hilo
+
+        Raises:
+            ValueError: Si maxsize o batch_size no son positivos
+        """
+        if maxsize <= 0:
+            raise ValueError(f"maxsize debe ser positivo: {maxsize}")
+        if batch_size <= 0:
+            raise ValueError(f"batch_size debe ser positivo: {batch_size}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.batch_size = batch_size
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="sensor-callback")
+        self._subscriptions: Dict[Tuple[SensorType, Callable], _ThreadSubscription] = {}
+        self._registry_lock = threading.Lock()
+        self._closing = False
+
+    @property
+    def queue_depth(self) -> int:
+        """Total de invocaciones pendientes entre todos los suscriptores."""
+        return sum(len(s.queue) for s in list(self._subscriptions.values()))
+
+    def submit(self, sensor_type: SensorType, callback: Callable, *args) -> None:
+        """
+        Encolar una invocación de callback.
+
+        Args:
+            sensor_type: Tipo de sensor de la suscripción
+            callback: Callback a invocar
+            *args: Argumentos para el callback
+        """
+        subscription = self._subscriptions.get((sensor_type, callback))
+        if subscription is None:
+            subscription = self._subscribe(sensor_type, callback)
+
+        with subscription.lock:
+            if self._closing:
+                subscription.dropped += 1
+                return
+            queue = subscription.queue
+            if len(queue) >= self.maxsize:
+                subscription.dropped += 1
+                if self.policy is OverflowPolicy.DROP_NEWEST:
+                    return
+                queue.popleft()
+            if self.policy is OverflowPolicy.COALESCE:
+                subscription.dropped += len(queue)
+                queue.clear()
+            queue.append((time.perf_counter_ns(), args))
+            if subscription.scheduled:
+                return
+            subscription.scheduled = True
+        try:
+            self._executor.submit(self._drain, subscription)
+        except RuntimeError:
+            # shutdown() cerró el pool entre la comprobación y el envío
+            with subscription.lock:
+                subscription.scheduled = False
+                subscription.dropped += len(subscription.queue)
+                subscription.queue.clear()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Esperar a que se entregue todo lo encolado sin cerrar el pool.
+
+        Args:
+            timeout: Segundos máximos de espera (None para sin límite)
+
+        Returns:
+            True si no queda nada pendiente, False si venció el plazo
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while any(s.queue or s.scheduled for s in list(self._subscriptions.values())):
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Dejar de aceptar invocaciones y cerrar el pool propio.
+
+        Args:
+            wait: Si True, esperar a que se entregue lo pendiente
+        """
+        self._closing = True
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait)
+        logger.info("ThreadPoolDispatcher detenido")
+
+    def stats(self) -> List[Dict]:
+        """
+        Obtener contadores por suscriptor.
+
+        Returns:
+            Lista con sensor, callback, profundidad de cola, entregas,
+            descartes y retraso (último y máximo, en ms) desde que se
+            encoló cada invocación hasta que empezó a ejecutarse
+        """
+        return [
+            {
+                "sensor_type": s.sensor_type.value,
+                "callback": getattr(s.callback, "__qualname__", repr(s.callback)),
+                "queue_depth": len(s.queue),
+                "delivered": s.delivered,
+                "dropped": s.dropped,
+                "last_lag_ms": s.last_lag_ns / 1e6,
+                "max_lag_ms": s.max_lag_ns / 1e6,
+            }
+            for s in list(self._subscriptions.values())
+        ]
+
+    def _subscribe(self, sensor_type: SensorType, callback: Callable) -> _ThreadSubscription:
+        """Crear (una sola vez) la suscripción de un par (sensor_type, callback)."""
+        with self._registry_lock:
+            key = (sensor_type, callback)
+            subscription = self._subscriptions.get(key)
+            if subscription is None:
+                subscription = _ThreadSubscription(sensor_type, callback)
+                self._subscriptions[key] = subscription
+            return subscription
+
+    def _drain(self, subscription: _ThreadSubscription) -> None:
+        """Entregar en orden hasta batch_size elementos de un suscriptor."""
+        processed = 0
+        while True:
+            with subscription.lock:
+                if not subscription.queue:
+                    subscription.scheduled = False
+                    return
+                if processed >= self.batch_size and not self._closing:
+                    # Ceder el hilo: reprogramar el resto del drenado
+                    try:
+                        self._executor.submit(self._drain, subscription)
+                        return
+                    except RuntimeError:
+                        pass  # Pool cerrándose: seguir drenando aquí
+                enqueued_ns, args = subscription.queue.popleft()
+
+            lag = time.perf_counter_ns() - enqueued_ns
+            subscription.last_lag_ns = lag
+            if lag > subscription.max_lag_ns:
+                subscription.max_lag_ns = lag
+            try:
+                subscription.callback(*args)
+                subscription.delivered += 1
+            except Exception as e:
+                logger.error(f"Error en callback para {subscription.sensor_type.value}: {e}")
+            processed += 1
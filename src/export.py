@@ -0,0 +1,232 @@
+"""
+Módulo de exportación columnar de historiales y sesiones.
+
+Exporta el historial de SensorManager y las sesiones grabadas a
+archivos NumPy por sensor y por columna (timestamp, x, y, z), para
+el análisis fuera de línea sin reconstruir arrays desde to_dict().
+
+Formatos:
+    npy: <dir>/<sensor>/<columna>.npy; se abren con
+         np.load(mmap_mode="r"), de modo que una captura de varios GB
+         se abre al instante y solo se leen las páginas usadas.
+    npz: <dir>/<sensor>.npz (opcionalmente comprimido); más compacto
+         para archivar, cada columna se lee entera al accederla.
+
+Cada exportación incluye manifest.json con sensores, muestras por
+sensor, formato y metadatos de la sesión de origen.
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from sensors import SensorManager, SensorType, SENSOR_DTYPE
+from recording import SessionReader
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+COLUMNS = SENSOR_DTYPE.names
+
+
+def _write_manifest(directory: Path, fmt: str, counts: Dict[SensorType, int], **metadata) -> None:
+    """Escribir el manifiesto de una exportación."""
+    manifest = {
+        "format": fmt,
+        "columns": list(COLUMNS),
+        "sensors": {t.value: n for t, n in counts.items()},
+        **metadata,
+    }
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+
+def _save_columns(directory: Path, sensor_type: SensorType, array: np.ndarray,
+                  fmt: str, compressed: bool) -> None:
+    """Guardar las columnas de un array SENSOR_DTYPE."""
+    columns = {name: np.ascontiguousarray(array[name]) for name in COLUMNS}
+    if fmt == "npz":
+        save = np.savez_compressed if compressed else np.savez
+        save(directory / f"{sensor_type.value}.npz", **columns)
+        return
+    sensor_dir = directory / sensor_type.value
+    sensor_dir.mkdir(parents=True, exist_ok=True)
+    for name, column in columns.items():
+        np.save(sensor_dir / f"{name}.npy", column)
+
+
+def _check_format(fmt: str) -> None:
+    if fmt not in ("npy", "npz"):
+        raise ValueError(f"Formato de exportación desconocido: {fmt} (válidos: npy, npz)")
+
+
+def export_history(manager: SensorManager, directory: Union[str, Path],
+                   sensor_types: Optional[Sequence[SensorType]] = None,
+                   fmt: str = "npy", compressed: bool = False) -> Dict[SensorType, int]:
+    """
+    Exportar el historial de un SensorManager.
+
+    Args:
+        manager: Gestor de sensores
+        directory: Directorio de destino (se crea si no existe)
+        sensor_types: Sensores a exportar (los que tienen historial por defecto)
+        fmt: "npy" (columnas mapeables) o "npz"
+        compressed: Comprimir los .npz
+
+    Returns:
+        Muestras exportadas por sensor
+
+    Raises:
+        ValueError: Si el formato no es válido
+    """
+    _check_format(fmt)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    selected = sensor_types if sensor_types is not None else list(manager.data_history)
+    counts = {}
+    for sensor_type in selected:
+        array = manager.get_array(sensor_type)
+        _save_columns(directory, sensor_type, array, fmt, compressed)
+        counts[sensor_type] = len(array)
+    _write_manifest(directory, fmt, counts, source="history")
+    logger.info(f"Historial exportado a {directory}: {sum(counts.values())} muestras")
+    return counts
+
+
+def export_session(session, directory: Union[str, Path],
+                   sensor_types: Optional[Sequence[SensorType]] = None,
+                   fmt: str = "npy", compressed: bool = False) -> Dict[SensorType, int]:
+    """
+    Exportar una sesión grabada.
+
+    En formato npy la sesión se recorre por bloques y las columnas se
+    escriben en archivos .npy mapeados, sin cargar la sesión entera
+    en memoria. En formato npz se extrae un sensor cada vez.
+
+    Args:
+        session: SessionReader, CompressedSessionReader o ruta de una
+            sesión de SessionRecorder
+        directory: Directorio de destino (se crea si no existe)
+        sensor_types: Sensores a exportar (todos los de la sesión por defecto)
+        fmt: "npy" (columnas mapeables) o "npz"
+        compressed: Comprimir los .npz
+
+    Returns:
+        Muestras exportadas por sensor
+
+    Raises:
+        ValueError: Si el formato no es válido
+        KeyError: Si un sensor no forma parte de la sesión
+    """
+    _check_format(fmt)
+    if isinstance(session, (str, Path)):
+        session = SessionReader(session)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    selected = list(sensor_types) if sensor_types is not None else list(session.sensor_types)
+    ids = {}
+    for sensor_type in selected:
+        if sensor_type not in session.sensor_types:
+            raise KeyError(f"Sensor no grabado en la sesión: {sensor_type.value}")
+        ids[sensor_type] = session.sensor_types.index(sensor_type)
+
+    if fmt == "npz":
+        counts = {}
+        for sensor_type in selected:
+            array = session.sensor_array(sensor_type)
+            _save_columns(directory, sensor_type, array, fmt, compressed)
+            counts[sensor_type] = len(array)
+    else:
+        # Primera pasada: muestras por sensor; segunda: columnas mapeadas
+        totals = np.zeros(len(session.sensor_types), dtype=np.int64)
+        for block in session.iter_blocks():
+            totals += np.bincount(block["sensor"], minlength=len(totals))[:len(totals)]
+        outputs = {}
+        for sensor_type, sensor_id in ids.items():
+            sensor_dir = directory / sensor_type.value
+            sensor_dir.mkdir(parents=True, exist_ok=True)
+            outputs[sensor_id] = {
+                name: np.lib.format.open_memmap(sensor_dir / f"{name}.npy", mode="w+",
+                                                dtype=np.float64, shape=(int(totals[sensor_id]),))
+                for name in COLUMNS
+            }
+        positions = dict.fromkeys(outputs, 0)
+        for block in session.iter_blocks():
+            for sensor_id, columns in outputs.items():
+                selected_rows = block[block["sensor"] == sensor_id]
+                start = positions[sensor_id]
+                stop = start + len(selected_rows)
+                for name, column in columns.items():
+                    column[start:stop] = selected_rows[name]
+                positions[sensor_id] = stop
+        for columns in outputs.values():
+            for column in columns.values():
+                column.flush()
+        counts = {sensor_type: positions[sensor_id] for sensor_type, sensor_id in ids.items()}
+        del outputs
+
+    _write_manifest(directory, fmt, counts, source=str(getattr(session, "path", "")),
+                    rate_hz=session.rate_hz, start_time=session.start_time)
+    logger.info(f"Sesión exportada a {directory}: {sum(counts.values())} muestras")
+    return counts
+
+
+def load_manifest(directory: Union[str, Path]) -> Dict:
+    """
+    Leer el manifiesto de una exportación.
+
+    Args:
+        directory: Directorio de la exportación
+
+    Returns:
+        Diccionario del manifiesto
+    """
+    return json.loads((Path(directory) / MANIFEST_NAME).read_text(encoding="utf-8"))
+
+
+def load_columns(directory: Union[str, Path], sensor_type: SensorType) -> Dict[str, np.ndarray]:
+    """
+    Abrir las columnas exportadas de un sensor.
+
+    En formato npy cada columna es un np.memmap de solo lectura. En
+    formato npz se devuelve el archivo npz abierto, que lee cada
+    columna al accederla.
+
+    Args:
+        directory: Directorio de la exportación
+        sensor_type: Tipo de sensor
+
+    Returns:
+        Mapeo columna → array (timestamp, x, y, z)
+
+    Raises:
+        KeyError: Si el sensor no está en la exportación
+    """
+    directory = Path(directory)
+    manifest = load_manifest(directory)
+    if sensor_type.value not in manifest["sensors"]:
+        raise KeyError(f"Sensor no exportado: {sensor_type.value}")
+    if manifest["format"] == "npz":
+        return np.load(directory / f"{sensor_type.value}.npz")
+    return {name: np.load(directory / sensor_type.value / f"{name}.npy", mmap_mode="r")
+            for name in manifest["columns"]}
+
+
+def load_export(directory: Union[str, Path]) -> Dict[SensorType, Dict[str, np.ndarray]]:
+    """
+    Abrir todas las columnas de una exportación.
+
+    Args:
+        directory: Directorio de la exportación
+
+    Returns:
+        Mapeo sensor → columnas (ver load_columns)
+    """
+    manifest = load_manifest(directory)
+    return {SensorType(value): load_columns(directory, SensorType(value))
+            for value in manifest["sensors"]}
@@ -0,0 +1,416 @@
+"""
+Módulo de fusión de sensores para estimar la orientación.
+
+Combina giroscopio, acelerómetro y (opcionalmente) magnetómetro con
+los filtros de Madgwick o Mahony y publica la orientación resultante
+en SensorManager como el sensor virtual SensorType.ORIENTATION
+(x = roll, y = pitch, z = yaw, en radianes).
+
+Convenciones: giroscopio en rad/s; acelerómetro con la reacción a la
+gravedad en +z cuando el dispositivo está en reposo boca arriba (las
+unidades dan igual, se normaliza); cuaterniones (w, x, y, z) que
+rotan del marco del sensor al marco terrestre.
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from sensors import SensorManager, SensorType
+
+logger = logging.getLogger(__name__)
+
+Quaternion = Tuple[float, float, float, float]
+Vector = Tuple[float, float, float]
+
+_NO_MAG = (0.0, 0.0, 0.0)
+
+# Muestras mínimas de historial leídas por bloque al emparejar sensores
+TAIL_MIN = 64
+
+
+def quaternion_to_euler(quaternions) -> np.ndarray:
+    """
+    Convertir cuaterniones a ángulos de Euler (vectorizado).
+
+    Args:
+        quaternions: Array (n, 4) o (4,) con (w, x, y, z)
+
+    Returns:
+        Array (n, 3) o (3,) con (roll, pitch, yaw) en radianes
+    """
+    q = np.asarray(quaternions, dtype=np.float64)
+    w, x, y, z = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    roll = np.arctan2(2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y))
+    pitch = np.arcsin(np.clip(2.0 * (w * y - z * x), -1.0, 1.0))
+    yaw = np.arctan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))
+    return np.stack((roll, pitch, yaw), axis=-1)
+
+
+class OrientationFilter(ABC):
+    """
+    Base de los filtros de orientación.
+
+    Las subclases implementan _step(), que avanza el cuaternión una
+    muestra usando solo floats de Python. update_block() convierte los
+    arrays a listas una sola vez y encadena _step() sobre todo el
+    bloque, evitando el coste por muestra de NumPy y de las llamadas.
+    """
+
+    def __init__(self):
+        """Inicializar con la orientación identidad."""
+        self.quaternion: Quaternion = (1.0, 0.0, 0.0, 0.0)
+
+    @abstractmethod
+    def _step(self, q: Quaternion, gyro: Vector, accel: Vector, mag: Vector,
+              dt: float) -> Quaternion:
+        """Avanzar el cuaternión q una muestra."""
+
+    def update(self, gyro: Vector, accel: Vector, mag: Optional[Vector] = None,
+               dt: float = 1.0 / 200.0) -> Quaternion:
+        """
+        Avanzar la orientación con una muestra.
+
+        Args:
+            gyro: Velocidad angular (rad/s)
+            accel: Aceleración; (0, 0, 0) omite la corrección
+            mag: Campo magnético; None o (0, 0, 0) para solo IMU
+            dt: Intervalo desde la muestra anterior en segundos
+
+        Returns:
+            Cuaternión (w, x, y, z) actualizado
+        """
+        self.quaternion = self._step(self.quaternion, tuple(gyro), tuple(accel),
+                                     tuple(mag) if mag is not None else _NO_MAG, dt)
+        return self.quaternion
+
+    def update_block(self, gyros, accels, mags=None, dts=1.0 / 200.0) -> np.ndarray:
+        """
+        Avanzar la orientación con un bloque de muestras.
+
+        Args:
+            gyros: Array (n, 3) de velocidades angulares
+            accels: Array (n, 3) de aceleraciones
+            mags: Array (n, 3) de campo magnético o None
+            dts: Intervalos (n,) o un intervalo común
+
+        Returns:
+            Array (n, 4) con el cuaternión tras cada muestra
+        """
+        gyro_rows = np.asarray(gyros, dtype=np.float64).tolist()
+        n = len(gyro_rows)
+        accel_rows = np.asarray(accels, dtype=np.float64).tolist()
+        mag_rows = (np.asarray(mags, dtype=np.float64).tolist()
+                    if mags is not None else [_NO_MAG] * n)
+        dt_rows = np.broadcast_to(np.asarray(dts, dtype=np.float64), (n,)).tolist()
+
+        step = self._step
+        q = self.quaternion
+        out = [None] * n
+        for i in range(n):
+            q = step(q, gyro_rows[i], accel_rows[i], mag_rows[i], dt_rows[i])
+            out[i] = q
+        self.quaternion = q
+        return np.array(out, dtype=np.float64).reshape(n, 4)
+
+    def reset(self) -> None:
+        """Volver a la orientación identidad."""
+        self.quaternion = (1.0, 0.0, 0.0, 0.0)
+
+
+class MadgwickFilter(OrientationFilter):
+    """
+    Filtro de Madgwick (descenso de gradiente).
+
+    Versión IMU (giroscopio + acelerómetro) y MARG (con
+    magnetómetro) según S. Madgwick, 2010.
+    """
+
+    def __init__(self, beta: float = 0.1):
+        """
+        Inicializar el filtro.
+
+        Args:
+            beta: Ganancia del paso de corrección (rad/s)
+        """
+        super().__init__()
+        self.beta = beta
+
+    def _step(self, q, gyro, accel, mag, dt):
+        q0, q1, q2, q3 = q
+        gx, gy, gz = gyro
+        ax, ay, az = accel
+        mx, my, mz = mag
+
+        # Derivada del cuaternión según el giroscopio
+        d0 = 0.5 * (-q1 * gx - q2 * gy - q3 * gz)
+        d1 = 0.5 * (q0 * gx + q2 * gz - q3 * gy)
+        d2 = 0.5 * (q0 * gy - q1 * gz + q3 * gx)
+        d3 = 0.5 * (q0 * gz + q1 * gy - q2 * gx)
+
+        a_norm = math.sqrt(ax * ax + ay * ay + az * az)
+        if a_norm > 0.0:
+            ax /= a_norm
+            ay /= a_norm
+            az /= a_norm
+
+            # Gradiente del error de gravedad: J_g^T f_g
+            f1 = 2.0 * (q1 * q3 - q0 * q2) - ax
+            f2 = 2.0 * (q0 * q1 + q2 * q3) - ay
+            f3 = 2.0 * (0.5 - q1 * q1 - q2 * q2) - az
+            s0 = -2.0 * q2 * f1 + 2.0 * q1 * f2
+            s1 = 2.0 * q3 * f1 + 2.0 * q0 * f2 - 4.0 * q1 * f3
+            s2 = -2.0 * q0 * f1 + 2.0 * q3 * f2 - 4.0 * q2 * f3
+            s3 = 2.0 * q1 * f1 + 2.0 * q2 * f2
+
+            m_norm = math.sqrt(mx * mx + my * my + mz * mz)
+            if m_norm > 0.0:
+                mx /= m_norm
+                my /= m_norm
+                mz /= m_norm
+
+                # Dirección del campo en el marco terrestre: b = (bx, 0, bz)
+                hx = (2.0 * mx * (0.5 - q2 * q2 - q3 * q3) + 2.0 * my * (q1 * q2 - q0 * q3)
+                      + 2.0 * mz * (q1 * q3 + q0 * q2))
+                hy = (2.0 * mx * (q1 * q2 + q0 * q3) + 2.0 * my * (0.5 - q1 * q1 - q3 * q3)
+                      + 2.0 * mz * (q2 * q3 - q0 * q1))
+                bz = (2.0 * mx * (q1 * q3 - q0 * q2) + 2.0 * my * (q2 * q3 + q0 * q1)
+                      + 2.0 * mz * (0.5 - q1 * q1 - q2 * q2))
+                bx = math.sqrt(hx * hx + hy * hy)
+
+                # Gradiente del error magnético: J_b^T f_b
+                f4 = 2.0 * bx * (0.5 - q2 * q2 - q3 * q3) + 2.0 * bz * (q1 * q3 - q0 * q2) - mx
+                f5 = 2.0 * bx * (q1 * q2 - q0 * q3) + 2.0 * bz * (q0 * q1 + q2 * q3) - my
+                f6 = 2.0 * bx * (q0 * q2 + q1 * q3) + 2.0 * bz * (0.5 - q1 * q1 - q2 * q2) - mz
+                s0 += -2.0 * bz * q2 * f4 + (-2.0 * bx * q3 + 2.0 * bz * q1) * f5 + 2.0 * bx * q2 * f6
+                s1 += (2.0 * bz * q3 * f4 + (2.0 * bx * q2 + 2.0 * bz * q0) * f5
+                       + (2.0 * bx * q3 - 4.0 * bz * q1) * f6)
+                s2 += ((-4.0 * bx * q2 - 2.0 * bz * q0) * f4 + (2.0 * bx * q1 + 2.0 * bz * q3) * f5
+                       + (2.0 * bx * q0 - 4.0 * bz * q2) * f6)
+                s3 += ((-4.0 * bx * q3 + 2.0 * bz * q1) * f4 + (-2.0 * bx * q0 + 2.0 * bz * q2) * f5
+                       + 2.0 * bx * q1 * f6)
+
+            s_norm = math.sqrt(s0 * s0 + s1 * s1 + s2 * s2 + s3 * s3)
+            if s_norm > 0.0:
+                beta = self.beta / s_norm
+                d0 -= beta * s0
+                d1 -= beta * s1
+                d2 -= beta * s2
+                d3 -= beta * s3
+
+        q0 += d0 * dt
+        q1 += d1 * dt
+        q2 += d2 * dt
+        q3 += d3 * dt
+        norm = math.sqrt(q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3)
+        return (q0 / norm, q1 / norm, q2 / norm, q3 / norm)
+
+
+class MahonyFilter(OrientationFilter):
+    """
+    Filtro complementario no lineal de Mahony.
+
+    Corrige la velocidad angular con un término proporcional-integral
+    sobre el error entre la gravedad (y el norte magnético, si hay
+    magnetómetro) medida y la estimada.
+    """
+
+    def __init__(self, kp: float = 1.0, ki: float = 0.0):
+        """
+        Inicializar el filtro.
+
+        Args:
+            kp: Ganancia proporcional
+            ki: Ganancia integral (corrige sesgo del giroscopio)
+        """
+        super().__init__()
+        self.kp = kp
+        self.ki = ki
+        self._integral = (0.0, 0.0, 0.0)
+
+    def _step(self, q, gyro, accel, mag, dt):
+        q0, q1, q2, q3 = q
+        gx, gy, gz = gyro
+        ax, ay, az = accel
+        mx, my, mz = mag
+
+        a_norm = math.sqrt(ax * ax + ay * ay + az * az)
+        if a_norm > 0.0:
+            ax /= a_norm
+            ay /= a_norm
+            az /= a_norm
+
+            # Gravedad estimada y error (producto vectorial medida x estimada)
+            vx = 2.0 * (q1 * q3 - q0 * q2)
+            vy = 2.0 * (q0 * q1 + q2 * q3)
+            vz = q0 * q0 - q1 * q1 - q2 * q2 + q3 * q3
+            ex = ay * vz - az * vy
+            ey = az * vx - ax * vz
+            ez = ax * vy - ay * vx
+
+            m_norm = math.sqrt(mx * mx + my * my + mz * mz)
+            if m_norm > 0.0:
+                mx /= m_norm
+                my /= m_norm
+                mz /= m_norm
+                hx = (2.0 * mx * (0.5 - q2 * q2 - q3 * q3) + 2.0 * my * (q1 * q2 - q0 * q3)
+                      + 2.0 * mz * (q1 * q3 + q0 * q2))
+                hy = (2.0 * mx * (q1 * q2 + q0 * q3) + 2.0 * my * (0.5 - q1 * q1 - q3 * q3)
+                      + 2.0 * mz * (q2 * q3 - q0 * q1))
+                bz = (2.0 * mx * (q1 * q3 - q0 * q2) + 2.0 * my * (q2 * q3 + q0 * q1)
+                      + 2.0 * mz * (0.5 - q1 * q1 - q2 * q2))
+                bx = math.sqrt(hx * hx + hy * hy)
+                wx = 2.0 * bx * (0.5 - q2 * q2 - q3 * q3) + 2.0 * bz * (q1 * q3 - q0 * q2)
+                wy = 2.0 * bx * (q1 * q2 - q0 * q3) + 2.0 * bz * (q0 * q1 + q2 * q3)
+                wz = 2.0 * bx * (q0 * q2 + q1 * q3) + 2.0 * bz * (0.5 - q1 * q1 - q2 * q2)
+                ex += my * wz - mz * wy
+                ey += mz * wx - mx * wz
+                ez += mx * wy - my * wx
+
+            if self.ki > 0.0:
+                ix, iy, iz = self._integral
+                ix += self.ki * ex * dt
+                iy += self.ki * ey * dt
+                iz += self.ki * ez * dt
+                self._integral = (ix, iy, iz)
+                gx += ix
+                gy += iy
+                gz += iz
+            gx += self.kp * ex
+            gy += self.kp * ey
+            gz += self.kp * ez
+
+        half_dt = 0.5 * dt
+        q0, q1, q2, q3 = (q0 + (-q1 * gx - q2 * gy - q3 * gz) * half_dt,
+                          q1 + (q0 * gx + q2 * gz - q3 * gy) * half_dt,
+                          q2 + (q0 * gy - q1 * gz + q3 * gx) * half_dt,
+                          q3 + (q0 * gz + q1 * gy - q2 * gx) * half_dt)
+        norm = math.sqrt(q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3)
+        return (q0 / norm, q1 / norm, q2 / norm, q3 / norm)
+
+    def reset(self) -> None:
+        super().reset()
+        self._integral = (0.0, 0.0, 0.0)
+
+
+class OrientationEngine:
+    """
+    Motor de orientación enganchado a un SensorManager.
+
+    Cada bloque de giroscopio dispara la fusión. Para cada muestra
+    de giroscopio se toma la última muestra de acelerómetro (y de
+    magnetómetro) con timestamp menor o igual, buscada de forma
+    vectorizada en el historial del gestor. El resultado se registra
+    como SensorType.ORIENTATION y se entrega en cuaterniones a los
+    callbacks de on_quaternion().
+    """
+
+    def __init__(self, manager: SensorManager, fusion: Optional[OrientationFilter] = None,
+                 use_magnetometer: bool = True, default_dt: float = 1.0 / 200.0):
+        """
+        Inicializar el motor y suscribirse al giroscopio.
+
+        Args:
+            manager: Gestor de sensores de entrada y salida
+            fusion: Filtro de orientación (Madgwick por defecto)
+            use_magnetometer: Si False, fusión solo IMU
+            default_dt: Intervalo para la primera muestra de giroscopio
+        """
+        self.manager = manager
+        self.fusion = fusion or MadgwickFilter()
+        self.use_magnetometer = use_magnetometer
+        self.default_dt = default_dt
+        self.quaternion_callbacks: List[Callable] = []
+        self.updates = 0
+        self.total_cost_ns = 0
+        self.max_block_cost_ns = 0
+        self._last_timestamp: Optional[float] = None
+        manager.register_callback(SensorType.GYROSCOPE, self._on_gyro, batch=True)
+        logger.info(f"OrientationEngine inicializado ({type(self.fusion).__name__})")
+
+    @property
+    def quaternion(self) -> Quaternion:
+        """Último cuaternión estimado (w, x, y, z)."""
+        return self.fusion.quaternion
+
+    def on_quaternion(self, callback: Callable) -> None:
+        """
+        Registrar un callback de cuaterniones.
+
+        Args:
+            callback: Recibe (timestamps (n,), cuaterniones (n, 4))
+        """
+        self.quaternion_callbacks.append(callback)
+
+    def stats(self) -> Dict:
+        """
+        Obtener el coste medido de la fusión.
+
+        Returns:
+            Actualizaciones, coste medio por actualización (µs), coste
+            máximo por bloque (µs) y frecuencia máxima sostenible (Hz)
+        """
+        mean_us = self.total_cost_ns / self.updates / 1e3 if self.updates else 0.0
+        return {
+            "updates": self.updates,
+            "mean_update_us": mean_us,
+            "max_block_us": self.max_block_cost_ns / 1e3,
+            "max_rate_hz": 1e6 / mean_us if mean_us > 0 else float("inf"),
+        }
+
+    def _latest_before(self, sensor_type: SensorType, timestamps: np.ndarray) -> np.ndarray:
+        """Última muestra de un sensor en o antes de cada timestamp (ceros si no hay)."""
+        # Leer solo la cola reciente del historial, ampliándola hasta que
+        # cubra el primer timestamp del bloque o abarque todo el historial
+        count = max(TAIL_MIN, 2 * len(timestamps))
+        while True:
+            history = self.manager.get_array(sensor_type, count)
+            if len(history) < count or history["timestamp"][0] <= timestamps[0]:
+                break
+            count *= 2
+        out = np.zeros((len(timestamps), 3))
+        if len(history) == 0:
+            return out
+        idx = np.searchsorted(history["timestamp"], timestamps, side="right") - 1
+        valid = idx >= 0
+        rows = history[idx[valid]]
+        out[valid] = np.column_stack((rows["x"], rows["y"], rows["z"]))
+        return out
+
+    def _on_gyro(self, sensor_type: SensorType, block: np.ndarray) -> None:
+        """Fusionar un bloque de giroscopio y publicar la orientación."""
+        start = time.perf_counter_ns()
+        timestamps = np.array(block["timestamp"])
+        gyros = np.column_stack((block["x"], block["y"], block["z"]))
+        accels = self._latest_before(SensorType.ACCELEROMETER, timestamps)
+        mags = (self._latest_before(SensorType.MAGNETOMETER, timestamps)
+                if self.use_magnetometer else None)
+
+        previous = timestamps[0] - self.default_dt if self._last_timestamp is None else self._last_timestamp
+        dts = np.diff(timestamps, prepend=previous)
+        dts[dts <= 0] = self.default_dt
+        self._last_timestamp = float(timestamps[-1])
+
+        quaternions = self.fusion.update_block(gyros, accels, mags, dts)
+
+        cost = time.perf_counter_ns() - start
+        self.updates += len(block)
+        self.total_cost_ns += cost
+        if cost > self.max_block_cost_ns:
+            self.max_block_cost_ns = cost
+
+        euler = quaternion_to_euler(quaternions)
+        self.manager.record_batch(SensorType.ORIENTATION, euler[:, 0], euler[:, 1],
+                                  euler[:, 2], timestamps)
+        for callback in self.quaternion_callbacks:
+            try:
+                callback(timestamps, quaternions)
+            except Exception as e:
+                logger.error(f"Error en callback de cuaterniones: {e}")
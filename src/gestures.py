@@ -0,0 +1,305 @@
+"""
+Módulo de detección de gestos y trazos.
+
+Convierte el flujo de aceleración del dispositivo en eventos para el
+instrumento de dibujo: sacudidas (shake), golpes secos (tap),
+lanzamientos (flick) e inicio/fin de trazo. La detección es
+incremental: cada muestra actualiza una pequeña máquina de estados
+con coste constante y sin reservar memoria salvo al emitir un evento.
+
+Se espera aceleración de usuario en g (sin gravedad, como
+SensorType.USER_ACCELERATION); con remove_gravity=True se aplica un
+filtro paso alto para usar directamente el acelerómetro.
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from sensors import SensorManager, SensorType
+from utils.filters import HighPassFilter
+
+logger = logging.getLogger(__name__)
+
+
+class GestureType(Enum):
+    """Tipos de gesto detectables."""
+    TAP = "tap"
+    FLICK = "flick"
+    SHAKE = "shake"
+    STROKE_START = "stroke_start"
+    STROKE_END = "stroke_end"
+
+
+@dataclass(slots=True)
+class GestureEvent:
+    """Gesto detectado."""
+    type: GestureType
+    timestamp: float
+    magnitude: float  # Pico (tap/flick/shake) o nivel de movimiento (trazo)
+    direction: Tuple[float, float, float] = (0.0, 0.0, 0.0)  # Unitario, si aplica
+
+    def to_dict(self) -> Dict:
+        """Convertir a diccionario."""
+        return {
+            "type": self.type.value,
+            "timestamp": self.timestamp,
+            "magnitude": self.magnitude,
+            "direction": list(self.direction),
+        }
+
+
+@dataclass
+class GestureConfig:
+    """Umbrales (en g) y tiempos (en segundos) de la detección."""
+    tap_threshold: float = 1.5
+    tap_max_duration: float = 0.06
+    flick_threshold: float = 1.0
+    flick_max_duration: float = 0.25
+    release_ratio: float = 0.5
+    refractory: float = 0.15
+    shake_threshold: float = 0.8
+    shake_reversals: int = 4
+    shake_window: float = 1.0
+    stroke_alpha: float = 0.1
+    stroke_start_level: float = 0.15
+    stroke_start_time: float = 0.3  # Mayor que flick_max_duration
+    stroke_stop_level: float = 0.08
+    stroke_stop_time: float = 0.2
+
+
+_NO_EVENTS: Tuple = ()
+
+
+class GestureDetector:
+    """
+    Detector incremental de gestos.
+
+    - Tap / flick: una excursión de la magnitud sobre el umbral de
+      disparo; al bajar del umbral de liberación se clasifica por
+      duración y pico (corta y fuerte: tap; algo más larga: flick,
+      con la dirección del pico).
+    - Shake: inversiones de signo por eje por encima del umbral; N
+      inversiones dentro de la ventana emiten una sacudida.
+    - Trazo: nivel de movimiento (media exponencial de la magnitud)
+      con histéresis y tiempos mínimos de inicio y de parada.
+    """
+
+    def __init__(self, config: Optional[GestureConfig] = None, remove_gravity: bool = False,
+                 gravity_alpha: float = 0.05):
+        """
+        Inicializar el detector.
+
+        Args:
+            config: Umbrales y tiempos (valores por defecto si es None)
+            remove_gravity: Filtrar la gravedad de la entrada (acelerómetro crudo)
+            gravity_alpha: Factor del filtro paso alto si remove_gravity
+        """
+        self.config = config or GestureConfig()
+        self.gesture_callbacks: List[Callable] = []
+        self._highpass = HighPassFilter(gravity_alpha) if remove_gravity else None
+        self.samples = 0
+        self.total_cost_ns = 0
+        self.max_cost_ns = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Olvidar el estado de detección."""
+        self._trigger = min(self.config.tap_threshold, self.config.flick_threshold)
+        self._in_excursion = False
+        self._armed = True  # Solo se dispara tras bajar del umbral de liberación
+        self._excursion_start = 0.0
+        self._peak = 0.0
+        self._peak_vector = (0.0, 0.0, 0.0)
+        self._refractory_until = -math.inf
+        self._axis_sign = [0, 0, 0]
+        self._reversals: deque = deque()
+        self._shake_until = -math.inf
+        self._level = 0.0
+        self._stroke_active = False
+        self._stroke_candidate_since: Optional[float] = None
+        if self._highpass is not None:
+            self._highpass.reset()
+
+    @property
+    def stroke_active(self) -> bool:
+        """Indica si hay un trazo en curso."""
+        return self._stroke_active
+
+    def on_gesture(self, callback: Callable) -> None:
+        """
+        Registrar un callback de gestos.
+
+        Args:
+            callback: Recibe cada GestureEvent detectado
+        """
+        self.gesture_callbacks.append(callback)
+
+    def process(self, x: float, y: float, z: float, timestamp: float):
+        """
+        Procesar una muestra de aceleración.
+
+        Args:
+            x, y, z: Aceleración en g
+            timestamp: Marca de tiempo en segundos
+
+        Returns:
+            Tupla (posiblemente vacía) con los eventos detectados
+        """
+        start = time.perf_counter_ns()
+        if self._highpass is not None:
+            x, y, z = self._highpass.update(x, y, z)
+        cfg = self.config
+        magnitude = math.sqrt(x * x + y * y + z * z)
+        events = _NO_EVENTS
+
+        # Tap / flick: excursiones sobre el umbral de disparo
+        released = magnitude < self._trigger * cfg.release_ratio
+        if self._in_excursion:
+            if magnitude > self._peak:
+                self._peak = magnitude
+                self._peak_vector = (x, y, z)
+            if released:
+                self._in_excursion = False
+                event = self._classify_excursion(timestamp)
+                if event is not None:
+                    events = (event,)
+        elif released:
+            self._armed = True
+        elif magnitude >= self._trigger:
+            if self._armed and timestamp >= self._refractory_until:
+                self._in_excursion = True
+                self._excursion_start = timestamp
+                self._peak = magnitude
+                self._peak_vector = (x, y, z)
+            # Un cruce durante el periodo refractario no cuenta más tarde
+            self._armed = False
+
+        # Shake: inversiones de signo fuertes en cualquier eje
+        reversals = self._reversals
+        threshold = cfg.shake_threshold
+        signs = self._axis_sign
+        for axis, value in enumerate((x, y, z)):
+            if value > threshold or value < -threshold:
+                sign = 1 if value > 0 else -1
+                if signs[axis] == -sign:
+                    reversals.append(timestamp)
+                signs[axis] = sign
+        while reversals and timestamp - reversals[0] > cfg.shake_window:
+            reversals.popleft()
+        if len(reversals) >= cfg.shake_reversals:
+            reversals.clear()
+            signs[0] = signs[1] = signs[2] = 0
+            self._in_excursion = False
+            self._shake_until = timestamp + cfg.shake_window
+            events = events + (GestureEvent(GestureType.SHAKE, timestamp, magnitude),)
+
+        # Trazos: nivel de movimiento con histéresis temporal
+        self._level += cfg.stroke_alpha * (magnitude - self._level)
+        if self._stroke_active:
+            crossing = self._level < cfg.stroke_stop_level
+            hold = cfg.stroke_stop_time
+        else:
+            crossing = self._level > cfg.stroke_start_level
+            hold = cfg.stroke_start_time
+        if not crossing:
+            self._stroke_candidate_since = None
+        elif self._stroke_candidate_since is None:
+            self._stroke_candidate_since = timestamp
+        if crossing and timestamp - self._stroke_candidate_since >= hold:
+            self._stroke_active = not self._stroke_active
+            self._stroke_candidate_since = None
+            kind = GestureType.STROKE_START if self._stroke_active else GestureType.STROKE_END
+            events = events + (GestureEvent(kind, timestamp, self._level),)
+
+        for event in events:
+            for callback in self.gesture_callbacks:
+                try:
+                    callback(event)
+                except Exception as e:
+                    logger.error(f"Error en callback de gesto: {e}")
+
+        cost = time.perf_counter_ns() - start
+        self.samples += 1
+        self.total_cost_ns += cost
+        if cost > self.max_cost_ns:
+            self.max_cost_ns = cost
+        return events
+
+    def _classify_excursion(self, timestamp: float) -> Optional[GestureEvent]:
+        """Clasificar una excursión terminada como tap, flick o nada."""
+        cfg = self.config
+        duration = timestamp - self._excursion_start
+        peak = self._peak
+        if len(self._reversals) >= cfg.shake_reversals - 1 or timestamp < self._shake_until:
+            return None  # Oscilación en curso: parte de una sacudida
+        if duration <= cfg.tap_max_duration and peak >= cfg.tap_threshold:
+            kind = GestureType.TAP
+        elif duration <= cfg.flick_max_duration and peak >= cfg.flick_threshold:
+            kind = GestureType.FLICK
+        else:
+            return None
+        self._refractory_until = timestamp + cfg.refractory
+        px, py, pz = self._peak_vector
+        direction = (px / peak, py / peak, pz / peak) if peak > 0 else (0.0, 0.0, 0.0)
+        return GestureEvent(kind, self._excursion_start, peak, direction)
+
+    def process_block(self, xs, ys, zs, timestamps) -> List[GestureEvent]:
+        """
+        Procesar un bloque de muestras.
+
+        Args:
+            xs, ys, zs, timestamps: Secuencias de igual longitud
+
+        Returns:
+            Lista de eventos detectados en el bloque
+        """
+        found: List[GestureEvent] = []
+        process = self.process
+        columns = [np.asarray(c, dtype=np.float64).tolist() for c in (xs, ys, zs, timestamps)]
+        for x, y, z, t in zip(*columns):
+            events = process(x, y, z, t)
+            if events:
+                found.extend(events)
+        return found
+
+    def attach(self, manager: SensorManager,
+               sensor_type: SensorType = SensorType.USER_ACCELERATION) -> Callable:
+        """
+        Detectar gestos sobre un flujo de SensorManager.
+
+        Args:
+            manager: Gestor de sensores
+            sensor_type: Sensor de aceleración a analizar
+
+        Returns:
+            El callback por lotes registrado en el gestor
+        """
+        def on_block(block_type: SensorType, block: np.ndarray) -> None:
+            self.process_block(block["x"], block["y"], block["z"], block["timestamp"])
+
+        manager.register_callback(sensor_type, on_block, batch=True)
+        return on_block
+
+    def stats(self) -> Dict:
+        """
+        Obtener el coste medido por muestra.
+
+        Returns:
+            Muestras procesadas, coste medio y máximo por muestra (µs)
+        """
+        mean_us = self.total_cost_ns / self.samples / 1e3 if self.samples else 0.0
+        return {
+            "samples": self.samples,
+            "mean_sample_us": mean_us,
+            "max_sample_us": self.max_cost_ns / 1e3,
+        }
@@ -0,0 +1,349 @@
+"""
+Módulo de transporte OSC asíncrono.
+
+Envía datagramas OSC ya codificados por UDP con asyncio
+(DatagramProtocol), con una cola acotada y una tarea de envío por
+destino, de modo que enviar a varios destinos (Max, Pure Data,
+TouchDesigner) nunca bloquea la captura de sensores: submit() solo
+encola y puede llamarse desde cualquier hilo.
+
+Si el socket no admite más datos, asyncio pausa el protocolo y la
+tarea del destino espera a que se reanude en lugar de acumular datos
+en el búfer del transporte; mientras tanto la cola aplica su política
+de desbordamiento (ver overflow.OverflowPolicy).
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+from overflow import OverflowPolicy
+
+logger = logging.getLogger(__name__)
+
+# Datagramas entregados al socket por tarea antes de ceder el bucle
+SEND_BURST = 64
+
+
+class _OSCProtocol(asyncio.DatagramProtocol):
+    """Protocolo de un destino: control de flujo y errores del socket."""
+
+    def __init__(self, queue: "_TargetQueue"):
+        self.queue = queue
+
+    def error_received(self, exc: Exception) -> None:
+        # En UDP llegan p. ej. ICMP "puerto inalcanzable" de envíos previos
+        self.queue.errors += 1
+        logger.debug(f"Error de socket OSC para {self.queue.target}: {exc}")
+
+    def pause_writing(self) -> None:
+        self.queue.writable.clear()
+
+    def resume_writing(self) -> None:
+        self.queue.writable.set()
+
+
+class _TargetQueue:
+    """Cola acotada, socket y tarea de envío de un destino."""
+
+    __slots__ = ("target", "address", "queue", "lock", "event", "writable", "task", "transport",
+                 "failed", "sent", "dropped", "errors")
+
+    def __init__(self, target: str, address: tuple, maxlen: Optional[int]):
+        self.target = target
+        self.address = address
+        self.queue: deque = deque(maxlen=maxlen)
+        # Protege descartes y extracciones entre submit() y la tarea de envío
+        self.lock = threading.Lock()
+        self.event = asyncio.Event()
+        self.writable = asyncio.Event()
+        self.writable.set()
+        self.task: Optional[asyncio.Task] = None
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.failed = False
+        self.sent = 0
+        self.dropped = 0
+        self.errors = 0
+
+
+def _set_result(future: asyncio.Future, result: bool) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _resolve(future: Optional[asyncio.Future], result: bool) -> None:
+    """Resolver un futuro de envío desde cualquier hilo."""
+    if future is None:
+        return
+    loop = future.get_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        _set_result(future, result)
+        return
+    try:
+        loop.call_soon_threadsafe(_set_result, future, result)
+    except RuntimeError:
+        pass  # Bucle cerrado: nadie puede esperar ya el futuro
+
+
+def parse_target(target: str) -> tuple:
+    """
+    Separar un destino "host:port".
+
+    Args:
+        target: Destino en formato "host:port"
+
+    Returns:
+        Par (host, puerto)
+
+    Raises:
+        ValueError: Si el destino no tiene el formato esperado
+    """
+    host, _, port = target.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Destino OSC no válido (se espera host:port): {target}")
+    return host, int(port)
+
+
+class AsyncOSCTransport:
+    """
+    Transporte OSC por UDP basado en asyncio.
+
+    Cada destino tiene su propia cola y su tarea de envío, que abre
+    el socket (create_datagram_endpoint) en el primer envío. submit()
+    es O(1) y seguro entre hilos; send() espera a que el datagrama
+    se haya entregado al socket.
+    """
+
+    def __init__(self, maxsize: int = 4096, policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        """
+        Inicializar el transporte.
+
+        Args:
+            maxsize: Capacidad de la cola de cada destino
+            policy: Política de desbordamiento de las colas
+
+        Raises:
+            ValueError: Si maxsize no es positivo
+        """
+        if maxsize <= 0:
+            raise ValueError(f"maxsize debe ser positivo: {maxsize}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._targets: Dict[str, _TargetQueue] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._closing = False
+
+    @property
+    def is_running(self) -> bool:
+        """Indica si el transporte está asociado a un bucle activo."""
+        return self._loop is not None and not self._closing
+
+    async def start(self) -> None:
+        """Asociar el transporte al bucle actual y lanzar las tareas de envío."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._closing = False
+        for queue in self._targets.values():
+            # Un destino que no pudo abrirse se reintenta en cada inicio
+            queue.failed = False
+            self._start_sender(queue)
+        logger.info("AsyncOSCTransport iniciado")
+
+    async def stop(self, drain: bool = True) -> None:
+        """
+        Detener las tareas de envío y cerrar los sockets.
+
+        Args:
+            drain: Si True, enviar lo pendiente antes de terminar
+        """
+        self._closing = True
+        tasks = []
+        for queue in self._targets.values():
+            if not drain:
+                self._discard(queue)
+            queue.event.set()
+            if queue.task is not None:
+                tasks.append(queue.task)
+                queue.task = None
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for queue in self._targets.values():
+            if queue.transport is not None:
+                queue.transport.close()
+                queue.transport = None
+        self._loop = None
+        self._loop_thread = None
+        logger.info("AsyncOSCTransport detenido")
+
+    def submit(self, target: str, dgram: bytes, future: Optional[asyncio.Future] = None) -> None:
+        """
+        Encolar un datagrama para un destino.
+
+        Args:
+            target: Destino en formato "host:port"
+            dgram: Datagrama OSC codificado
+            future: Futuro a resolver con True al enviarlo (False si
+                se descarta o el destino no pudo abrirse); solo se crea
+                en el hilo del bucle, pero submit() puede llamarse desde
+                cualquier hilo
+
+        Raises:
+            ValueError: Si el destino no tiene el formato esperado
+        """
+        queue = self._targets.get(target)
+        if queue is None:
+            queue = self._subscribe(target)
+
+        items = queue.queue
+        evicted = None
+        with queue.lock:
+            # Un destino cuyo socket no pudo abrirse no tiene consumidor
+            accepted = not queue.failed and not (
+                self.policy is OverflowPolicy.DROP_NEWEST and len(items) >= self.maxsize)
+            if not accepted:
+                queue.dropped += 1
+                evicted = future
+            else:
+                if len(items) == items.maxlen:
+                    # DROP_OLDEST y COALESCE: descartar el más antiguo
+                    _, evicted = items.popleft()
+                    queue.dropped += 1
+                items.append((dgram, future))
+        # Fuera del cerrojo y en el hilo del bucle dueño del futuro
+        _resolve(evicted, False)
+        if not accepted:
+            return
+
+        if self._loop is not None and not queue.event.is_set():
+            if threading.get_ident() == self._loop_thread:
+                queue.event.set()
+            else:
+                self._loop.call_soon_threadsafe(queue.event.set)
+
+    async def send(self, target: str, dgram: bytes) -> bool:
+        """
+        Enviar un datagrama y esperar a que llegue al socket.
+
+        Args:
+            target: Destino en formato "host:port"
+            dgram: Datagrama OSC codificado
+
+        Returns:
+            True si se envió, False si la cola lo descartó
+
+        Raises:
+            RuntimeError: Si el transporte no está iniciado
+        """
+        if not self.is_running:
+            raise RuntimeError("AsyncOSCTransport no iniciado")
+        future = self._loop.create_future()
+        self.submit(target, dgram, future)
+        return await future
+
+    def stats(self) -> List[Dict]:
+        """
+        Obtener contadores por destino.
+
+        Returns:
+            Lista con destino, profundidad de cola, enviados,
+            descartados, errores de socket y si el socket no pudo
+            abrirse, de cada destino
+        """
+        return [
+            {
+                "target": q.target,
+                "queue_depth": len(q.queue),
+                "sent": q.sent,
+                "dropped": q.dropped,
+                "errors": q.errors,
+                "failed": q.failed,
+            }
+            for q in self._targets.values()
+        ]
+
+    def _subscribe(self, target: str) -> _TargetQueue:
+        """Crear la cola de un destino."""
+        maxlen = 1 if self.policy is OverflowPolicy.COALESCE else (
+            None if self.policy is OverflowPolicy.DROP_NEWEST else self.maxsize)
+        queue = _TargetQueue(target, parse_target(target), maxlen)
+        self._targets[target] = queue
+        if self._loop is not None:
+            if threading.get_ident() == self._loop_thread:
+                self._start_sender(queue)
+            else:
+                self._loop.call_soon_threadsafe(self._start_sender, queue)
+        return queue
+
+    def _start_sender(self, queue: _TargetQueue) -> None:
+        """Lanzar la tarea de envío de un destino."""
+        if queue.task is None:
+            queue.task = self._loop.create_task(self._send_loop(queue))
+            if queue.queue:
+                queue.event.set()
+
+    @staticmethod
+    def _discard(queue: _TargetQueue) -> None:
+        """Vaciar la cola de un destino resolviendo sus futuros."""
+        with queue.lock:
+            pending = list(queue.queue)
+            queue.queue.clear()
+        for _, future in pending:
+            _resolve(future, False)
+
+    async def _send_loop(self, queue: _TargetQueue) -> None:
+        """Entregar al socket los datagramas encolados de un destino."""
+        try:
+            queue.transport, _ = await self._loop.create_datagram_endpoint(
+                lambda: _OSCProtocol(queue), remote_addr=queue.address)
+        except OSError as e:
+            logger.error(f"Error abriendo socket OSC para {queue.target}: {e}")
+            queue.errors += 1
+            # Marcar el destino como fallido antes de vaciar la cola: los
+            # envíos posteriores se rechazan en submit() en lugar de
+            # acumularse sin consumidor
+            queue.failed = True
+            queue.task = None
+            self._discard(queue)
+            return
+        logger.info(f"Transporte OSC abierto para {queue.target}")
+
+        items = queue.queue
+        transport = queue.transport
+        while True:
+            burst = 0
+            while items:
+                if not queue.writable.is_set():
+                    await queue.writable.wait()
+                with queue.lock:
+                    if not items:
+                        break
+                    dgram, future = items.popleft()
+                try:
+                    transport.sendto(dgram)
+                    queue.sent += 1
+                    sent = True
+                except Exception as e:
+                    queue.errors += 1
+                    sent = False
+                    logger.error(f"Error enviando OSC a {queue.target}: {e}")
+                if future is not None and not future.done():
+                    future.set_result(sent)
+                burst += 1
+                if burst == SEND_BURST:
+                    # Ceder el bucle para no acaparar la CPU
+                    burst = 0
+                    await asyncio.sleep(0)
+            if self._closing:
+                return
+            queue.event.clear()
+            if not items:
+                await queue.event.wait()
@@ -0,0 +1,20 @@
+"""
+Políticas de desbordamiento de colas acotadas.
+
+Compartidas por los despachadores de callbacks (dispatch.py) y el
+transporte OSC asíncrono (osc_transport.py). El módulo no tiene
+dependencias, de modo que importar communication.py no arrastra
+NumPy ni el gestor de sensores.
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+from enum import Enum
+
+
+class OverflowPolicy(Enum):
+    """Política ante una cola de suscriptor llena."""
+    DROP_OLDEST = "drop_oldest"  # Descartar el elemento más antiguo
+    DROP_NEWEST = "drop_newest"  # Descartar el elemento entrante
+    COALESCE = "coalesce"        # Conservar solo el último elemento
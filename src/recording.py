@@ -0,0 +1,434 @@
+"""
+Módulo de grabación de sesiones de sensores.
+
+Graba las muestras de SensorManager en un archivo binario de
+registros de tamaño fijo escrito mediante mmap: cada muestra es una
+escritura en memoria y el archivo solo crece (una llamada al sistema)
+cada `chunk_records` registros. Las sesiones se leen luego con
+np.memmap, de modo que una grabación de horas se abre al instante y
+solo se cargan las páginas que se consultan.
+
+Formato (little-endian):
+    [0:4]    magia b"SNSR"
+    [4:6]    versión (uint16)
+    [8:16]   número de registros (uint64)
+    [16:20]  longitud del JSON de cabecera (uint32)
+    [20:...] JSON con sensores, frecuencia, inicio y campos
+    [4096:]  registros RECORD_DTYPE
+
+Junto a cada sesión se guarda un índice disperso (<ruta>.idx.npy,
+INDEX_DTYPE): por cada sensor, la marca de tiempo y la posición de
+uno de cada `index_interval` registros suyos. Con él, read_range()
+localiza un intervalo temporal por bisección y solo lee los
+registros de esa zona del archivo.
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from sensors import SensorManager, SensorType, SensorData, SENSOR_DTYPE
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SNSR"
+FORMAT_VERSION = 1
+HEADER_SIZE = 4096
+_HEADER_PREFIX = struct.Struct("<4sHxxQI")
+
+# Registro de 40 bytes alineado a 8: campos de SENSOR_DTYPE + id de sensor
+RECORD_DTYPE = np.dtype({
+    "names": ["timestamp", "x", "y", "z", "sensor"],
+    "formats": ["<f8", "<f8", "<f8", "<f8", "<u2"],
+    "offsets": [0, 8, 16, 24, 32],
+    "itemsize": 40,
+})
+
+# Entrada del índice disperso: registro `record` (posición en el archivo
+# HEADER_SIZE + record * 40) del sensor `sensor` con marca `timestamp`
+INDEX_DTYPE = np.dtype([("sensor", "<u2"), ("timestamp", "<f8"), ("record", "<u8")])
+DEFAULT_INDEX_INTERVAL = 1024
+
+
+def index_path(path: Union[str, Path]) -> Path:
+    """
+    Obtener la ruta del índice disperso de una sesión.
+
+    Args:
+        path: Ruta del archivo de sesión
+
+    Returns:
+        Ruta del archivo de índice
+    """
+    return Path(f"{path}.idx.npy")
+
+
+class SessionRecorder:
+    """
+    Grabador de sesiones en un archivo mapeado en memoria.
+
+    Es seguro usarlo desde varios hilos (p.ej. callbacks ejecutados
+    por ThreadPoolDispatcher). Usar como gestor de contexto o llamar
+    a close() para truncar el archivo a su tamaño real.
+    """
+
+    def __init__(self, path: Union[str, Path], sensor_types: Optional[Sequence[SensorType]] = None,
+                 rate_hz: Optional[float] = None, chunk_records: int = 65536,
+                 index_interval: int = DEFAULT_INDEX_INTERVAL):
+        """
+        Crear el archivo de sesión y escribir la cabecera.
+
+        Args:
+            path: Ruta del archivo (se sobrescribe si existe)
+            sensor_types: Sensores que se grabarán (todos por defecto)
+            rate_hz: Frecuencia nominal de muestreo (informativa)
+            chunk_records: Registros por ampliación del archivo
+            index_interval: Registros de cada sensor por entrada del índice
+
+        Raises:
+            ValueError: Si chunk_records o index_interval no son positivos
+        """
+        if chunk_records <= 0:
+            raise ValueError(f"chunk_records debe ser positivo: {chunk_records}")
+        if index_interval <= 0:
+            raise ValueError(f"index_interval debe ser positivo: {index_interval}")
+        self.path = Path(path)
+        self.sensor_types: List[SensorType] = list(sensor_types or SensorType)
+        self.rate_hz = rate_hz
+        self.start_time = time.time()
+        self.chunk_records = chunk_records
+        self._sensor_ids: Dict[SensorType, int] = {t: i for i, t in enumerate(self.sensor_types)}
+        self._lock = threading.Lock()
+        self._count = 0
+        self._capacity = 0
+        self._mmap: Optional[mmap.mmap] = None
+        self._records: Optional[np.ndarray] = None
+        self.index_interval = index_interval
+        self._sensor_counts = [0] * len(self.sensor_types)
+        self._index: List[tuple] = []
+        index_path(self.path).unlink(missing_ok=True)  # Índice de una sesión anterior
+
+        metadata = json.dumps({
+            "sensors": [t.value for t in self.sensor_types],
+            "rate_hz": rate_hz,
+            "start_time": self.start_time,
+            "fields": list(RECORD_DTYPE.names),
+            "record_size": RECORD_DTYPE.itemsize,
+        }).encode("utf-8")
+        if _HEADER_PREFIX.size + len(metadata) > HEADER_SIZE:
+            raise ValueError("Cabecera de sesión demasiado grande")
+
+        self._file = open(self.path, "w+b")
+        self._file.write(_HEADER_PREFIX.pack(MAGIC, FORMAT_VERSION, 0, len(metadata)) + metadata)
+        self._file.flush()  # La cabecera debe estar en disco antes de mapear
+        self._grow(chunk_records)
+        logger.info(f"Grabación de sesión iniciada en {self.path}")
+
+    @property
+    def count(self) -> int:
+        """Número de registros grabados."""
+        return self._count
+
+    @property
+    def closed(self) -> bool:
+        """Indica si el grabador está cerrado."""
+        return self._file.closed
+
+    def _grow(self, extra_records: int) -> None:
+        """Ampliar el archivo y volver a mapearlo."""
+        self._release_map()
+        self._capacity += extra_records
+        os.ftruncate(self._file.fileno(), HEADER_SIZE + self._capacity * RECORD_DTYPE.itemsize)
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        self._records = np.ndarray((self._capacity,), dtype=RECORD_DTYPE,
+                                   buffer=self._mmap, offset=HEADER_SIZE)
+
+    def _release_map(self) -> None:
+        """Liberar la vista y el mapeo actuales."""
+        self._records = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _reserve(self, n: int) -> int:
+        """Reservar n registros (con el lock tomado) y devolver el primero."""
+        if self._records is None:
+            raise ValueError("El grabador está cerrado")
+        start = self._count
+        if start + n > self._capacity:
+            chunks = -(-(start + n - self._capacity) // self.chunk_records)
+            self._grow(chunks * self.chunk_records)
+        self._count = start + n
+        struct.pack_into("<Q", self._mmap, 8, self._count)
+        return start
+
+    def record(self, sensor_type: SensorType, data: SensorData) -> None:
+        """
+        Grabar una muestra.
+
+        Args:
+            sensor_type: Tipo de sensor
+            data: Datos del sensor
+        """
+        sensor_id = self._sensor_ids[sensor_type]
+        with self._lock:
+            index = self._reserve(1)
+            self._records[index] = (data.timestamp, data.x, data.y, data.z, sensor_id)
+            ordinal = self._sensor_counts[sensor_id]
+            if ordinal % self.index_interval == 0:
+                self._index.append((sensor_id, data.timestamp, index))
+            self._sensor_counts[sensor_id] = ordinal + 1
+
+    def record_block(self, sensor_type: SensorType, block: np.ndarray) -> None:
+        """
+        Grabar un bloque de muestras.
+
+        Args:
+            sensor_type: Tipo de sensor
+            block: Array estructurado con campos x, y, z, timestamp
+        """
+        n = len(block)
+        if n == 0:
+            return
+        sensor_id = self._sensor_ids[sensor_type]
+        with self._lock:
+            start = self._reserve(n)
+            out = self._records[start:start + n]
+            for name in SENSOR_DTYPE.names:
+                out[name] = block[name]
+            out["sensor"] = sensor_id
+            ordinal = self._sensor_counts[sensor_id]
+            interval = self.index_interval
+            timestamps = block["timestamp"]
+            for k in range(-ordinal % interval, n, interval):
+                self._index.append((sensor_id, float(timestamps[k]), start + k))
+            self._sensor_counts[sensor_id] = ordinal + n
+
+    def attach(self, manager: SensorManager) -> None:
+        """
+        Grabar todo lo que registre un SensorManager.
+
+        Registra un callback por lotes para cada sensor de la sesión.
+
+        Args:
+            manager: Gestor de sensores a grabar
+        """
+        for sensor_type in self.sensor_types:
+            manager.register_callback(sensor_type, self.record_block, batch=True)
+
+    def _write_index(self) -> None:
+        """Guardar el índice disperso junto a la sesión (con el lock tomado)."""
+        np.save(index_path(self.path), np.array(self._index, dtype=INDEX_DTYPE))
+
+    def flush(self) -> None:
+        """Forzar la escritura a disco de lo grabado y del índice."""
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.flush()
+                self._write_index()
+
+    def close(self) -> None:
+        """Truncar el archivo a los registros grabados y cerrarlo."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._release_map()
+            os.ftruncate(self._file.fileno(), HEADER_SIZE + self._count * RECORD_DTYPE.itemsize)
+            self._file.close()
+            self._write_index()
+        logger.info(f"Grabación de sesión cerrada: {self._count} registros en {self.path}")
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SessionReader:
+    """
+    Lector de sesiones grabadas.
+
+    Los registros se exponen como np.memmap de solo lectura: abrir
+    la sesión no lee los datos y solo se cargan las páginas usadas.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Abrir una sesión.
+
+        Args:
+            path: Ruta del archivo de sesión
+
+        Raises:
+            ValueError: Si el archivo no es una sesión válida
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            prefix = f.read(_HEADER_PREFIX.size)
+            if len(prefix) < _HEADER_PREFIX.size:
+                raise ValueError(f"Archivo de sesión truncado: {self.path}")
+            magic, version, count, meta_len = _HEADER_PREFIX.unpack(prefix)
+            if magic != MAGIC:
+                raise ValueError(f"No es un archivo de sesión: {self.path}")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Versión de sesión no soportada: {version}")
+            metadata = json.loads(f.read(meta_len).decode("utf-8"))
+
+        # Si la grabación no se cerró, el archivo puede ser más largo que count
+        available = max(0, (self.path.stat().st_size - HEADER_SIZE) // RECORD_DTYPE.itemsize)
+        self.count = min(count, available)
+        self.sensor_types: List[SensorType] = [SensorType(v) for v in metadata["sensors"]]
+        self.rate_hz: Optional[float] = metadata.get("rate_hz")
+        self.start_time: float = metadata["start_time"]
+        self.records = (np.memmap(self.path, dtype=RECORD_DTYPE, mode="r",
+                                  offset=HEADER_SIZE, shape=(self.count,))
+                        if self.count else np.empty(0, dtype=RECORD_DTYPE))
+        self._index: Optional[Dict[int, tuple]] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def sensor_id(self, sensor_type: SensorType) -> int:
+        """
+        Obtener el id de un sensor en esta sesión.
+
+        Raises:
+            KeyError: Si el sensor no forma parte de la sesión
+        """
+        try:
+            return self.sensor_types.index(sensor_type)
+        except ValueError:
+            raise KeyError(f"Sensor no grabado en la sesión: {sensor_type.value}") from None
+
+    def iter_blocks(self, block_size: int = 65536) -> Iterator[np.ndarray]:
+        """
+        Recorrer la sesión por bloques de registros.
+
+        Args:
+            block_size: Registros por bloque
+
+        Yields:
+            Vistas consecutivas de RECORD_DTYPE
+        """
+        for start in range(0, self.count, block_size):
+            yield self.records[start:start + block_size]
+
+    def sensor_array(self, sensor_type: SensorType) -> np.ndarray:
+        """
+        Extraer todas las muestras de un sensor.
+
+        Args:
+            sensor_type: Tipo de sensor
+
+        Returns:
+            Array SENSOR_DTYPE con las muestras del sensor en orden
+        """
+        sensor_id = self.sensor_id(sensor_type)
+        parts = []
+        for block in self.iter_blocks():
+            selected = block[block["sensor"] == sensor_id]
+            part = np.empty(len(selected), dtype=SENSOR_DTYPE)
+            for name in SENSOR_DTYPE.names:
+                part[name] = selected[name]
+            parts.append(part)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=SENSOR_DTYPE)
+
+    def _load_index(self) -> Dict[int, tuple]:
+        """
+        Cargar el índice disperso por sensor.
+
+        Si la sesión no tiene archivo de índice (grabación antigua) se
+        construye con una pasada por bloques. Un índice incompleto
+        (grabación no cerrada) sigue siendo válido: los registros
+        posteriores a su última entrada se recorren al consultar.
+        """
+        if self._index is None:
+            path = index_path(self.path)
+            if path.exists():
+                entries = np.load(path)
+                entries = entries[entries["record"] < self.count]
+            else:
+                entries = self.build_index()
+            self._index = {}
+            for sensor_id in range(len(self.sensor_types)):
+                selected = entries[entries["sensor"] == sensor_id]
+                self._index[sensor_id] = (np.ascontiguousarray(selected["timestamp"]),
+                                          np.ascontiguousarray(selected["record"]).astype(np.int64))
+        return self._index
+
+    def build_index(self, interval: int = DEFAULT_INDEX_INTERVAL) -> np.ndarray:
+        """
+        Construir el índice disperso recorriendo la sesión.
+
+        Args:
+            interval: Registros de cada sensor por entrada del índice
+
+        Returns:
+            Entradas INDEX_DTYPE en orden de registro
+        """
+        counts = np.zeros(len(self.sensor_types), dtype=np.int64)
+        parts = []
+        for start, block in zip(range(0, self.count, 65536), self.iter_blocks(65536)):
+            ids = block["sensor"]
+            for sensor_id in np.unique(ids):
+                rows = np.flatnonzero(ids == sensor_id)
+                ordinals = counts[sensor_id] + np.arange(len(rows))
+                rows = rows[ordinals % interval == 0]
+                part = np.empty(len(rows), dtype=INDEX_DTYPE)
+                part["sensor"] = sensor_id
+                part["timestamp"] = block["timestamp"][rows]
+                part["record"] = start + rows
+                parts.append(part)
+                counts[sensor_id] += len(ordinals)
+        if not parts:
+            return np.empty(0, dtype=INDEX_DTYPE)
+        entries = np.concatenate(parts)
+        return entries[np.argsort(entries["record"], kind="stable")]
+
+    def read_range(self, sensor_type: SensorType, t0: float, t1: float) -> np.ndarray:
+        """
+        Leer las muestras de un sensor en un intervalo temporal.
+
+        El índice se consulta por bisección y solo se leen los
+        registros entre las entradas que rodean [t0, t1]. Supone que
+        las marcas de tiempo de cada sensor son crecientes.
+
+        Args:
+            sensor_type: Tipo de sensor
+            t0: Marca de tiempo inicial (incluida)
+            t1: Marca de tiempo final (incluida)
+
+        Returns:
+            Array SENSOR_DTYPE con las muestras del intervalo en orden
+
+        Raises:
+            KeyError: Si el sensor no forma parte de la sesión
+        """
+        sensor_id = self.sensor_id(sensor_type)
+        timestamps, positions = self._load_index()[sensor_id]
+        if len(positions) == 0 or t1 < t0:
+            return np.empty(0, dtype=SENSOR_DTYPE)
+        lo = int(np.searchsorted(timestamps, t0, side="right")) - 1
+        hi = int(np.searchsorted(timestamps, t1, side="right"))
+        first = int(positions[lo]) if lo >= 0 else int(positions[0])
+        stop = int(positions[hi]) if hi < len(positions) else self.count
+
+        window = self.records[first:stop]
+        selected = window[(window["sensor"] == sensor_id) &
+                          (window["timestamp"] >= t0) & (window["timestamp"] <= t1)]
+        result = np.empty(len(selected), dtype=SENSOR_DTYPE)
+        for name in SENSOR_DTYPE.names:
+            result[name] = selected[name]
+        return result
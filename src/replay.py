@@ -0,0 +1,241 @@
+"""
+Módulo de reproducción de sesiones grabadas.
+
+Vuelve a inyectar una sesión grabada (recording.py) en un
+SensorManager para reproducir problemas de campo o someter a carga
+los mapeos: en tiempo real, con el tiempo escalado (p.ej. 10×) o tan
+rápido como sea posible. Informa del ritmo de muestras logrado y de
+la latencia extremo a extremo hasta los callbacks.
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, asdict
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from sensors import SensorManager, SensorType, SensorData
+from recording import SessionReader
+from dispatch import ThreadPoolDispatcher
+
+logger = logging.getLogger(__name__)
+
+# Espera máxima (s) a que los consumidores asíncronos reciban lo inyectado
+DRAIN_TIMEOUT = 1.0
+
+
+class ReplayMode(Enum):
+    """Modos de reproducción."""
+    REALTIME = "realtime"  # Respetar los tiempos grabados
+    SCALED = "scaled"      # Tiempos grabados divididos por speed
+    FAST = "fast"          # Sin esperas
+
+
+@dataclass
+class ReplayReport:
+    """Resultado de una reproducción."""
+    samples: int
+    blocks: int
+    elapsed_s: float
+    session_s: float
+    throughput_hz: float
+    speed_achieved: float
+    latency_mean_ms: float
+    latency_p99_ms: float
+    latency_max_ms: float
+    max_schedule_lag_ms: float
+
+    def to_dict(self) -> Dict:
+        """Convertir a diccionario."""
+        return asdict(self)
+
+
+class SessionReplayer:
+    """
+    Reproductor de sesiones sobre un SensorManager.
+
+    La sesión se recorre por bloques leídos del memmap. En los modos
+    temporizados cada bloque se parte en ticks de `tick` segundos de
+    sesión y se espera a su instante; en FAST se inyectan bloques de
+    block_size registros. Cada tramo se inyecta en tandas consecutivas
+    del mismo sensor, en el orden grabado, con record_batch (o una a
+    una con record_data si use_batch=False).
+
+    La latencia se mide con un callback por lotes de sondeo en cada
+    sensor: desde que el tramo se entrega al gestor hasta que el
+    sondeo lo recibe (incluye la cola del despachador si lo hay).
+    """
+
+    def __init__(self, session: Union[SessionReader, str, Path], manager: SensorManager,
+                 mode: ReplayMode = ReplayMode.REALTIME, speed: float = 1.0,
+                 block_size: int = 4096, tick: float = 0.005, use_batch: bool = True):
+        """
+        Inicializar el reproductor.
+
+        Args:
+            session: Sesión abierta o ruta del archivo de sesión
+            manager: Gestor que recibirá las muestras
+            mode: Modo de reproducción
+            speed: Factor de velocidad en modo SCALED
+            block_size: Registros leídos por bloque
+            tick: Granularidad temporal (s de sesión) en modos temporizados
+            use_batch: Inyectar con record_batch en lugar de record_data
+
+        Raises:
+            ValueError: Si speed, block_size o tick no son positivos
+        """
+        if speed <= 0 or block_size <= 0 or tick <= 0:
+            raise ValueError("speed, block_size y tick deben ser positivos")
+        self.reader = session if isinstance(session, SessionReader) else SessionReader(session)
+        self.manager = manager
+        self.mode = mode
+        self.speed = 1.0 if mode is ReplayMode.REALTIME else speed
+        self.block_size = block_size
+        self.tick = tick
+        self.use_batch = use_batch
+        self._sent: Dict[Tuple[SensorType, float], int] = {}
+        self._latencies: List[int] = []
+
+    def _probe(self, sensor_type: SensorType, block: np.ndarray) -> None:
+        """Callback de sondeo: medir la latencia del tramo recibido."""
+        sent = self._sent.pop((sensor_type, float(block["timestamp"][-1])), None)
+        if sent is not None:
+            self._latencies.append(time.perf_counter_ns() - sent)
+
+    def _segments(self) -> Iterator[Tuple[float, np.ndarray]]:
+        """Producir (instante de sesión relativo, tramo de registros)."""
+        if len(self.reader) == 0:
+            return
+        origin = float(self.reader.records["timestamp"][0])
+        for block in self.reader.iter_blocks(self.block_size):
+            if self.mode is ReplayMode.FAST:
+                yield float(block["timestamp"][0]) - origin, block
+                continue
+            # Máximo acumulado: los registros de otro sensor algo atrasados
+            # viajan con el tramo en curso en lugar de partirlo
+            ticks = np.maximum.accumulate(np.floor((block["timestamp"] - origin) / self.tick))
+            bounds = np.flatnonzero(np.diff(ticks)) + 1
+            start = 0
+            for stop in [*bounds.tolist(), len(block)]:
+                segment = block[start:stop]
+                yield float(ticks[start]) * self.tick, segment
+                start = stop
+
+    def _inject(self, segment: np.ndarray) -> int:
+        """Entregar un tramo al gestor en tandas consecutivas del mismo sensor."""
+        sensor_types = self.reader.sensor_types
+        ids = segment["sensor"]
+        # Partir solo donde cambia el sensor para conservar el orden grabado
+        bounds = [0, *(np.flatnonzero(np.diff(ids)) + 1).tolist(), len(segment)]
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            sensor_type = sensor_types[ids[start]]
+            rows = segment[start:stop]
+            if self.use_batch:
+                self._sent[(sensor_type, float(rows["timestamp"][-1]))] = time.perf_counter_ns()
+                self.manager.record_batch(sensor_type, rows["x"], rows["y"], rows["z"],
+                                          rows["timestamp"])
+            else:
+                for t, x, y, z in zip(rows["timestamp"].tolist(), rows["x"].tolist(),
+                                      rows["y"].tolist(), rows["z"].tolist()):
+                    self._sent[(sensor_type, t)] = time.perf_counter_ns()
+                    self.manager.record_data(sensor_type, SensorData(sensor_type, x, y, z, t))
+        return len(segment)
+
+    def _attach_probes(self) -> None:
+        self._sent.clear()
+        self._latencies = []
+        for sensor_type in self.reader.sensor_types:
+            self.manager.register_callback(sensor_type, self._probe, batch=True)
+
+    def _detach_probes(self) -> None:
+        for sensor_type in self.reader.sensor_types:
+            self.manager.unregister_callback(sensor_type, self._probe, batch=True)
+
+    def _report(self, samples: int, blocks: int, elapsed: float, max_lag: float) -> ReplayReport:
+        """Construir el informe de la reproducción."""
+        timestamps = self.reader.records["timestamp"]
+        session_s = float(timestamps[-1] - timestamps[0]) if len(timestamps) else 0.0
+        latencies = np.asarray(self._latencies, dtype=np.float64) / 1e6
+        report = ReplayReport(
+            samples=samples,
+            blocks=blocks,
+            elapsed_s=elapsed,
+            session_s=session_s,
+            throughput_hz=samples / elapsed if elapsed > 0 else 0.0,
+            speed_achieved=session_s / elapsed if elapsed > 0 else 0.0,
+            latency_mean_ms=float(latencies.mean()) if len(latencies) else 0.0,
+            latency_p99_ms=float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+            latency_max_ms=float(latencies.max()) if len(latencies) else 0.0,
+            max_schedule_lag_ms=max_lag * 1e3,
+        )
+        logger.info(f"Reproducción terminada: {samples} muestras a {report.throughput_hz:.0f} Hz "
+                    f"(x{report.speed_achieved:.2f})")
+        return report
+
+    def run(self) -> ReplayReport:
+        """
+        Reproducir la sesión de forma síncrona.
+
+        Returns:
+            Informe de la reproducción
+        """
+        self._attach_probes()
+        samples = blocks = 0
+        max_lag = 0.0
+        start = time.perf_counter()
+        try:
+            for offset, segment in self._segments():
+                if self.mode is not ReplayMode.FAST:
+                    delay = offset / self.speed - (time.perf_counter() - start)
+                    if delay > 0:
+                        time.sleep(delay)
+                    else:
+                        max_lag = max(max_lag, -delay)
+                samples += self._inject(segment)
+                blocks += 1
+            # Entregar lo encolado en el pool antes de calcular la latencia
+            if isinstance(self.manager.dispatcher, ThreadPoolDispatcher):
+                self.manager.dispatcher.join(DRAIN_TIMEOUT)
+        finally:
+            self._detach_probes()
+        return self._report(samples, blocks, time.perf_counter() - start, max_lag)
+
+    async def run_async(self) -> ReplayReport:
+        """
+        Reproducir la sesión cediendo el bucle de eventos.
+
+        Necesario con AsyncDispatcher: las esperas usan asyncio.sleep
+        y en modo FAST se cede el bucle tras cada tramo para que los
+        consumidores avancen.
+
+        Returns:
+            Informe de la reproducción
+        """
+        self._attach_probes()
+        samples = blocks = 0
+        max_lag = 0.0
+        start = time.perf_counter()
+        try:
+            for offset, segment in self._segments():
+                delay = 0.0
+                if self.mode is not ReplayMode.FAST:
+                    delay = offset / self.speed - (time.perf_counter() - start)
+                    if delay <= 0:
+                        max_lag = max(max_lag, -delay)
+                await asyncio.sleep(max(delay, 0.0))
+                samples += self._inject(segment)
+                blocks += 1
+            # Dejar que los consumidores entreguen lo pendiente
+            deadline = time.perf_counter() + DRAIN_TIMEOUT
+            while self._sent and time.perf_counter() < deadline:
+                await asyncio.sleep(0.001)
+        finally:
+            self._detach_probes()
+        return self._report(samples, blocks, time.perf_counter() - start, max_lag)
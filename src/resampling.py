@@ -0,0 +1,155 @@
+"""
+Módulo de alineación temporal de sensores.
+
+Remuestrea los historiales de varios sensores de SensorManager sobre
+un reloj común uniforme (p.ej. 120 Hz) mediante interpolación lineal
+vectorizada, para que los mapeos que combinan sensores usen muestras
+del mismo instante en lugar de "la última de cada uno".
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import logging
+import math
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from sensors import SensorManager, SensorType
+
+logger = logging.getLogger(__name__)
+
+# Muestras mínimas leídas por sensor en cada update()
+TAIL_MIN = 64
+
+
+class SensorResampler:
+    """
+    Remuestreador incremental de varios sensores a una frecuencia común.
+
+    Los ticks están anclados a múltiplos de 1/rate_hz. Cada llamada a
+    update() produce solo los ticks nuevos que ya pueden interpolarse
+    en todos los sensores (es decir, con muestras a ambos lados), sin
+    recalcular los anteriores. Cada tick es una matriz (n_sensores, 3)
+    con x, y, z de cada sensor en el orden de sensor_types.
+    """
+
+    def __init__(self, manager: SensorManager, sensor_types: Sequence[SensorType],
+                 rate_hz: float = 120.0):
+        """
+        Inicializar el remuestreador.
+
+        Args:
+            manager: Gestor cuyos historiales se remuestrean
+            sensor_types: Sensores a alinear (orden de las filas del frame)
+            rate_hz: Frecuencia del reloj común
+
+        Raises:
+            ValueError: Si no hay sensores o la frecuencia no es positiva
+        """
+        if not sensor_types:
+            raise ValueError("Se necesita al menos un tipo de sensor")
+        if rate_hz <= 0:
+            raise ValueError(f"rate_hz debe ser positivo: {rate_hz}")
+        self.manager = manager
+        self.sensor_types: List[SensorType] = list(sensor_types)
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.frame_callbacks: List[Callable] = []
+        self._next_tick: Optional[int] = None  # Índice k del próximo tick k/rate_hz
+        self.latest_tick: Optional[float] = None
+        self.latest_frame: Optional[np.ndarray] = None
+
+    def on_frames(self, callback: Callable) -> None:
+        """
+        Registrar un callback de frames alineados.
+
+        Args:
+            callback: Recibe (ticks (n,), frames (n, n_sensores, 3))
+        """
+        self.frame_callbacks.append(callback)
+
+    def reset(self) -> None:
+        """Olvidar la posición del reloj; el próximo update empieza de nuevo."""
+        self._next_tick = None
+        self.latest_tick = None
+        self.latest_frame = None
+
+    def _read_tail(self, sensor_type: SensorType, since: float) -> np.ndarray:
+        """
+        Leer la cola del historial que empieza en o antes de un instante.
+
+        Amplía la lectura al doble hasta que la primera muestra sea
+        anterior o igual a since, o hasta abarcar todo el historial, de
+        modo que cada update() solo lee las muestras desde el último tick.
+
+        Args:
+            sensor_type: Sensor a leer
+            since: Instante que debe quedar cubierto por la cola
+
+        Returns:
+            Array estructurado con las últimas muestras del sensor
+        """
+        count = TAIL_MIN
+        while True:
+            history = self.manager.get_array(sensor_type, count)
+            if len(history) < count or history["timestamp"][0] <= since:
+                return history
+            count *= 2
+
+    def update(self, max_ticks: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Producir los ticks nuevos disponibles.
+
+        Args:
+            max_ticks: Límite de ticks a producir en esta llamada
+
+        Returns:
+            Tupla (ticks (n,), frames (n, n_sensores, 3)); n puede ser 0
+        """
+        empty = (np.empty(0), np.empty((0, len(self.sensor_types), 3)))
+        if self._next_tick is None:
+            histories = [self.manager.get_array(t) for t in self.sensor_types]
+        else:
+            since = self._next_tick * self.period
+            histories = [self._read_tail(t, since) for t in self.sensor_types]
+        if any(len(h) == 0 for h in histories):
+            return empty
+
+        # Intervalo en que todos los sensores tienen muestras a ambos lados
+        first = max(float(h["timestamp"][0]) for h in histories)
+        last = min(float(h["timestamp"][-1]) for h in histories)
+        first_k = math.ceil(first * self.rate_hz - 1e-9)
+        last_k = math.floor(last * self.rate_hz + 1e-9)
+
+        start_k = first_k if self._next_tick is None else self._next_tick
+        if start_k < first_k:
+            logger.debug(f"Historial insuficiente: se saltan {first_k - start_k} ticks")
+            start_k = first_k
+        stop_k = last_k + 1
+        if max_ticks is not None:
+            stop_k = min(stop_k, start_k + max_ticks)
+        if stop_k <= start_k:
+            return empty
+
+        ticks = np.arange(start_k, stop_k) * self.period
+        frames = np.empty((len(ticks), len(self.sensor_types), 3))
+        for row, history in enumerate(histories):
+            timestamps = history["timestamp"]
+            # Solo interpolar sobre el tramo del historial que cubre los ticks
+            lo = max(int(np.searchsorted(timestamps, ticks[0], side="right")) - 1, 0)
+            hi = int(np.searchsorted(timestamps, ticks[-1], side="left")) + 1
+            window = history[lo:hi]
+            for col, name in enumerate(("x", "y", "z")):
+                frames[:, row, col] = np.interp(ticks, window["timestamp"], window[name])
+
+        self._next_tick = stop_k
+        self.latest_tick = float(ticks[-1])
+        self.latest_frame = frames[-1]
+        for callback in self.frame_callbacks:
+            try:
+                callback(ticks, frames)
+            except Exception as e:
+                logger.error(f"Error en callback de frames: {e}")
+        return ticks, frames
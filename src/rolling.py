@@ -0,0 +1,171 @@
+"""
+Módulo de estadísticas de ventana deslizante.
+
+Mantiene de forma incremental la media, varianza, mínimo, máximo y
+energía de las últimas N muestras de un sensor. Cada muestra nueva
+actualiza los agregados en tiempo constante (amortizado) y las
+consultas no recorren la ventana.
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import math
+from collections import deque
+from typing import Dict
+
+# Canales de cada muestra: componentes y magnitud del vector
+CHANNELS = ("x", "y", "z", "magnitude")
+_CHANNEL_INDEX = {name: i for i, name in enumerate(CHANNELS)}
+
+
+class RollingWindowStats:
+    """
+    Agregados de las últimas `window` muestras (x, y, z).
+
+    - Media y varianza: Welford con actualización de reemplazo al
+      salir la muestra más antigua de la ventana.
+    - Mínimo y máximo: deques monótonas de (índice, valor).
+    - Energía: media del cuadrado de la magnitud, derivada de la
+      media y la varianza de la magnitud.
+    """
+
+    def __init__(self, window: int):
+        """
+        Inicializar los agregados.
+
+        Args:
+            window: Tamaño de la ventana en muestras
+
+        Raises:
+            ValueError: Si la ventana no es positiva
+        """
+        if window <= 0:
+            raise ValueError(f"La ventana debe ser positiva: {window}")
+        self.window = window
+        self.reset()
+
+    def reset(self) -> None:
+        """Vaciar la ventana."""
+        self._values: deque = deque()
+        self._index = 0
+        self._mean = [0.0, 0.0, 0.0, 0.0]
+        self._m2 = [0.0, 0.0, 0.0, 0.0]
+        self._min = [deque() for _ in CHANNELS]
+        self._max = [deque() for _ in CHANNELS]
+
+    @property
+    def count(self) -> int:
+        """Número de muestras en la ventana."""
+        return len(self._values)
+
+    def push(self, x: float, y: float, z: float) -> None:
+        """
+        Añadir una muestra a la ventana.
+
+        Args:
+            x, y, z: Componentes de la muestra
+        """
+        sample = (float(x), float(y), float(z), math.sqrt(x * x + y * y + z * z))
+        values = self._values
+        mean = self._mean
+        m2 = self._m2
+
+        if len(values) < self.window:
+            values.append(sample)
+            n = len(values)
+            for c in range(4):
+                delta = sample[c] - mean[c]
+                mean[c] += delta / n
+                m2[c] += delta * (sample[c] - mean[c])
+        else:
+            old = values.popleft()
+            values.append(sample)
+            n = self.window
+            for c in range(4):
+                new_mean = mean[c] + (sample[c] - old[c]) / n
+                m2[c] += (sample[c] - old[c]) * (sample[c] - new_mean + old[c] - mean[c])
+                mean[c] = new_mean
+
+        index = self._index
+        expired = index - self.window
+        for c in range(4):
+            value = sample[c]
+            lows = self._min[c]
+            while lows and lows[-1][1] >= value:
+                lows.pop()
+            lows.append((index, value))
+            if lows[0][0] <= expired:
+                lows.popleft()
+            highs = self._max[c]
+            while highs and highs[-1][1] <= value:
+                highs.pop()
+            highs.append((index, value))
+            if highs[0][0] <= expired:
+                highs.popleft()
+        self._index = index + 1
+
+    def push_block(self, xs, ys, zs) -> None:
+        """
+        Añadir un bloque de muestras.
+
+        Args:
+            xs, ys, zs: Secuencias de componentes de igual longitud
+        """
+        for x, y, z in zip(xs, ys, zs):
+            self.push(x, y, z)
+
+    def _channel(self, channel: str) -> int:
+        try:
+            return _CHANNEL_INDEX[channel]
+        except KeyError:
+            raise ValueError(f"Canal desconocido: {channel} (válidos: {CHANNELS})") from None
+
+    def mean(self, channel: str = "magnitude") -> float:
+        """Media de un canal en la ventana (0.0 si está vacía)."""
+        c = self._channel(channel)
+        return self._mean[c] if self._values else 0.0
+
+    def variance(self, channel: str = "magnitude") -> float:
+        """Varianza poblacional de un canal en la ventana."""
+        c = self._channel(channel)
+        if not self._values:
+            return 0.0
+        return max(self._m2[c] / len(self._values), 0.0)
+
+    def std(self, channel: str = "magnitude") -> float:
+        """Desviación típica de un canal en la ventana."""
+        return math.sqrt(self.variance(channel))
+
+    def min(self, channel: str = "magnitude") -> float:
+        """Mínimo de un canal en la ventana (nan si está vacía)."""
+        lows = self._min[self._channel(channel)]
+        return lows[0][1] if lows else math.nan
+
+    def max(self, channel: str = "magnitude") -> float:
+        """Máximo de un canal en la ventana (nan si está vacía)."""
+        highs = self._max[self._channel(channel)]
+        return highs[0][1] if highs else math.nan
+
+    def energy(self) -> float:
+        """Energía media: media de x² + y² + z² en la ventana."""
+        mean = self.mean("magnitude")
+        return self.variance("magnitude") + mean * mean
+
+    def snapshot(self) -> Dict:
+        """
+        Obtener todos los agregados.
+
+        Returns:
+            Diccionario con count, energy y, por canal, mean,
+            variance, min y max
+        """
+        result = {"count": self.count, "energy": self.energy()}
+        for channel in CHANNELS:
+            result[channel] = {
+                "mean": self.mean(channel),
+                "variance": self.variance(channel),
+                "min": self.min(channel),
+                "max": self.max(channel),
+            }
+        return result
@@ -10,12 +10,27 @@ Fecha: 2025-10-26
 """
 
 import logging
-from typing import Dict, Optional, Callable
+from typing import Dict, Optional, Callable, Iterator, Union
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
+from rolling import RollingWindowStats
+
 logger = logging.getLogger(__name__)
 
+# Capacidad por defecto del historial de cada sensor (en muestras)
+DEFAULT_HISTORY_SIZE = 100
+
+# Registro estructurado usado por el buffer circular de cada sensor
+SENSOR_DTYPE = np.dtype([
+    ("x", np.float64),
+    ("y", np.float64),
+    ("z", np.float64),
+    ("timestamp", np.float64),
+])
+
 
 class SensorType(Enum):
     """Tipos de sensores disponibles."""
@@ -24,11 +39,12 @@ class SensorType(Enum):
     MAGNETOMETER = "magnetometer"  # Brújula
     GRAVITY = "gravity"
     USER_ACCELERATION = "user_acceleration"
+    ORIENTATION = "orientation"  # Virtual: roll, pitch, yaw (ver fusion.py)
 
 
-@dataclass
+@dataclass(slots=True)
 class SensorData:
-    """Datos de un sensor."""
+    """Datos de un sensor (con __slots__, sin __dict__ por instancia)."""
     type: SensorType
     x: float
     y: float
@@ -46,6 +62,416 @@ class SensorData:
         }
 
 
+class SensorRingBuffer:
+    """
+    Buffer circular de capacidad fija para un tipo de sensor.
+    
+    Almacena las muestras en un array estructurado de NumPy
+    preasignado (x, y, z, timestamp). Añadir una muestra es O(1):
+    al llenarse se sobrescribe la más antigua sin desplazar datos.
+    Se comporta como una secuencia de SensorData (len, índices,
+    slices e iteración) ordenada de la más antigua a la más reciente.
+    """
+    
+    def __init__(self, sensor_type: SensorType, capacity: int = DEFAULT_HISTORY_SIZE):
+        """
+        Inicializar el buffer.
+        
+        Args:
+            sensor_type: Tipo de sensor almacenado
+            capacity: Número máximo de muestras a conservar
+            
+        Raises:
+            ValueError: Si la capacidad no es positiva
+        """
+        if capacity <= 0:
+            raise ValueError(f"La capacidad debe ser positiva: {capacity}")
+        self.sensor_type = sensor_type
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=SENSOR_DTYPE)
+        self._head = 0  # Próxima posición de escritura
+        self._size = 0
+    
+    def append(self, x: float, y: float, z: float, timestamp: float) -> None:
+        """
+        Añadir una muestra, sobrescribiendo la más antigua si está lleno.
+        
+        Args:
+            x, y, z: Componentes de la muestra
+            timestamp: Marca de tiempo de la muestra
+        """
+        self._buffer[self._head] = (x, y, z, timestamp)
+        self._head = (self._head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+    
+    def extend(self, block: np.ndarray) -> None:
+        """
+        Añadir un bloque de muestras en una sola operación.
+        
+        Si el bloque supera la capacidad solo se conservan sus
+        últimas muestras. La vuelta del buffer se resuelve con
+        como máximo dos copias vectorizadas.
+        
+        Args:
+            block: Array estructurado con dtype SENSOR_DTYPE
+        """
+        n = len(block)
+        if n == 0:
+            return
+        if n >= self.capacity:
+            self._buffer[:] = block[-self.capacity:]
+            self._head = 0
+            self._size = self.capacity
+            return
+        
+        first = min(n, self.capacity - self._head)
+        self._buffer[self._head:self._head + first] = block[:first]
+        if first < n:
+            self._buffer[:n - first] = block[first:]
+        self._head = (self._head + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+    
+    def as_array(self, count: Optional[int] = None) -> np.ndarray:
+        """
+        Obtener las últimas muestras como array estructurado.
+        
+        Si la ventana es contigua en memoria se devuelve una vista de
+        solo lectura sin copiar; solo cuando la ventana cruza el final
+        del buffer se devuelve una copia contigua. Las vistas reflejan
+        el buffer, por lo que pueden cambiar al añadir nuevas muestras:
+        usar .copy() si se necesitan conservar.
+        
+        Args:
+            count: Número de muestras a obtener (None para todas)
+            
+        Returns:
+            Array con campos x, y, z, timestamp (más antigua primero)
+        """
+        n = self._size if count is None else max(0, min(count, self._size))
+        start = (self._head - n) % self.capacity
+        if start + n <= self.capacity:
+            window = self._buffer[start:start + n]
+        else:
+            window = np.concatenate((self._buffer[start:], self._buffer[:start + n - self.capacity]))
+        window.flags.writeable = False
+        return window
+    
+    def clear(self) -> None:
+        """Vaciar el buffer sin liberar la memoria preasignada."""
+        self._head = 0
+        self._size = 0
+    
+    def _physical_index(self, index: int) -> int:
+        """Convertir un índice lógico (0 = más antigua) a posición física."""
+        return (self._head - self._size + index) % self.capacity
+    
+    def _to_sensor_data(self, record) -> SensorData:
+        """Construir un SensorData a partir de un registro del buffer."""
+        return SensorData(
+            self.sensor_type,
+            float(record["x"]),
+            float(record["y"]),
+            float(record["z"]),
+            float(record["timestamp"]),
+        )
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[SensorData, list[SensorData]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("Índice fuera del buffer")
+        return self._to_sensor_data(self._buffer[self._physical_index(index)])
+    
+    def __iter__(self) -> Iterator[SensorData]:
+        for i in range(self._size):
+            yield self[i]
+
+
+class EmissionGate:
+    """
+    Filtro de emisión de una suscripción por muestra.
+    
+    Decide, con la marca de tiempo de la muestra, si un callback debe
+    recibirla:
+    
+    - min_interval: tiempo mínimo entre emisiones (max_rate=N equivale
+      a min_interval=1/N; si se dan ambos manda el más restrictivo).
+    - deadband: cambio mínimo (distancia euclídea en x, y, z) respecto
+      a la última muestra emitida.
+    - keepalive: con deadband, se emite igualmente si han pasado
+      keepalive segundos desde la última emisión (None: nunca).
+    
+    Si el tiempo retrocede (p.ej. al reiniciar una reproducción) la
+    muestra se emite y el estado se reinicia.
+    """
+    
+    __slots__ = ("deadband_sq", "min_interval", "keepalive",
+                 "last_x", "last_y", "last_z", "last_t", "passed", "suppressed")
+    
+    def __init__(self, deadband: float = 0.0, min_interval: float = 0.0,
+                 max_rate: Optional[float] = None, keepalive: Optional[float] = 1.0):
+        """
+        Inicializar el filtro.
+        
+        Args:
+            deadband: Cambio mínimo para emitir (0 desactiva)
+            min_interval: Segundos mínimos entre emisiones
+            max_rate: Emisiones máximas por segundo
+            keepalive: Segundos máximos sin emitir pese al deadband
+            
+        Raises:
+            ValueError: Si algún parámetro es negativo o max_rate no es positivo
+        """
+        if deadband < 0 or min_interval < 0 or (keepalive is not None and keepalive < 0):
+            raise ValueError("deadband, min_interval y keepalive no pueden ser negativos")
+        if max_rate is not None:
+            if max_rate <= 0:
+                raise ValueError(f"max_rate debe ser positivo: {max_rate}")
+            min_interval = max(min_interval, 1.0 / max_rate)
+        self.deadband_sq = deadband * deadband
+        self.min_interval = min_interval
+        self.keepalive = keepalive
+        self.last_x = self.last_y = self.last_z = 0.0
+        self.last_t: Optional[float] = None
+        self.passed = 0
+        self.suppressed = 0
+    
+    def accept(self, data: "SensorData") -> bool:
+        """
+        Decidir si emitir una muestra (y actualizar el estado).
+        
+        Args:
+            data: Muestra candidata
+            
+        Returns:
+            True si la muestra debe entregarse al callback
+        """
+        last_t = self.last_t
+        if last_t is not None:
+            elapsed = data.timestamp - last_t
+            if elapsed >= 0:
+                # Tolerancia para periodos exactos (p.ej. 100 Hz con max_rate=50)
+                if elapsed + 1e-9 < self.min_interval:
+                    self.suppressed += 1
+                    return False
+                if self.deadband_sq and (self.keepalive is None or elapsed < self.keepalive):
+                    dx = data.x - self.last_x
+                    dy = data.y - self.last_y
+                    dz = data.z - self.last_z
+                    if dx * dx + dy * dy + dz * dz < self.deadband_sq:
+                        self.suppressed += 1
+                        return False
+        self.last_x = data.x
+        self.last_y = data.y
+        self.last_z = data.z
+        self.last_t = data.timestamp
+        self.passed += 1
+        return True
+
+
+class ReductionMode(Enum):
+    """Reducción de las muestras de un periodo en una suscripción con rate."""
+    LATEST = "latest"                # Última muestra del periodo
+    MEAN = "mean"                    # Media de x, y, z y del tiempo
+    MAX_MAGNITUDE = "max_magnitude"  # Muestra de mayor magnitud
+
+
+class RateReducer:
+    """
+    Reductor de frecuencia de una suscripción por muestra.
+    
+    Agrupa las muestras en periodos de 1/rate segundos (anclados a
+    múltiplos de 1/rate según la marca de tiempo) y, al cerrarse cada
+    periodo, entrega una sola muestra con la reducción elegida. Un
+    periodo se cierra cuando llega la primera muestra del siguiente,
+    así que la entrega se retrasa como mucho un periodo.
+    
+    push_block() reduce un bloque completo con operaciones
+    vectorizadas (reduceat), de modo que una suscripción a 30 Hz no
+    paga el coste por muestra de un flujo a 200 Hz.
+    """
+    
+    __slots__ = ("sensor_type", "rate", "mode", "_period", "_sum", "_count",
+                 "_best", "_best_mag", "_last", "samples_in", "emitted")
+    
+    def __init__(self, sensor_type: SensorType, rate: float,
+                 mode: ReductionMode = ReductionMode.LATEST):
+        """
+        Inicializar el reductor.
+        
+        Args:
+            sensor_type: Tipo de sensor de las muestras emitidas
+            rate: Frecuencia de entrega en Hz
+            mode: Reducción de las muestras de cada periodo
+            
+        Raises:
+            ValueError: Si rate no es positivo
+        """
+        if rate <= 0:
+            raise ValueError(f"rate debe ser positivo: {rate}")
+        self.sensor_type = sensor_type
+        self.rate = rate
+        self.mode = mode
+        self._period: Optional[int] = None
+        self._sum = [0.0, 0.0, 0.0, 0.0]  # x, y, z, timestamp
+        self._count = 0
+        self._best: Optional[tuple] = None
+        self._best_mag = -1.0
+        self._last: Optional[tuple] = None
+        self.samples_in = 0
+        self.emitted = 0
+    
+    def _period_of(self, timestamp: float) -> int:
+        return int(np.floor(timestamp * self.rate + 1e-9))
+    
+    def _merge(self, x: float, y: float, z: float, t: float) -> None:
+        """Acumular una muestra en el periodo abierto."""
+        if self.mode is ReductionMode.MEAN:
+            total = self._sum
+            total[0] += x
+            total[1] += y
+            total[2] += z
+            total[3] += t
+        elif self.mode is ReductionMode.MAX_MAGNITUDE:
+            magnitude = x * x + y * y + z * z
+            if magnitude > self._best_mag:
+                self._best_mag = magnitude
+                self._best = (x, y, z, t)
+        self._count += 1
+        self._last = (x, y, z, t)
+    
+    def _close(self) -> Optional[SensorData]:
+        """Cerrar el periodo abierto y devolver su reducción."""
+        if self._count == 0:
+            return None
+        if self.mode is ReductionMode.MEAN:
+            n = self._count
+            values = [v / n for v in self._sum]
+        elif self.mode is ReductionMode.MAX_MAGNITUDE:
+            values = self._best
+        else:
+            values = self._last
+        self._sum = [0.0, 0.0, 0.0, 0.0]
+        self._count = 0
+        self._best = None
+        self._best_mag = -1.0
+        self.emitted += 1
+        return SensorData(self.sensor_type, *values)
+    
+    def push(self, data: SensorData) -> Optional[SensorData]:
+        """
+        Añadir una muestra.
+        
+        Args:
+            data: Muestra recibida
+            
+        Returns:
+            Reducción del periodo anterior si esta muestra lo cierra
+        """
+        self.samples_in += 1
+        period = self._period_of(data.timestamp)
+        result = None
+        if period != self._period:
+            result = self._close()
+            self._period = period
+        self._merge(data.x, data.y, data.z, data.timestamp)
+        return result
+    
+    def push_block(self, block: np.ndarray) -> list[SensorData]:
+        """
+        Añadir un bloque de muestras.
+        
+        Args:
+            block: Array estructurado SENSOR_DTYPE en orden temporal
+            
+        Returns:
+            Reducciones de los periodos cerrados por el bloque
+        """
+        n = len(block)
+        if n == 0:
+            return []
+        self.samples_in += n
+        xs, ys, zs, ts = (block[name] for name in SENSOR_DTYPE.names)
+        periods = np.floor(ts * self.rate + 1e-9).astype(np.int64)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(periods)) + 1))
+        ends = np.append(starts[1:], n)
+        
+        results = []
+        if int(periods[0]) != self._period:
+            closed = self._close()
+            if closed is not None:
+                results.append(closed)
+            self._period = int(periods[0])
+        # El primer tramo continúa el periodo abierto; el último queda abierto
+        self._merge_rows(xs, ys, zs, ts, 0, int(ends[0]))
+        if len(starts) > 1:
+            results.append(self._close())
+            if len(starts) > 2:
+                results.extend(self._reduce_segments(xs, ys, zs, ts, starts[1:-1], ends[1:-1]))
+            self._period = int(periods[-1])
+            self._merge_rows(xs, ys, zs, ts, int(starts[-1]), n)
+        return results
+    
+    def _merge_rows(self, xs, ys, zs, ts, start: int, stop: int) -> None:
+        """Acumular un tramo de un bloque en el periodo abierto."""
+        if self.mode is ReductionMode.MEAN:
+            total = self._sum
+            for i, column in enumerate((xs, ys, zs, ts)):
+                total[i] += float(column[start:stop].sum())
+        elif self.mode is ReductionMode.MAX_MAGNITUDE:
+            x, y, z = xs[start:stop], ys[start:stop], zs[start:stop]
+            magnitude = x * x + y * y + z * z
+            row = int(np.argmax(magnitude))
+            if magnitude[row] > self._best_mag:
+                self._best_mag = float(magnitude[row])
+                self._best = (float(x[row]), float(y[row]), float(z[row]), float(ts[start + row]))
+        self._count += stop - start
+        last = stop - 1
+        self._last = (float(xs[last]), float(ys[last]), float(zs[last]), float(ts[last]))
+    
+    def _reduce_segments(self, xs, ys, zs, ts, starts: np.ndarray,
+                         ends: np.ndarray) -> list[SensorData]:
+        """Reducir de forma vectorizada periodos completos dentro de un bloque."""
+        first, stop = int(starts[0]), int(ends[-1])
+        offsets = starts - first
+        lengths = ends - starts
+        if self.mode is ReductionMode.MEAN:
+            columns = [np.add.reduceat(c[first:stop], offsets) / lengths for c in (xs, ys, zs, ts)]
+        else:
+            if self.mode is ReductionMode.MAX_MAGNITUDE:
+                x, y, z = xs[first:stop], ys[first:stop], zs[first:stop]
+                magnitude = x * x + y * y + z * z
+                peaks = np.maximum.reduceat(magnitude, offsets)
+                segment = np.repeat(np.arange(len(starts)), lengths)
+                candidates = np.flatnonzero(magnitude == peaks[segment])
+                _, leading = np.unique(segment[candidates], return_index=True)
+                rows = candidates[leading] + first
+            else:
+                rows = ends - 1
+            columns = [c[rows] for c in (xs, ys, zs, ts)]
+        self.emitted += len(starts)
+        sensor_type = self.sensor_type
+        return [SensorData(sensor_type, x, y, z, t)
+                for x, y, z, t in zip(*(c.tolist() for c in columns))]
+    
+    def flush(self) -> Optional[SensorData]:
+        """
+        Cerrar el periodo abierto sin esperar al siguiente.
+        
+        Returns:
+            Reducción del periodo abierto (None si está vacío)
+        """
+        result = self._close()
+        self._period = None
+        return result
+
+
 class SensorManager:
     """
     Gestor de sensores del iPhone.
@@ -54,40 +480,224 @@ class SensorManager:
     para su uso en aplicaciones artísticas interactivas.
     """
     
-    def __init__(self):
-        """Inicializar el gestor de sensores."""
+    def __init__(self, history_size: int = DEFAULT_HISTORY_SIZE, dispatcher=None):
+        """
+        Inicializar el gestor de sensores.
+        
+        Args:
+            history_size: Capacidad del buffer circular de cada sensor
+            dispatcher: Despachador de callbacks (ver dispatch.py); con
+                None los callbacks se ejecutan de forma síncrona
+        """
         self.callbacks: Dict[SensorType, list[Callable]] = {}
-        self.data_history: Dict[SensorType, list[SensorData]] = {}
+        self.callback_gates: Dict[SensorType, Dict[Callable, EmissionGate]] = {}
+        self.callback_reducers: Dict[SensorType, Dict[Callable, RateReducer]] = {}
+        self.batch_callbacks: Dict[SensorType, list[Callable]] = {}
+        self.data_history: Dict[SensorType, SensorRingBuffer] = {}
+        self.history_size = history_size
+        self.dispatcher = dispatcher
+        self.window_stats: Dict[SensorType, Dict[int, RollingWindowStats]] = {}
         self.is_active = False
         logger.info("SensorManager inicializado")
     
-    def register_callback(self, sensor_type: SensorType, callback: Callable) -> None:
+    def register_callback(self, sensor_type: SensorType, callback: Callable,
+                          batch: bool = False, deadband: float = 0.0,
+                          min_interval: float = 0.0, max_rate: Optional[float] = None,
+                          keepalive: Optional[float] = 1.0, rate: Optional[float] = None,
+                          reduce: str = "latest") -> None:
         """
         Registrar un callback para un tipo de sensor.
         
+        Los callbacks normales reciben un SensorData por muestra. Con
+        batch=True el callback recibe (sensor_type, bloque), donde el
+        bloque es un array estructurado de solo lectura (SENSOR_DTYPE)
+        con todas las muestras registradas en una misma llamada.
+        
+        Los callbacks por muestra admiten supresión de emisiones (ver
+        EmissionGate): deadband, min_interval, max_rate y keepalive.
+        Las muestras suprimidas se guardan igualmente en el historial.
+        
+        Con rate el callback recibe como mucho una muestra por periodo
+        de 1/rate segundos, reducida según reduce (ver RateReducer);
+        en record_batch la reducción se hace por bloque. El filtro de
+        emisión, si lo hay, se aplica a las muestras ya reducidas.
+        
         Args:
             sensor_type: Tipo de sensor a monitorear
             callback: Función a llamar cuando lleguen datos
+            batch: Si True, recibir los datos como bloques de arrays
+            deadband: Cambio mínimo respecto a la última muestra emitida
+            min_interval: Segundos mínimos entre emisiones
+            max_rate: Emisiones máximas por segundo
+            keepalive: Segundos máximos sin emitir pese al deadband
+            rate: Frecuencia de entrega en Hz (None entrega todas las muestras)
+            reduce: Reducción por periodo: "latest", "mean" o "max_magnitude"
+            
+        Raises:
+            ValueError: Si se piden opciones de supresión o de frecuencia
+                con batch=True, los parámetros no son válidos o el
+                callback ya está registrado y alguno de los registros
+                usa filtro de emisión o rate
         """
-        if sensor_type not in self.callbacks:
-            self.callbacks[sensor_type] = []
-        self.callbacks[sensor_type].append(callback)
+        gated = deadband != 0 or min_interval != 0 or max_rate is not None
+        if batch and (gated or rate is not None):
+            raise ValueError("deadband, min_interval, max_rate y rate solo aplican a callbacks por muestra")
+        gate = EmissionGate(deadband, min_interval, max_rate, keepalive) if gated else None
+        reducer = RateReducer(sensor_type, rate, ReductionMode(reduce)) if rate is not None else None
+        
+        registry = self.batch_callbacks if batch else self.callbacks
+        if not batch and callback in registry.get(sensor_type, []):
+            # Filtro y reductor se asocian al callback: un segundo registro
+            # los reemplazaría o los compartiría entre ambas suscripciones
+            if (gated or rate is not None
+                    or callback in self.callback_gates.get(sensor_type, {})
+                    or callback in self.callback_reducers.get(sensor_type, {})):
+                raise ValueError(f"El callback ya está registrado para {sensor_type.value} "
+                                 "y no puede repetirse con filtro de emisión o rate")
+        if sensor_type not in registry:
+            registry[sensor_type] = []
+        registry[sensor_type].append(callback)
+        if gate is not None:
+            self.callback_gates.setdefault(sensor_type, {})[callback] = gate
+        if reducer is not None:
+            self.callback_reducers.setdefault(sensor_type, {})[callback] = reducer
         logger.info(f"Callback registrado para {sensor_type.value}")
     
-    def _emit_data(self, sensor_type: SensorType, data: SensorData) -> None:
+    def unregister_callback(self, sensor_type: SensorType, callback: Callable,
+                            batch: bool = False) -> bool:
+        """
+        Eliminar un callback registrado.
+        
+        Args:
+            sensor_type: Tipo de sensor
+            callback: Callback a eliminar
+            batch: Si el callback se registró con batch=True
+            
+        Returns:
+            True si el callback estaba registrado
+        """
+        registry = self.batch_callbacks if batch else self.callbacks
+        callbacks = registry.get(sensor_type, [])
+        if callback not in callbacks:
+            return False
+        callbacks.remove(callback)
+        if not callbacks:
+            del registry[sensor_type]
+        if not batch and callback not in callbacks:
+            for table in (self.callback_gates, self.callback_reducers):
+                entries = table.get(sensor_type)
+                if entries and callback in entries:
+                    del entries[callback]
+                    if not entries:
+                        del table[sensor_type]
+        logger.info(f"Callback eliminado para {sensor_type.value}")
+        return True
+    
+    def _emit_data(self, sensor_type: SensorType, data: SensorData,
+                   reduce: bool = True) -> None:
         """
         Emitir datos a los callbacks registrados.
         
+        Si hay un despachador configurado, los callbacks se encolan
+        en él en lugar de ejecutarse aquí.
+        
         Args:
             sensor_type: Tipo de sensor
             data: Datos del sensor
+            reduce: Si False, omitir los callbacks con rate (record_batch
+                los atiende por bloque)
         """
         if sensor_type in self.callbacks:
+            gates = self.callback_gates.get(sensor_type)
+            reducers = self.callback_reducers.get(sensor_type)
             for callback in self.callbacks[sensor_type]:
+                if reducers is not None:
+                    reducer = reducers.get(callback)
+                    if reducer is not None:
+                        if not reduce:
+                            continue
+                        reduced = reducer.push(data)
+                        if reduced is not None:
+                            self._deliver_gated(sensor_type, callback, reduced, gates)
+                        continue
+                self._deliver_gated(sensor_type, callback, data, gates)
+    
+    def _deliver_gated(self, sensor_type: SensorType, callback: Callable, data: SensorData,
+                       gates: Optional[Dict[Callable, EmissionGate]]) -> None:
+        """Entregar una muestra si el filtro de emisión del callback la acepta."""
+        if gates is not None:
+            gate = gates.get(callback)
+            if gate is not None and not gate.accept(data):
+                return
+        if self.dispatcher is not None:
+            self.dispatcher.submit(sensor_type, callback, data)
+            return
+        try:
+            callback(data)
+        except Exception as e:
+            logger.error(f"Error en callback para {sensor_type.value}: {e}")
+    
+    def _emit_reduced(self, sensor_type: SensorType, block: np.ndarray) -> bool:
+        """
+        Reducir un bloque para los callbacks con rate.
+        
+        Args:
+            sensor_type: Tipo de sensor
+            block: Array estructurado con las muestras
+            
+        Returns:
+            True si quedan callbacks sin rate por atender muestra a muestra
+        """
+        reducers = self.callback_reducers.get(sensor_type)
+        if not reducers:
+            return True
+        gates = self.callback_gates.get(sensor_type)
+        for callback, reducer in reducers.items():
+            for reduced in reducer.push_block(block):
+                self._deliver_gated(sensor_type, callback, reduced, gates)
+        return len(reducers) < len(self.callbacks[sensor_type])
+    
+    def flush_rates(self, sensor_type: Optional[SensorType] = None) -> None:
+        """
+        Entregar los periodos abiertos de los callbacks con rate.
+        
+        Args:
+            sensor_type: Tipo de sensor (None para todos)
+        """
+        selected = [sensor_type] if sensor_type is not None else list(self.callback_reducers)
+        for current in selected:
+            gates = self.callback_gates.get(current)
+            for callback, reducer in self.callback_reducers.get(current, {}).items():
+                reduced = reducer.flush()
+                if reduced is not None:
+                    self._deliver_gated(current, callback, reduced, gates)
+    
+    def _emit_batch(self, sensor_type: SensorType, block: np.ndarray) -> None:
+        """
+        Emitir un bloque de datos a los callbacks por lotes.
+        
+        Args:
+            sensor_type: Tipo de sensor
+            block: Array estructurado de solo lectura con las muestras
+        """
+        if sensor_type in self.batch_callbacks:
+            dispatcher = self.dispatcher
+            for callback in self.batch_callbacks[sensor_type]:
+                if dispatcher is not None:
+                    dispatcher.submit(sensor_type, callback, sensor_type, block)
+                    continue
                 try:
-                    callback(data)
+                    callback(sensor_type, block)
                 except Exception as e:
-                    logger.error(f"Error en callback para {sensor_type.value}: {e}")
+                    logger.error(f"Error en callback por lotes para {sensor_type.value}: {e}")
+    
+    def _get_history(self, sensor_type: SensorType) -> SensorRingBuffer:
+        """Obtener (o crear) el buffer circular de un sensor."""
+        history = self.data_history.get(sensor_type)
+        if history is None:
+            history = SensorRingBuffer(sensor_type, self.history_size)
+            self.data_history[sensor_type] = history
+        return history
     
     def record_data(self, sensor_type: SensorType, data: SensorData) -> None:
         """
@@ -97,15 +707,57 @@ class SensorManager:
             sensor_type: Tipo de sensor
             data: Datos del sensor
         """
-        if sensor_type not in self.data_history:
-            self.data_history[sensor_type] = []
+        # El buffer circular descarta la muestra más antigua al llenarse
+        self._get_history(sensor_type).append(data.x, data.y, data.z, data.timestamp)
+        if sensor_type in self.window_stats:
+            for stats in self.window_stats[sensor_type].values():
+                stats.push(data.x, data.y, data.z)
+        self._emit_data(sensor_type, data)
+        
+        if sensor_type in self.batch_callbacks:
+            block = np.array([(data.x, data.y, data.z, data.timestamp)], dtype=SENSOR_DTYPE)
+            block.flags.writeable = False
+            self._emit_batch(sensor_type, block)
+    
+    def record_batch(self, sensor_type: SensorType, xs, ys, zs, timestamps) -> None:
+        """
+        Registrar un bloque de muestras de un sensor.
         
-        # Mantener solo los últimos 100 registros
-        if len(self.data_history[sensor_type]) >= 100:
-            self.data_history[sensor_type].pop(0)
+        El bloque se copia al historial en una sola operación. Los
+        callbacks por lotes reciben el bloque completo; los callbacks
+        por muestra siguen recibiendo un SensorData por cada fila, salvo
+        los registrados con rate, que reciben el bloque ya reducido.
         
-        self.data_history[sensor_type].append(data)
-        self._emit_data(sensor_type, data)
+        Args:
+            sensor_type: Tipo de sensor
+            xs, ys, zs: Secuencias con las componentes de cada muestra
+            timestamps: Secuencia con las marcas de tiempo
+            
+        Raises:
+            ValueError: Si las secuencias no tienen la misma longitud
+        """
+        columns = [np.asarray(c, dtype=np.float64).ravel() for c in (xs, ys, zs, timestamps)]
+        n = len(columns[0])
+        if any(len(c) != n for c in columns[1:]):
+            raise ValueError("xs, ys, zs y timestamps deben tener la misma longitud")
+        if n == 0:
+            return
+        
+        block = np.empty(n, dtype=SENSOR_DTYPE)
+        for name, column in zip(SENSOR_DTYPE.names, columns):
+            block[name] = column
+        block.flags.writeable = False
+        
+        self._get_history(sensor_type).extend(block)
+        if sensor_type in self.window_stats:
+            rows = (block["x"].tolist(), block["y"].tolist(), block["z"].tolist())
+            for stats in self.window_stats[sensor_type].values():
+                stats.push_block(*rows)
+        
+        if sensor_type in self.callbacks and self._emit_reduced(sensor_type, block):
+            for row in block.tolist():
+                self._emit_data(sensor_type, SensorData(sensor_type, *row), reduce=False)
+        self._emit_batch(sensor_type, block)
     
     def get_data(self, sensor_type: SensorType, count: Optional[int] = None) -> list[SensorData]:
         """
@@ -123,9 +775,108 @@ class SensorManager:
         
         data = self.data_history[sensor_type]
         if count is None:
-            return data
+            return data[:]
         return data[-count:]
     
+    def get_array(self, sensor_type: SensorType, count: Optional[int] = None) -> np.ndarray:
+        """
+        Obtener datos históricos de un sensor como array de NumPy.
+        
+        Variante vectorizada de get_data: devuelve un array estructurado
+        de solo lectura con columnas nombradas (x, y, z, timestamp),
+        normalmente una vista sin copia del buffer circular.
+        
+        Args:
+            sensor_type: Tipo de sensor
+            count: Número de muestras a obtener (None para todas)
+            
+        Returns:
+            Array estructurado con dtype SENSOR_DTYPE
+        """
+        if sensor_type not in self.data_history:
+            empty = np.empty(0, dtype=SENSOR_DTYPE)
+            empty.flags.writeable = False
+            return empty
+        return self.data_history[sensor_type].as_array(count)
+    
+    def track_window(self, sensor_type: SensorType, window: int) -> RollingWindowStats:
+        """
+        Mantener estadísticas de ventana deslizante para un sensor.
+        
+        Los agregados se actualizan en cada record_data/record_batch
+        y se inicializan con las muestras ya presentes en el historial.
+        
+        Args:
+            sensor_type: Tipo de sensor
+            window: Tamaño de la ventana en muestras
+            
+        Returns:
+            Agregados de la ventana (compartidos si ya existían)
+        """
+        windows = self.window_stats.setdefault(sensor_type, {})
+        if window not in windows:
+            stats = RollingWindowStats(window)
+            recent = self.get_array(sensor_type, window)
+            stats.push_block(recent["x"].tolist(), recent["y"].tolist(), recent["z"].tolist())
+            windows[window] = stats
+            logger.info(f"Ventana de {window} muestras activada para {sensor_type.value}")
+        return windows[window]
+    
+    def get_window_stats(self, sensor_type: SensorType, window: int) -> Optional[RollingWindowStats]:
+        """
+        Obtener las estadísticas de ventana de un sensor.
+        
+        Args:
+            sensor_type: Tipo de sensor
+            window: Tamaño de la ventana en muestras
+            
+        Returns:
+            Agregados de la ventana o None si no se registró con track_window
+        """
+        return self.window_stats.get(sensor_type, {}).get(window)
+    
+    def get_gate_stats(self, sensor_type: SensorType) -> list[Dict]:
+        """
+        Obtener los contadores de supresión de un sensor.
+        
+        Args:
+            sensor_type: Tipo de sensor
+        
+        Returns:
+            Lista con callback, emisiones y supresiones de cada
+            suscripción con filtro de emisión
+        """
+        return [
+            {
+                "callback": getattr(callback, "__qualname__", repr(callback)),
+                "passed": gate.passed,
+                "suppressed": gate.suppressed,
+            }
+            for callback, gate in self.callback_gates.get(sensor_type, {}).items()
+        ]
+    
+    def get_rate_stats(self, sensor_type: SensorType) -> list[Dict]:
+        """
+        Obtener los contadores de reducción de un sensor.
+        
+        Args:
+            sensor_type: Tipo de sensor
+        
+        Returns:
+            Lista con callback, frecuencia, modo, muestras recibidas y
+            muestras entregadas de cada suscripción con rate
+        """
+        return [
+            {
+                "callback": getattr(callback, "__qualname__", repr(callback)),
+                "rate": reducer.rate,
+                "reduce": reducer.mode.value,
+                "samples_in": reducer.samples_in,
+                "emitted": reducer.emitted,
+            }
+            for callback, reducer in self.callback_reducers.get(sensor_type, {}).items()
+        ]
+    
     def start(self) -> None:
         """Iniciar la captura de sensores."""
         self.is_active = True
@@ -133,5 +884,6 @@ class SensorManager:
     
     def stop(self) -> None:
         """Detener la captura de sensores."""
+        self.flush_rates()
         self.is_active = False
         logger.info("Captura de sensores detenida")
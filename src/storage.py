@@ -0,0 +1,375 @@
+"""
+Módulo de persistencia del historial en SQLite.
+
+Guarda las muestras de SensorManager y el historial de mensajes de
+CommunicationManager en una base SQLite. El hilo de captura solo
+añade tuplas a una cola en memoria (O(1), sin E/S); una tarea
+asyncio las vuelca periódicamente en transacciones por lotes con
+executemany sobre sentencias fijas, que sqlite3 prepara una vez y
+reutiliza. La base usa WAL para que las lecturas no bloqueen las
+escrituras.
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from sensors import SensorManager, SensorType, SensorData
+from communication import record_to_entry
+
+logger = logging.getLogger(__name__)
+
+try:
+    import aiosqlite
+    AIOSQLITE_AVAILABLE = True
+except ImportError:
+    AIOSQLITE_AVAILABLE = False
+    logger.warning("aiosqlite no disponible, no se puede persistir el historial")
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS sensor_data (
+        id INTEGER PRIMARY KEY,
+        sensor_type TEXT NOT NULL,
+        timestamp REAL NOT NULL,
+        x REAL NOT NULL,
+        y REAL NOT NULL,
+        z REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_sensor_data_type_time ON sensor_data (sensor_type, timestamp)",
+    """CREATE TABLE IF NOT EXISTS messages (
+        id INTEGER PRIMARY KEY,
+        type TEXT NOT NULL,
+        timestamp REAL NOT NULL,
+        target TEXT,
+        sent INTEGER NOT NULL,
+        payload TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_messages_type_time ON messages (type, timestamp)",
+)
+
+_INSERT_SENSOR = "INSERT INTO sensor_data (sensor_type, timestamp, x, y, z) VALUES (?, ?, ?, ?, ?)"
+_INSERT_MESSAGE = "INSERT INTO messages (type, timestamp, target, sent, payload) VALUES (?, ?, ?, ?, ?)"
+
+
+class HistoryWriter:
+    """
+    Escritor asíncrono por lotes del historial.
+
+    record_data, record_block y record_message pueden llamarse desde
+    cualquier hilo (p.ej. como callbacks de SensorManager); solo
+    encolan. La escritura ocurre en la tarea iniciada por start(),
+    cada flush_interval segundos, en transacciones de hasta
+    batch_size filas. Si la cola supera max_pending filas se
+    descartan las más antiguas.
+    """
+
+    def __init__(self, path: Union[str, Path], batch_size: int = 1000,
+                 flush_interval: float = 0.1, max_pending: int = 200000):
+        """
+        Inicializar el escritor.
+
+        Args:
+            path: Ruta de la base de datos
+            batch_size: Filas máximas por transacción
+            flush_interval: Segundos entre volcados
+            max_pending: Filas máximas en cola por tabla
+
+        Raises:
+            ValueError: Si algún parámetro no es positivo
+        """
+        if batch_size <= 0 or flush_interval <= 0 or max_pending <= 0:
+            raise ValueError("batch_size, flush_interval y max_pending deben ser positivos")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._sensor_rows: deque = deque(maxlen=max_pending)
+        self._message_rows: deque = deque(maxlen=max_pending)
+        self._db = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.rows_written = 0
+        self.transactions = 0
+        self.dropped = 0
+        self.last_flush_ms = 0.0
+
+    @property
+    def pending(self) -> int:
+        """Filas en cola pendientes de escribir."""
+        return len(self._sensor_rows) + len(self._message_rows)
+
+    async def start(self) -> None:
+        """
+        Abrir la base, crear el esquema y lanzar el volcado periódico.
+
+        Raises:
+            RuntimeError: Si aiosqlite no está disponible
+        """
+        if not AIOSQLITE_AVAILABLE:
+            raise RuntimeError("aiosqlite no disponible")
+        self._db = await aiosqlite.connect(self.path)
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            await self._db.execute(statement)
+        await self._db.commit()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"HistoryWriter iniciado en {self.path}")
+
+    async def stop(self) -> None:
+        """Volcar lo pendiente y cerrar la base."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._db is not None:
+            await self.flush()
+            await self._db.close()
+            self._db = None
+        logger.info(f"HistoryWriter detenido: {self.rows_written} filas escritas")
+
+    async def _run(self) -> None:
+        """Tarea de volcado periódico."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error volcando historial: {e}")
+
+    @staticmethod
+    def _take(rows: deque, limit: int) -> list:
+        """Extraer hasta limit filas del principio de una cola."""
+        popleft = rows.popleft
+        return [popleft() for _ in range(min(limit, len(rows)))]
+
+    async def flush(self) -> int:
+        """
+        Escribir lo pendiente al iniciar el volcado.
+
+        Las filas encoladas mientras se escribe quedan para el siguiente
+        volcado, de modo que un productor continuo no lo prolonga
+        indefinidamente.
+
+        Returns:
+            Número de filas escritas
+        """
+        if self._db is None:
+            return 0
+        written = 0
+        async with self._flush_lock:
+            start = time.perf_counter()
+            sensor_left = len(self._sensor_rows)
+            message_left = len(self._message_rows)
+            while sensor_left or message_left:
+                sensor_rows = self._take(self._sensor_rows, min(self.batch_size, sensor_left))
+                message_rows = [self._message_row(entry) for entry in self._take(
+                    self._message_rows, min(self.batch_size - len(sensor_rows), message_left))]
+                sensor_left -= len(sensor_rows)
+                message_left -= len(message_rows)
+                if sensor_rows:
+                    await self._db.executemany(_INSERT_SENSOR, sensor_rows)
+                if message_rows:
+                    await self._db.executemany(_INSERT_MESSAGE, message_rows)
+                await self._db.commit()
+                self.transactions += 1
+                written += len(sensor_rows) + len(message_rows)
+            if written:
+                self.last_flush_ms = (time.perf_counter() - start) * 1e3
+        self.rows_written += written
+        return written
+
+    def record_data(self, data: SensorData) -> None:
+        """
+        Encolar una muestra (firma de callback de SensorManager).
+
+        Args:
+            data: Datos del sensor
+        """
+        if len(self._sensor_rows) == self.max_pending:
+            self.dropped += 1
+        self._sensor_rows.append((data.type.value, data.timestamp, data.x, data.y, data.z))
+
+    def record_block(self, sensor_type: SensorType, block: np.ndarray) -> None:
+        """
+        Encolar un bloque (firma de callback por lotes de SensorManager).
+
+        Args:
+            sensor_type: Tipo de sensor
+            block: Array estructurado con campos x, y, z, timestamp
+        """
+        overflow = len(self._sensor_rows) + len(block) - self.max_pending
+        if overflow > 0:
+            self.dropped += min(overflow, len(block))
+        name = sensor_type.value
+        self._sensor_rows.extend(
+            (name, t, x, y, z) for t, x, y, z in zip(
+                block["timestamp"].tolist(), block["x"].tolist(),
+                block["y"].tolist(), block["z"].tolist()))
+
+    def record_history(self, kind: str, key, args, wall_ns: int, target: Optional[str],
+                       sent: bool) -> None:
+        """
+        Encolar un registro del historial de mensajes.
+
+        Firma de CommunicationManager.on_message(..., record=True): se
+        guarda la marca numérica del registro y la entrada se construye
+        al volcar, fuera del hilo que envía.
+
+        Args:
+            kind: "osc" o "midi"
+            key: Dirección OSC o nota MIDI
+            args: Argumentos OSC o (velocidad, canal) MIDI
+            wall_ns: Marca de reloj de pared (ns desde la época Unix)
+            target: Destino OSC (None en MIDI)
+            sent: Si el mensaje se envió realmente
+        """
+        if len(self._message_rows) == self.max_pending:
+            self.dropped += 1
+        self._message_rows.append((kind, key, args, wall_ns, target, sent, None))
+
+    def record_message(self, entry: Dict) -> None:
+        """
+        Encolar una entrada de historial de mensajes ya construida.
+
+        Args:
+            entry: Entrada de CommunicationManager.message_history
+
+        Raises:
+            ValueError: Si la entrada no tiene timestamp
+        """
+        message = entry["message"]
+        timestamp = message.get("timestamp")
+        if not timestamp:
+            raise ValueError(f"Entrada de historial sin timestamp: {entry}")
+        moment = datetime.fromisoformat(timestamp)
+        # Segundos enteros por separado: conservar los microsegundos exactos
+        wall_ns = int(moment.replace(microsecond=0).timestamp()) * 10**9 + moment.microsecond * 1000
+        if len(self._message_rows) == self.max_pending:
+            self.dropped += 1
+        self._message_rows.append((entry["type"], None, None, wall_ns, entry.get("target"),
+                                   bool(entry.get("sent")), message))
+
+    @staticmethod
+    def _message_row(row: tuple) -> tuple:
+        """Convertir un registro encolado en fila de la tabla messages."""
+        kind, key, args, wall_ns, target, sent, message = row
+        if message is None:
+            message = record_to_entry(kind, key, args, wall_ns, target, sent)["message"]
+        return (kind, wall_ns / 1e9, target, int(sent), json.dumps(message))
+
+    def attach(self, manager: Optional[SensorManager] = None,
+               sensor_types: Optional[List[SensorType]] = None, comm_manager=None) -> None:
+        """
+        Persistir lo que registren los gestores.
+
+        Args:
+            manager: Gestor de sensores (callbacks por lotes)
+            sensor_types: Sensores a persistir (todos por defecto)
+            comm_manager: CommunicationManager cuyo historial se persiste
+        """
+        if manager is not None:
+            for sensor_type in sensor_types or SensorType:
+                manager.register_callback(sensor_type, self.record_block, batch=True)
+        if comm_manager is not None:
+            comm_manager.on_message(self.record_history, record=True)
+
+    async def fetch_sensor_data(self, sensor_type: SensorType, start: Optional[float] = None,
+                                end: Optional[float] = None,
+                                limit: Optional[int] = None) -> List[SensorData]:
+        """
+        Consultar muestras persistidas de un sensor (usa el índice).
+
+        Args:
+            sensor_type: Tipo de sensor
+            start: Marca de tiempo mínima (incluida)
+            end: Marca de tiempo máxima (incluida)
+            limit: Número máximo de filas
+
+        Returns:
+            Muestras en orden temporal
+
+        Raises:
+            RuntimeError: Si el escritor no está iniciado
+        """
+        if self._db is None:
+            raise RuntimeError("HistoryWriter no iniciado")
+        query = "SELECT timestamp, x, y, z FROM sensor_data WHERE sensor_type = ?"
+        params: list = [sensor_type.value]
+        if start is not None:
+            query += " AND timestamp >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND timestamp <= ?"
+            params.append(end)
+        query += " ORDER BY timestamp"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        async with self._db.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+        return [SensorData(sensor_type, x, y, z, t) for t, x, y, z in rows]
+
+    async def fetch_messages(self, message_type: Optional[str] = None,
+                             limit: Optional[int] = None) -> List[Dict]:
+        """
+        Consultar mensajes persistidos.
+
+        Args:
+            message_type: "osc" o "midi" (todos si es None)
+            limit: Número máximo de mensajes
+
+        Returns:
+            Entradas con el formato de message_history, en orden temporal
+
+        Raises:
+            RuntimeError: Si el escritor no está iniciado
+        """
+        if self._db is None:
+            raise RuntimeError("HistoryWriter no iniciado")
+        query = "SELECT type, target, sent, payload FROM messages"
+        params: list = []
+        if message_type is not None:
+            query += " WHERE type = ?"
+            params.append(message_type)
+        query += " ORDER BY timestamp"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        async with self._db.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+        entries = []
+        for kind, target, sent, payload in rows:
+            entry = {"type": kind, "message": json.loads(payload)}
+            if target is not None:
+                entry["target"] = target
+            entry["sent"] = bool(sent)
+            entries.append(entry)
+        return entries
+
+    def stats(self) -> Dict:
+        """
+        Obtener contadores del escritor.
+
+        Returns:
+            Filas escritas, transacciones, pendientes, descartes y
+            duración del último volcado (ms)
+        """
+        return {
+            "rows_written": self.rows_written,
+            "transactions": self.transactions,
+            "pending": self.pending,
+            "dropped": self.dropped,
+            "last_flush_ms": self.last_flush_ms,
+        }
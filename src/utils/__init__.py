@@ -6,4 +6,21 @@ Contiene funciones de utilidad para el proyecto.
 
 from .helpers import *
 
-__all__ = ['normalize_vector', 'calculate_magnitude']
+# Los filtros dependen de NumPy: se cargan al usarlos por primera vez
+_FILTERS = (
+    'StreamFilter', 'LowPassFilter', 'HighPassFilter', 'MedianFilter',
+    'ComplementaryFilter', 'FilterChain',
+)
+
+__all__ = [
+    'normalize_vector', 'calculate_magnitude',
+    'StreamFilter', 'LowPassFilter', 'HighPassFilter', 'MedianFilter',
+    'ComplementaryFilter', 'FilterChain',
+]
+
+
+def __getattr__(name):
+    if name in _FILTERS:
+        from . import filters
+        return getattr(filters, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,376 @@
+"""
+Filtros de señal incrementales para flujos de sensores.
+
+Cada filtro mantiene su propio estado y procesa una muestra (x, y, z)
+por llamada a update() con coste constante, o un bloque completo
+(array de forma (n, 3)) con process_block() usando NumPy. Ambas vías
+producen el mismo resultado y comparten el estado, por lo que pueden
+alternarse sobre un mismo flujo.
+
+Autor: Assiz Alcaraz Baxter
+Fecha: 2026-10-18
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from sensors import SensorManager, SensorType
+
+# Tamaño de los tramos con que se vectorizan los filtros recursivos
+_BLOCK_CHUNK = 64
+
+Vector = Tuple[float, float, float]
+
+
+def _as_samples(values) -> np.ndarray:
+    """Convertir un bloque a array float64 de forma (n, 3)."""
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim != 2 or array.shape[1] != 3:
+        raise ValueError(f"Se esperaba un bloque de forma (n, 3): {array.shape}")
+    return array
+
+
+def _first_order_weights(decay: float, gain: float, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Precalcular la recurrencia y[n] = decay * y[n-1] + gain * u[n] por tramos.
+
+    Returns:
+        Matriz triangular W (size x size) con W[i, j] = gain * decay**(i-j)
+        y vector p con p[i] = decay**(i+1), de modo que para un tramo
+        y = W @ u + p * y_anterior
+    """
+    powers = decay ** np.arange(size + 1, dtype=np.float64)
+    lags = np.subtract.outer(np.arange(size), np.arange(size))
+    weights = np.where(lags >= 0, gain * powers[np.clip(lags, 0, size)], 0.0)
+    return weights, powers[1:]
+
+
+def _first_order_block(inputs: np.ndarray, state: np.ndarray, weights: np.ndarray,
+                       carry: np.ndarray) -> np.ndarray:
+    """Aplicar la recurrencia de primer orden a un bloque (n, 3) por tramos."""
+    out = np.empty_like(inputs)
+    size = len(carry)
+    for start in range(0, len(inputs), size):
+        chunk = inputs[start:start + size]
+        m = len(chunk)
+        out[start:start + m] = weights[:m, :m] @ chunk + carry[:m, None] * state
+        state = out[start + m - 1]
+    return out
+
+
+class StreamFilter(ABC):
+    """Interfaz común de los filtros de una sola entrada."""
+
+    @abstractmethod
+    def update(self, x: float, y: float, z: float) -> Vector:
+        """Procesar una muestra y devolver la muestra filtrada."""
+
+    @abstractmethod
+    def process_block(self, values) -> np.ndarray:
+        """Procesar un bloque (n, 3) y devolver el bloque filtrado."""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Olvidar el estado acumulado."""
+
+
+class LowPassFilter(StreamFilter):
+    """
+    Filtro paso bajo exponencial (EMA).
+
+    y[n] = y[n-1] + alpha * (x[n] - y[n-1]). La primera muestra
+    inicializa el estado para evitar la rampa desde cero.
+    """
+
+    def __init__(self, alpha: float):
+        """
+        Inicializar el filtro.
+
+        Args:
+            alpha: Factor de suavizado en (0, 1]; menor es más suave
+
+        Raises:
+            ValueError: Si alpha está fuera de rango
+        """
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"alpha debe estar en (0, 1]: {alpha}")
+        self.alpha = alpha
+        self._state: Optional[Vector] = None
+        self._weights, self._carry = _first_order_weights(1.0 - alpha, alpha, _BLOCK_CHUNK)
+
+    @classmethod
+    def from_cutoff(cls, cutoff_hz: float, sample_rate_hz: float) -> "LowPassFilter":
+        """
+        Crear el filtro a partir de una frecuencia de corte.
+
+        Args:
+            cutoff_hz: Frecuencia de corte en Hz
+            sample_rate_hz: Frecuencia de muestreo en Hz
+        """
+        dt = 1.0 / sample_rate_hz
+        rc = 1.0 / (2.0 * math.pi * cutoff_hz)
+        return cls(dt / (rc + dt))
+
+    def update(self, x: float, y: float, z: float) -> Vector:
+        state = self._state
+        if state is None:
+            self._state = (float(x), float(y), float(z))
+            return self._state
+        a = self.alpha
+        sx, sy, sz = state
+        self._state = (sx + a * (x - sx), sy + a * (y - sy), sz + a * (z - sz))
+        return self._state
+
+    def process_block(self, values) -> np.ndarray:
+        samples = _as_samples(values)
+        if len(samples) == 0:
+            return samples.copy()
+        state = samples[0] if self._state is None else np.asarray(self._state)
+        out = _first_order_block(samples, state, self._weights, self._carry)
+        self._state = tuple(out[-1].tolist())
+        return out
+
+    def reset(self) -> None:
+        self._state = None
+
+
+class HighPassFilter(StreamFilter):
+    """
+    Filtro paso alto complementario del paso bajo exponencial.
+
+    y[n] = x[n] - lowpass(x)[n]; elimina componentes lentas como
+    la gravedad en los datos del acelerómetro.
+    """
+
+    def __init__(self, alpha: float):
+        """
+        Inicializar el filtro.
+
+        Args:
+            alpha: Factor del paso bajo interno en (0, 1]
+        """
+        self._lowpass = LowPassFilter(alpha)
+
+    @classmethod
+    def from_cutoff(cls, cutoff_hz: float, sample_rate_hz: float) -> "HighPassFilter":
+        """Crear el filtro a partir de una frecuencia de corte."""
+        return cls(LowPassFilter.from_cutoff(cutoff_hz, sample_rate_hz).alpha)
+
+    @property
+    def alpha(self) -> float:
+        return self._lowpass.alpha
+
+    def update(self, x: float, y: float, z: float) -> Vector:
+        lx, ly, lz = self._lowpass.update(x, y, z)
+        return (x - lx, y - ly, z - lz)
+
+    def process_block(self, values) -> np.ndarray:
+        samples = _as_samples(values)
+        return samples - self._lowpass.process_block(samples)
+
+    def reset(self) -> None:
+        self._lowpass.reset()
+
+
+class MedianFilter(StreamFilter):
+    """
+    Filtro de mediana móvil por componente.
+
+    Elimina picos aislados conservando los flancos. El coste por
+    muestra depende solo del tamaño de ventana, no del historial.
+    """
+
+    def __init__(self, window: int = 5):
+        """
+        Inicializar el filtro.
+
+        Args:
+            window: Número de muestras de la ventana
+
+        Raises:
+            ValueError: Si la ventana no es positiva
+        """
+        if window <= 0:
+            raise ValueError(f"La ventana debe ser positiva: {window}")
+        self.window = window
+        self._recent: deque = deque(maxlen=window)
+
+    def update(self, x: float, y: float, z: float) -> Vector:
+        recent = self._recent
+        recent.append((float(x), float(y), float(z)))
+        n = len(recent)
+        mid = n // 2
+        result = []
+        for i in range(3):
+            column = sorted(v[i] for v in recent)
+            result.append(column[mid] if n % 2 else (column[mid - 1] + column[mid]) / 2.0)
+        return (result[0], result[1], result[2])
+
+    def process_block(self, values) -> np.ndarray:
+        samples = _as_samples(values)
+        if len(samples) == 0:
+            return samples.copy()
+        previous = np.asarray(self._recent, dtype=np.float64).reshape(-1, 3)
+        history = np.concatenate((previous, samples))
+        out = np.empty_like(samples)
+        # Las primeras muestras aún no llenan la ventana
+        warmup = max(0, min(len(samples), self.window - 1 - len(previous)))
+        for i in range(warmup):
+            out[i] = np.median(history[:len(previous) + i + 1], axis=0)
+        if warmup < len(samples):
+            windows = np.lib.stride_tricks.sliding_window_view(history, self.window, axis=0)
+            out[warmup:] = np.median(windows[-(len(samples) - warmup):], axis=-1)
+        self._recent.clear()
+        self._recent.extend(map(tuple, history[-self.window:].tolist()))
+        return out
+
+    def reset(self) -> None:
+        self._recent.clear()
+
+
+class ComplementaryFilter:
+    """
+    Filtro complementario de dos entradas.
+
+    Combina una señal rápida pero con deriva (incrementos, p.ej.
+    giroscopio * dt) con una referencia lenta pero estable (p.ej.
+    inclinación derivada del acelerómetro):
+
+        y[n] = k * (y[n-1] + delta[n]) + (1 - k) * reference[n]
+    """
+
+    def __init__(self, k: float = 0.98):
+        """
+        Inicializar el filtro.
+
+        Args:
+            k: Peso de la señal integrada en [0, 1]
+
+        Raises:
+            ValueError: Si k está fuera de rango
+        """
+        if not 0.0 <= k <= 1.0:
+            raise ValueError(f"k debe estar en [0, 1]: {k}")
+        self.k = k
+        self._state: Optional[Vector] = None
+        self._weights, self._carry = _first_order_weights(k, 1.0, _BLOCK_CHUNK)
+
+    def update(self, delta: Vector, reference: Vector) -> Vector:
+        """
+        Procesar una muestra.
+
+        Args:
+            delta: Incremento de la señal rápida desde la muestra anterior
+            reference: Valor de la señal de referencia
+
+        Returns:
+            Estimación combinada
+        """
+        if self._state is None:
+            self._state = (float(reference[0]), float(reference[1]), float(reference[2]))
+        else:
+            k = self.k
+            self._state = tuple(k * (s + d) + (1.0 - k) * r
+                                for s, d, r in zip(self._state, delta, reference))
+        return self._state
+
+    def process_block(self, deltas, references) -> np.ndarray:
+        """
+        Procesar un bloque de muestras.
+
+        Args:
+            deltas: Incrementos de forma (n, 3)
+            references: Referencias de forma (n, 3)
+
+        Returns:
+            Estimaciones combinadas de forma (n, 3)
+        """
+        deltas = _as_samples(deltas)
+        references = _as_samples(references)
+        if len(deltas) != len(references):
+            raise ValueError("deltas y references deben tener la misma longitud")
+        if len(deltas) == 0:
+            return deltas.copy()
+        inputs = self.k * deltas + (1.0 - self.k) * references
+        if self._state is None:
+            # La primera muestra inicializa con la referencia
+            out = np.empty_like(inputs)
+            out[0] = references[0]
+            out[1:] = _first_order_block(inputs[1:], out[0], self._weights, self._carry)
+        else:
+            out = _first_order_block(inputs, np.asarray(self._state), self._weights, self._carry)
+        self._state = tuple(out[-1].tolist())
+        return out
+
+    def reset(self) -> None:
+        self._state = None
+
+
+class FilterChain(StreamFilter):
+    """
+    Cadena de filtros aplicados en secuencia.
+
+    Puede engancharse a un SensorManager con attach() para filtrar
+    un flujo de sensor bloque a bloque.
+    """
+
+    def __init__(self, *filters: StreamFilter):
+        """
+        Inicializar la cadena.
+
+        Args:
+            *filters: Filtros en orden de aplicación
+        """
+        self.filters: List[StreamFilter] = list(filters)
+
+    def update(self, x: float, y: float, z: float) -> Vector:
+        for stage in self.filters:
+            x, y, z = stage.update(x, y, z)
+        return (x, y, z)
+
+    def process_block(self, values) -> np.ndarray:
+        samples = _as_samples(values)
+        for stage in self.filters:
+            samples = stage.process_block(samples)
+        return samples
+
+    def reset(self) -> None:
+        for stage in self.filters:
+            stage.reset()
+
+    def attach(self, manager: "SensorManager", sensor_type: "SensorType",
+               callback: Callable) -> Callable:
+        """
+        Filtrar un flujo de SensorManager.
+
+        Registra un callback por lotes en el gestor que filtra cada
+        bloque recibido y llama a callback(sensor_type, bloque_filtrado)
+        con un array estructurado SENSOR_DTYPE (timestamps intactos).
+
+        Args:
+            manager: Gestor de sensores
+            sensor_type: Sensor a filtrar
+            callback: Receptor de los bloques filtrados
+
+        Returns:
+            El callback registrado en el gestor
+        """
+        # Importación diferida: utils no depende del gestor de sensores
+        from sensors import SENSOR_DTYPE
+
+        def on_block(block_type: "SensorType", block: np.ndarray) -> None:
+            samples = np.column_stack((block["x"], block["y"], block["z"]))
+            filtered = self.process_block(samples)
+            out = np.empty(len(block), dtype=SENSOR_DTYPE)
+            out["x"], out["y"], out["z"] = filtered[:, 0], filtered[:, 1], filtered[:, 2]
+            out["timestamp"] = block["timestamp"]
+            out.flags.writeable = False
+            callback(block_type, out)
+
+        manager.register_callback(sensor_type, on_block, batch=True)
+        return on_block
@@ -7,12 +7,16 @@ para todos los tests del proyecto.
 
 import pytest
 import sys
+import numpy as np
 from pathlib import Path
 
 # Añadir src al path para imports
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
+from sensors import SensorType, SENSOR_DTYPE
+from recording import SessionRecorder
+
 
 @pytest.fixture
 def sample_config():
@@ -33,3 +37,52 @@ def sample_sensor_data():
         "z": 0.5,
         "timestamp": 1234567890.0
     }
+
+
+@pytest.fixture
+def recorded_session(tmp_path):
+    """
+    Fixture que graba sesiones intercaladas de varios sensores.
+    
+    Devuelve una función record(samples, rate_hz, ...) que graba en
+    tmp_path una sesión con x = índice de la muestra (más ruido
+    gaussiano si noise > 0), alternando bloques de chunk muestras de
+    cada sensor, y devuelve la ruta del archivo.
+    """
+    def record(samples=500, rate_hz=100.0, start=0.0, chunk=10,
+               sensors=(SensorType.ACCELEROMETER, SensorType.GYROSCOPE), idle=(),
+               noise=0.0, name="session.snsr"):
+        """
+        Grabar una sesión.
+        
+        Args:
+            samples: Muestras por sensor
+            rate_hz: Frecuencia de muestreo
+            start: Timestamp de la primera muestra
+            chunk: Muestras por bloque grabado
+            sensors: Sensores con muestras, en orden de intercalado
+            idle: Sensores declarados en la sesión pero sin muestras
+            noise: Desviación del ruido añadido a x, y, z
+            name: Nombre del archivo dentro de tmp_path
+            
+        Returns:
+            Ruta de la sesión grabada
+        """
+        rng = np.random.default_rng(1)
+        blocks = []
+        for _ in sensors:
+            block = np.zeros(samples, dtype=SENSOR_DTYPE)
+            block["timestamp"] = start + np.arange(samples) / rate_hz
+            block["x"] = np.arange(samples)
+            if noise:
+                for axis in ("x", "y", "z"):
+                    block[axis] += rng.normal(0, noise, samples)
+            blocks.append(block)
+        path = tmp_path / name
+        with SessionRecorder(path, [*sensors, *idle], rate_hz=rate_hz) as recorder:
+            for i in range(0, samples, chunk):
+                for sensor_type, block in zip(sensors, blocks):
+                    recorder.record_block(sensor_type, block[i:i + chunk])
+        return path
+    
+    return record
@@ -5,13 +5,18 @@ Este módulo contiene tests para CommunicationManager.
 """
 
 import pytest
+import socket
+import subprocess
 import sys
+import threading
 from pathlib import Path
 from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from communication import CommunicationManager, OSCMessage, MIDIEvent
+from communication import (CommunicationManager, OSCMessage, MIDIEvent, OSC_AVAILABLE,
+                           OSCEncoder, MessageHistory, TargetGroup, pack_osc_bundles,
+                           read_spill, unix_to_timetag)
 
 
 class TestOSCMessage:
@@ -33,6 +38,24 @@ class TestOSCMessage:
         assert msg.args == [1, 2, 3]
         assert isinstance(msg.timestamp, datetime)
     
+    def test_slots_and_lazy_timestamp(self):
+        """
+        Test de almacenamiento compacto y marca de tiempo diferida.
+        
+        Casos cubiertos:
+        - Estado: Sin __dict__ por instancia
+        - Éxito: timestamp_ns es monotónico y timestamp equivale a ahora
+        """
+        # Arrange & Act
+        before = datetime.now()
+        first = OSCMessage("/a")
+        second = OSCMessage("/b")
+        
+        # Assert
+        assert not hasattr(first, "__dict__")
+        assert second.timestamp_ns >= first.timestamp_ns
+        assert abs((first.timestamp - before).total_seconds()) < 1.0
+    
     def test_creation_without_args(self):
         """
         Test de creación sin argumentos.
@@ -102,6 +125,22 @@ class TestMIDIEvent:
         assert event.channel == 0
         assert isinstance(event.timestamp, datetime)
     
+    def test_slots_and_lazy_timestamp(self):
+        """
+        Test de almacenamiento compacto y marca de tiempo diferida.
+        
+        Casos cubiertos:
+        - Estado: Sin __dict__ por instancia
+        - Éxito: to_dict formatea la marca de tiempo en ISO
+        """
+        # Arrange & Act
+        event = MIDIEvent(note=60, velocity=100)
+        
+        # Assert
+        assert not hasattr(event, "__dict__")
+        assert isinstance(event.timestamp_ns, int)
+        assert datetime.fromisoformat(event.to_dict()["timestamp"]) == event.timestamp
+    
     def test_creation_default_channel(self):
         """
         Test de creación con canal por defecto.
@@ -211,6 +250,28 @@ class TestCommunicationManager:
         assert len(manager.message_history) == 1
         assert manager.message_history[0]["type"] == "midi"
     
+    def test_on_message(self):
+        """
+        Test de callbacks de historial.
+        
+        Casos cubiertos:
+        - Éxito: Cada entrada del historial se notifica
+        - Error: Un callback que falla no interrumpe el envío
+        """
+        # Arrange
+        manager = CommunicationManager()
+        entries = []
+        manager.on_message(lambda entry: 1 / 0)
+        manager.on_message(entries.append)
+        
+        # Act
+        manager.send_osc(OSCMessage("/test", [1]), "localhost:8000")
+        manager.send_midi(MIDIEvent(60, 100))
+        
+        # Assert
+        assert [e["type"] for e in entries] == ["osc", "midi"]
+        assert entries == manager.message_history
+    
     def test_map_sensor_to_osc(self):
         """
         Test de mapeo de sensor a OSC.
@@ -287,6 +348,25 @@ class TestCommunicationManager:
         # Assert
         assert len(history) == 2
     
+    def test_import_is_lightweight(self):
+        """
+        Test de dependencias del módulo.
+        
+        Casos cubiertos:
+        - Estado: Importar communication no carga NumPy ni el gestor de sensores
+        """
+        # Arrange
+        src = Path(__file__).parent.parent / "src"
+        code = ("import sys; sys.path.insert(0, sys.argv[1]); import communication; "
+                "print('numpy' in sys.modules, 'sensors' in sys.modules)")
+        
+        # Act
+        result = subprocess.run([sys.executable, "-c", code, str(src)],
+                                capture_output=True, text=True, check=True)
+        
+        # Assert
+        assert result.stdout.split() == ["False", "False"]
+    
     def test_start_stop(self):
         """
         Test de inicio y detención.
@@ -305,3 +385,476 @@ class TestCommunicationManager:
         
         manager.stop()
         assert manager.is_active is False
+
+
+def _receiver():
+    """Socket UDP local para recibir los datagramas enviados."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(1.0)
+    return sock, f"127.0.0.1:{sock.getsockname()[1]}"
+
+
+def _receive_all(sock, count):
+    return [sock.recv(65536) for _ in range(count)]
+
+
+def _flatten(bundle):
+    """Pares (timetag, dirección, argumentos) de un bundle y sus sub-bundles."""
+    from pythonosc.osc_bundle import OscBundle
+    result = []
+    for content in bundle:
+        if isinstance(content, OscBundle):
+            result.extend(_flatten(content))
+        else:
+            result.append((bundle.timestamp, content.address, content.params))
+    return result
+
+
+@pytest.mark.skipif(not OSC_AVAILABLE, reason="python-osc no disponible")
+class TestOSCBundles:
+    """Tests para el envío OSC por bundles."""
+    
+    def test_bundles_per_tick(self):
+        """
+        Test de agrupación por tick.
+        
+        Casos cubiertos:
+        - Éxito: Los mensajes de un tick salen en un único datagrama
+        - Estado: Cada mensaje conserva su timetag en un sub-bundle
+        - Estado: Sin bundling cada mensaje es un datagrama
+        """
+        from pythonosc.osc_bundle import OscBundle
+        
+        # Arrange
+        sock, target = _receiver()
+        manager = CommunicationManager()
+        manager.set_bundling(True)
+        base = 1_700_000_000.0
+        
+        # Act
+        for i in range(30):
+            manager.send_osc(OSCMessage(f"/sensor/{i % 3}", [float(i)]), target,
+                             timetag=base + (i // 3) * 0.005)
+        sent = manager.flush_osc()
+        packets = _receive_all(sock, sent)
+        manager.set_bundling(False)
+        manager.send_osc(OSCMessage("/plain", [1]), target)
+        plain = sock.recv(65536)
+        sock.close()
+        
+        # Assert
+        assert sent == 1
+        contents = _flatten(OscBundle(packets[0]))
+        assert [args[0] for _, _, args in contents] == [float(i) for i in range(30)]
+        assert contents[0][0] == pytest.approx(base, abs=1e-6)
+        assert contents[-1][0] == pytest.approx(base + 0.045, abs=1e-6)
+        assert plain.startswith(b"/plain")
+        assert manager.osc_stats == {"messages": 31, "datagrams": 2}
+        assert len(manager.message_history) == 31
+    
+    def test_mtu_split(self):
+        """
+        Test de división por MTU.
+        
+        Casos cubiertos:
+        - Éxito: Ningún datagrama supera la MTU y no se pierden mensajes
+        - Límites: Un mensaje mayor que la MTU va en su propio bundle
+        - Error: Una MTU sin espacio para la cabecera lanza ValueError
+        """
+        # Arrange
+        messages = [(unix_to_timetag(1000.0 + i // 4 * 0.01), b"/a\x00\x00,f\x00\x00" + bytes(4 * (i % 5 + 1)))
+                    for i in range(400)]
+        oversized = [(unix_to_timetag(1000.0), b"/big\x00\x00\x00\x00,b\x00\x00" + bytes(2000))]
+        
+        # Act
+        packets = pack_osc_bundles(messages, mtu=512)
+        single = pack_osc_bundles(oversized, mtu=512)
+        
+        # Assert
+        assert all(len(p) <= 512 for p in packets)
+        assert len(packets) < 40
+        assert sum(p.count(b"/a\x00\x00,f") for p in packets) == 400
+        assert len(single) == 1 and len(single[0]) > 512
+        with pytest.raises(ValueError):
+            CommunicationManager().set_bundling(True, mtu=16)
+    
+    def test_timetag_conversion(self):
+        """
+        Test de conversión a timetag NTP.
+        
+        Casos cubiertos:
+        - Éxito: Segundos desde 1900 en los 32 bits altos y fracción en los bajos
+        """
+        # Act
+        tag = unix_to_timetag(1.5)
+        
+        # Assert
+        assert tag >> 32 == 2208988801
+        assert tag & 0xFFFFFFFF == 1 << 31
+
+
+@pytest.mark.skipif(not OSC_AVAILABLE, reason="python-osc no disponible")
+class TestOSCEncoder:
+    """Tests para OSCEncoder."""
+    
+    def _builder(self, address, args):
+        from pythonosc.osc_message_builder import OscMessageBuilder
+        builder = OscMessageBuilder(address)
+        for arg in args:
+            builder.add_arg(arg)
+        return builder.build().dgram
+    
+    def test_matches_builder(self):
+        """
+        Test de equivalencia con OscMessageBuilder.
+        
+        Casos cubiertos:
+        - Éxito: Mismos bytes para floats, ints y argumentos mixtos
+        - Límites: Direcciones de longitud múltiplo de 4 y sin argumentos
+        - Estado: Tipos sin plantilla y enteros de 64 bits usan el builder
+        """
+        # Arrange
+        encoder = OSCEncoder()
+        cases = [
+            ("/sensor/accelerometer", [0.1, -0.2, 9.81]),
+            ("/abc", [1, 2]),
+            ("/midi/note", [60, 0.5]),
+            ("/ping", []),
+            ("/text", ["hola", True, None]),
+            ("/big", [1 << 40]),
+        ]
+        
+        # Act & Assert
+        for address, args in cases:
+            assert encoder.encode_bytes(address, args) == self._builder(address, args)
+        assert encoder.fallbacks == 2
+    
+    def test_template_cache(self):
+        """
+        Test de la caché de plantillas.
+        
+        Casos cubiertos:
+        - Estado: Cada firma (dirección, tipos) se compila una sola vez
+        - Estado: El buffer se reutiliza entre mensajes
+        - Límites: La caché se vacía al superar max_templates
+        """
+        # Arrange
+        encoder = OSCEncoder(max_templates=2)
+        
+        # Act
+        first = encoder.encode("/sensor/gyroscope", [0.0, 0.0, 0.0])
+        second = encoder.encode("/sensor/gyroscope", [1.0, 2.0, 3.0])
+        encoder.encode("/sensor/gyroscope", [1, 2, 3])
+        encoder.encode("/sensor/gravity", [0.0])
+        
+        # Assert
+        assert first.obj is second.obj
+        assert encoder.hits == 1 and encoder.misses == 3
+        assert len(encoder._templates) == 1
+    
+    def test_send_uses_encoder(self):
+        """
+        Test de envío con el codificador.
+        
+        Casos cubiertos:
+        - Éxito: El receptor obtiene el mismo datagrama que con el builder
+        """
+        # Arrange
+        sock, target = _receiver()
+        manager = CommunicationManager()
+        
+        # Act
+        manager.send_osc(OSCMessage("/sensor/gravity", [0.0, 0.0, -1.0]), target)
+        received = sock.recv(65536)
+        sock.close()
+        
+        # Assert
+        assert received == self._builder("/sensor/gravity", [0.0, 0.0, -1.0])
+        assert manager.osc_encoder.misses == 1
+    
+    def test_send_from_threads(self):
+        """
+        Test de envío concurrente desde varios hilos.
+        
+        Casos cubiertos:
+        - Estado: Cada hilo codifica en su propio buffer
+        - Éxito: Todos los datagramas recibidos son mensajes íntegros
+        """
+        # Arrange
+        from pythonosc.osc_message import OscMessage
+        sock, target = _receiver()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+        sock.settimeout(0.2)
+        manager = CommunicationManager()
+        addresses = ["/a", "/sensor/accelerometer/raw"]
+        
+        def sender(index):
+            for i in range(2000):
+                value = float(index * 10000 + i)
+                manager.send_osc(OSCMessage(addresses[index], [value, value, value]), target)
+        
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        
+        # Act
+        try:
+            threads = [threading.Thread(target=sender, args=(i,)) for i in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        received = []
+        try:
+            while True:
+                received.append(sock.recv(65536))
+        except socket.timeout:
+            pass
+        sock.close()
+        
+        # Assert
+        assert len(received) > 1000
+        for dgram in received:
+            message = OscMessage(dgram)
+            index = addresses.index(message.address)
+            value = message.params[0]
+            assert message.params == [value, value, value]
+            assert int(value) // 10000 == index
+
+
+class TestMessageHistory:
+    """Tests para MessageHistory."""
+    
+    def test_bounded_capacity(self):
+        """
+        Test de capacidad fija.
+        
+        Casos cubiertos:
+        - Límites: Solo se conservan los últimos history_size mensajes
+        - Estado: Se guardan registros compactos, no diccionarios
+        - Error: Capacidad no positiva lanza ValueError
+        """
+        # Arrange
+        manager = CommunicationManager(history_size=100)
+        
+        # Act
+        for i in range(1000):
+            manager.send_osc(OSCMessage(f"/test/{i}", [i]), "localhost:8000")
+        
+        # Assert
+        assert len(manager.message_history) == 100
+        assert isinstance(manager.message_history._records[0], tuple)
+        history = manager.get_history()
+        assert history[0]["message"]["address"] == "/test/900"
+        assert history[-1]["message"]["args"] == [999]
+        assert manager.get_history(count=3)[0]["message"]["address"] == "/test/997"
+        with pytest.raises(ValueError):
+            MessageHistory(capacity=0)
+    
+    def test_entry_format(self):
+        """
+        Test de materialización de entradas.
+        
+        Casos cubiertos:
+        - Éxito: Las entradas mantienen el formato de to_dict()
+        - Estado: Los argumentos se copian al registrar
+        """
+        # Arrange
+        manager = CommunicationManager()
+        message = OSCMessage("/sensor/x", [0.5])
+        event = MIDIEvent(note=60, velocity=100, channel=2)
+        
+        # Act
+        manager.send_osc(message, "localhost:9000")
+        manager.send_midi(event)
+        message.args.append(1.0)
+        osc, midi = manager.get_history()
+        
+        # Assert
+        assert osc["message"]["args"] == [0.5]
+        assert osc["message"]["timestamp"] == message.timestamp.isoformat()
+        assert osc["target"] == "localhost:9000"
+        assert midi["message"] == event.to_dict()
+        assert "target" not in midi
+    
+    def test_spill_to_disk(self, tmp_path):
+        """
+        Test de volcado a disco.
+        
+        Casos cubiertos:
+        - Éxito: El volcado conserva todos los mensajes aunque la memoria esté acotada
+        - Estado: read_spill devuelve entradas en el formato del historial
+        - Estado: stop() cierra el volcado y start() lo reabre en modo añadir
+        """
+        # Arrange
+        path = tmp_path / "audit.jsonl"
+        
+        # Act
+        with CommunicationManager(history_size=10, history_spill=path) as manager:
+            for i in range(50):
+                manager.send_osc(OSCMessage("/audit", [i]), "localhost:8000")
+            manager.send_midi(MIDIEvent(note=64, velocity=1))
+        closed = manager.message_history._spill is None
+        spilled = list(read_spill(path))
+        history = manager.get_history()
+        manager.start()
+        manager.send_osc(OSCMessage("/audit", [50]), "localhost:8000")
+        manager.stop()
+        
+        # Assert
+        assert closed
+        assert len(list(read_spill(path))) == 52
+        assert len(manager.message_history) == 10
+        assert len(spilled) == 51
+        assert [e["message"]["args"] for e in spilled[:3]] == [[0], [1], [2]]
+        assert spilled[-1]["message"]["note"] == 64
+        assert spilled[-10:] == [
+            {**e, "message": {**e["message"], "timestamp": s["message"]["timestamp"]}}
+            for e, s in zip(history, spilled[-10:])
+        ]
+
+
+class TestTargetGroups:
+    """Tests para los grupos de destinos OSC."""
+    
+    def test_encode_once_fan_out(self):
+        """
+        Test de envío a un grupo.
+        
+        Casos cubiertos:
+        - Éxito: Todos los destinos reciben el mismo datagrama
+        - Estado: Una codificación y un registro de historial por mensaje
+        - Estado: Los grupos reutilizan un socket por familia de direcciones
+        """
+        # Arrange
+        receivers = [_receiver() for _ in range(3)]
+        manager = CommunicationManager()
+        group = manager.add_target_group("mirrors", [target for _, target in receivers])
+        
+        # Act
+        for i in range(10):
+            manager.send_osc(OSCMessage("/sensor/gravity", [float(i), 0.0, -1.0]), "mirrors")
+        received = [_receive_all(sock, 10) for sock, _ in receivers]
+        for sock, _ in receivers:
+            sock.close()
+        
+        # Assert
+        assert received[0] == received[1] == received[2]
+        assert received[0][3] == OSCEncoder().encode_bytes("/sensor/gravity", [3.0, 0.0, -1.0])
+        assert len(manager.message_history) == 10
+        assert manager.get_history()[0]["target"] == "mirrors"
+        assert manager.osc_encoder.misses == 1
+        assert manager.osc_stats == {"messages": 10, "datagrams": 30}
+        assert group.sent == 30 and len(manager._group_sockets) == 1
+        assert manager.osc_clients == {}
+    
+    def test_group_bundles(self):
+        """
+        Test de bundles a un grupo.
+        
+        Casos cubiertos:
+        - Éxito: Los bundles se empaquetan una vez y llegan a todos los destinos
+        """
+        # Arrange
+        receivers = [_receiver() for _ in range(2)]
+        manager = CommunicationManager()
+        manager.add_target_group("mirrors", [target for _, target in receivers])
+        manager.set_bundling(True)
+        
+        # Act
+        for i in range(20):
+            manager.send_osc(OSCMessage("/a", [i]), "mirrors", timetag=1000.0)
+        sent = manager.flush_osc()
+        packets = [sock.recv(65536) for sock, _ in receivers]
+        for sock, _ in receivers:
+            sock.close()
+        
+        # Assert
+        assert sent == 2
+        assert packets[0] == packets[1]
+        assert packets[0].startswith(b"#bundle\x00")
+        assert manager.osc_stats["datagrams"] == 2
+    
+    def test_invalid_groups(self):
+        """
+        Test de grupos no válidos.
+        
+        Casos cubiertos:
+        - Error: Nombre con ":", grupo vacío o destino mal formado lanzan ValueError
+        - Estado: remove_target_group elimina el grupo
+        """
+        # Arrange
+        manager = CommunicationManager()
+        
+        # Act & Assert
+        with pytest.raises(ValueError):
+            TargetGroup("a:b", ["127.0.0.1:9000"])
+        with pytest.raises(ValueError):
+            manager.add_target_group("empty", [])
+        with pytest.raises(ValueError):
+            manager.add_target_group("bad", ["127.0.0.1"])
+        manager.add_target_group("ok", ["127.0.0.1:9000"])
+        assert manager.remove_target_group("ok")
+        assert not manager.remove_target_group("ok")
+    
+    def test_remove_group_flushes_pending(self, caplog):
+        """
+        Test de eliminación de un grupo con bundles pendientes.
+        
+        Casos cubiertos:
+        - Éxito: Los mensajes pendientes del grupo se envían antes de eliminarlo
+        - Estado: flush_osc() posterior no tiene nada que enviar
+        - Error: Pendientes de un destino sin cliente se descartan con aviso
+        """
+        # Arrange
+        sock, target = _receiver()
+        manager = CommunicationManager()
+        manager.add_target_group("mirrors", [target])
+        manager.set_bundling(True)
+        for i in range(3):
+            manager.send_osc(OSCMessage("/a", [i]), "mirrors", timetag=1000.0)
+        
+        # Act
+        removed = manager.remove_target_group("mirrors")
+        packet = sock.recv(65536)
+        later = manager.flush_osc()
+        manager._pending_osc["127.0.0.1:1"] = [(0, b"/x\x00\x00,\x00\x00\x00")]
+        manager.flush_osc()
+        sock.close()
+        
+        # Assert
+        from pythonosc.osc_bundle import OscBundle
+        assert removed is True
+        assert [args for _, _, args in _flatten(OscBundle(packet))] == [[0], [1], [2]]
+        assert later == 0
+        assert "se descartan 1 mensajes" in caplog.text
+    
+    def test_stop_closes_group_sockets(self):
+        """
+        Test de cierre de los sockets de grupo.
+        
+        Casos cubiertos:
+        - Estado: stop() cierra los sockets de los grupos
+        - Éxito: Tras reiniciar, el grupo vuelve a abrir su socket y envía
+        """
+        # Arrange
+        sock, target = _receiver()
+        manager = CommunicationManager()
+        manager.add_target_group("mirrors", [target])
+        manager.start()
+        opened = list(manager._group_sockets.values())
+        
+        # Act
+        manager.stop()
+        manager.start()
+        manager.send_osc(OSCMessage("/a", [1.0]), "mirrors")
+        received = sock.recv(65536)
+        manager.stop()
+        sock.close()
+        
+        # Assert
+        assert len(opened) == 1 and opened[0].fileno() == -1
+        assert received == OSCEncoder().encode_bytes("/a", [1.0])
+        assert manager._group_sockets == {}
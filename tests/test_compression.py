@@ -0,0 +1,209 @@
+"""
+Tests para el módulo compression.py.
+
+Este módulo contiene tests para el códec de sesiones comprimidas.
+"""
+
+import pytest
+import sys
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorType, SENSOR_DTYPE
+from recording import SessionRecorder, SessionReader, RECORD_DTYPE
+from compression import CompressedSessionWriter, CompressedSessionReader, compress_session
+
+
+class TestSessionCodec:
+    """Tests para CompressedSessionWriter y CompressedSessionReader."""
+    
+    def test_round_trip(self, tmp_path, recorded_session):
+        """
+        Test de compresión y descompresión.
+        
+        Casos cubiertos:
+        - Éxito: Los registros se reconstruyen en orden con error acotado
+        - Estado: Los metadatos de la sesión se conservan
+        - ⚡ Performance: El archivo es varias veces menor que el original
+        """
+        # Arrange
+        source = recorded_session(samples=1000, start=1000.0, chunk=5, noise=0.01)
+        reader = SessionReader(source)
+        
+        # Act
+        info = compress_session(reader, tmp_path / "session.snsz", block_records=256)
+        packed = CompressedSessionReader(tmp_path / "session.snsz")
+        decoded = np.concatenate(list(packed.iter_blocks()))
+        
+        # Assert
+        original = np.array(reader.records)
+        assert info["records"] == len(packed) == 2000
+        assert info["blocks"] == packed.num_blocks == 8
+        assert info["ratio"] > 3.0
+        assert packed.sensor_types == reader.sensor_types
+        assert packed.rate_hz == 100.0
+        assert packed.start_time == reader.start_time
+        assert packed.read_block(0).dtype == RECORD_DTYPE
+        assert list(decoded["sensor"]) == list(original["sensor"])
+        for name in ("x", "y", "z"):
+            assert np.abs(decoded[name] - original[name]).max() <= 0.5e-4 + 1e-12
+        assert np.abs(decoded["timestamp"] - original["timestamp"]).max() <= 0.5e-6 + 1e-9
+        packed.close()
+    
+    def test_independent_blocks_and_seek(self, tmp_path, recorded_session):
+        """
+        Test de bloques independientes.
+        
+        Casos cubiertos:
+        - Éxito: Un bloque intermedio se decodifica sin leer los anteriores
+        - Límites: Instantes anteriores al inicio van al primer bloque
+        """
+        # Arrange
+        source = recorded_session(samples=1000, start=1000.0, chunk=5, noise=0.01)
+        compress_session(source, tmp_path / "session.snsz", block_records=100)
+        original = np.array(SessionReader(source).records)
+        
+        # Act
+        with CompressedSessionReader(tmp_path / "session.snsz") as packed:
+            index = packed.block_for_time(1005.0)
+            block = packed.read_block(index)
+            first = packed.block_for_time(0.0)
+        
+        # Assert
+        assert block["timestamp"].min() <= 1005.0 <= block["timestamp"].max() + 0.01
+        np.testing.assert_allclose(block["x"], original[index * 100:(index + 1) * 100]["x"],
+                                   atol=1e-4)
+        assert first == 0
+    
+    def test_read_range(self, tmp_path, recorded_session):
+        """
+        Test de consultas por intervalo sobre la sesión comprimida.
+        
+        Casos cubiertos:
+        - Éxito: Coincide con SessionReader.read_range dentro del cuanto
+        - Límites: Intervalo vacío o invertido
+        """
+        # Arrange
+        source = recorded_session(samples=1000, start=1000.0, chunk=5, noise=0.01)
+        compress_session(source, tmp_path / "session.snsz", block_records=100)
+        expected = SessionReader(source).read_range(SensorType.GYROSCOPE, 1002.0, 1004.0)
+        
+        # Act
+        with CompressedSessionReader(tmp_path / "session.snsz") as packed:
+            values = packed.read_range(SensorType.GYROSCOPE, 1002.0, 1004.0)
+            inverted = packed.read_range(SensorType.GYROSCOPE, 1004.0, 1002.0)
+        
+        # Assert
+        assert len(values) == len(expected) == 201
+        np.testing.assert_allclose(values["x"], expected["x"], atol=1e-4)
+        assert len(inverted) == 0
+    
+    def test_read_range_interleaved_batches(self, tmp_path):
+        """
+        Test de consultas por intervalo con lotes intercalados desfasados.
+        
+        Casos cubiertos:
+        - Éxito: Bloques que se solapan en el tiempo no se saltan
+        - Estado: Coincide con SessionReader.read_range en cada sensor
+        """
+        # Arrange
+        source = tmp_path / "session.snsr"
+        rng = np.random.default_rng(4)
+        sensors = [SensorType.ACCELEROMETER, SensorType.GYROSCOPE]
+        with SessionRecorder(source, sensors, rate_hz=100.0) as recorder:
+            # El giroscopio llega en lotes más largos y con retraso, como con attach()
+            for i in range(0, 2000, 40):
+                accel = np.zeros(40, dtype=SENSOR_DTYPE)
+                accel["timestamp"] = 1000.0 + (i + np.arange(40)) / 100.0
+                accel["x"] = rng.normal(size=40)
+                recorder.record_block(SensorType.ACCELEROMETER, accel)
+                if i % 120 == 80:
+                    gyro = np.zeros(120, dtype=SENSOR_DTYPE)
+                    gyro["timestamp"] = 1000.0 + (i - 80 + np.arange(120)) / 100.0 + 0.003
+                    gyro["x"] = rng.normal(size=120)
+                    recorder.record_block(SensorType.GYROSCOPE, gyro)
+        compress_session(source, tmp_path / "session.snsz", block_records=64)
+        reader = SessionReader(source)
+        windows = [(1001.0, 1001.4), (1003.05, 1003.45), (1010.0, 1010.39), (999.0, 1000.2)]
+        
+        with CompressedSessionReader(tmp_path / "session.snsz") as packed:
+            for sensor_type in sensors:
+                for t0, t1 in windows:
+                    # Act
+                    expected = reader.read_range(sensor_type, t0, t1)
+                    values = packed.read_range(sensor_type, t0, t1)
+                    
+                    # Assert
+                    assert len(values) == len(expected) > 0
+                    np.testing.assert_allclose(values["x"], expected["x"], atol=1e-4)
+                    np.testing.assert_allclose(values["timestamp"], expected["timestamp"], atol=1e-6)
+    
+    def test_sensor_array(self, tmp_path, recorded_session):
+        """
+        Test de extracción por sensor.
+        
+        Casos cubiertos:
+        - Éxito: Coincide con SessionReader.sensor_array dentro del cuanto
+        - Error: Un sensor no grabado lanza KeyError
+        """
+        # Arrange
+        source = recorded_session(samples=300, start=1000.0, chunk=5, noise=0.01)
+        compress_session(source, tmp_path / "session.snsz", value_quantum=1e-3)
+        
+        # Act
+        with CompressedSessionReader(tmp_path / "session.snsz") as packed:
+            gyro = packed.sensor_array(SensorType.GYROSCOPE)
+            
+            # Assert
+            expected = SessionReader(source).sensor_array(SensorType.GYROSCOPE)
+            assert gyro.dtype == SENSOR_DTYPE
+            np.testing.assert_allclose(gyro["x"], expected["x"], atol=0.5e-3 + 1e-12)
+            with pytest.raises(KeyError):
+                packed.sensor_array(SensorType.MAGNETOMETER)
+    
+    def test_invalid_input(self, tmp_path):
+        """
+        Test de entradas inválidas.
+        
+        Casos cubiertos:
+        - Error: Valores no finitos lanzan ValueError
+        - Error: Un archivo sin cerrar o ajeno no se abre
+        - Error: Cuanto no positivo lanza ValueError
+        """
+        # Arrange
+        records = np.zeros(3, dtype=RECORD_DTYPE)
+        records["x"][1] = np.nan
+        
+        # Act & Assert
+        with pytest.raises(ValueError):
+            CompressedSessionWriter(tmp_path / "a.snsz", [SensorType.GRAVITY], value_quantum=0)
+        writer = CompressedSessionWriter(tmp_path / "b.snsz", [SensorType.GRAVITY])
+        with pytest.raises(ValueError):
+            writer.write_block(records)
+        writer._file.flush()
+        with pytest.raises(ValueError):
+            CompressedSessionReader(tmp_path / "b.snsz")
+        writer.close()
+        (tmp_path / "c.snsz").write_bytes(b"nope")
+        with pytest.raises(ValueError):
+            CompressedSessionReader(tmp_path / "c.snsz")
+    
+    def test_empty_session(self, tmp_path):
+        """
+        Test de sesión vacía.
+        
+        Casos cubiertos:
+        - Límites: Sin registros no hay bloques y la extracción está vacía
+        """
+        # Arrange
+        SessionRecorder(tmp_path / "empty.snsr", [SensorType.GRAVITY]).close()
+        
+        # Act
+        info = compress_session(tmp_path / "empty.snsr", tmp_path / "empty.snsz")
+        
+        # Assert
+        with CompressedSessionReader(tmp_path / "empty.snsz") as packed:
+            assert info["records"] == 0 and packed.num_blocks == 0
+            assert len(packed.sensor_array(SensorType.GRAVITY)) == 0
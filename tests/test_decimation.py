@@ -0,0 +1,238 @@
+"""
+Tests para el módulo decimation.py.
+
+Este módulo contiene tests para el diezmado LTTB y min/max.
+"""
+
+import pytest
+import sys
+import time
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorManager, SensorType, SENSOR_DTYPE
+from recording import SessionRecorder, SessionReader
+from decimation import (decimate, decimate_history, decimate_session, lttb_indices,
+                        minmax_indices, StreamingDecimator)
+
+
+def _signal(n, seed=0):
+    """Señal SENSOR_DTYPE: seno lento con ruido y un pico aislado."""
+    rng = np.random.default_rng(seed)
+    block = np.zeros(n, dtype=SENSOR_DTYPE)
+    block["timestamp"] = np.arange(n) / 200.0
+    block["x"] = np.sin(block["timestamp"]) + rng.normal(0, 0.05, n)
+    block["x"][n // 3] = 5.0
+    return block
+
+
+def _reference_lttb(t, v, n_out):
+    """LTTB escrito de forma directa (una muestra cada vez)."""
+    n = len(v)
+    edges = [int(e) for e in np.linspace(1, n - 1, n_out - 1)]
+    selected = [0]
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_t, avg_v = t[stop:next_stop].mean(), v[stop:next_stop].mean()
+        best, best_area = start, -1.0
+        for j in range(start, stop):
+            area = abs((t[a] - avg_t) * (v[j] - v[a]) - (t[a] - t[j]) * (avg_v - v[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+class TestDecimate:
+    """Tests para decimate, lttb_indices y minmax_indices."""
+    
+    def test_minmax_preserves_extremes(self):
+        """
+        Test de diezmado min/max.
+        
+        Casos cubiertos:
+        - Éxito: Se conservan el máximo y el mínimo globales
+        - Límites: Entradas menores que n_out se devuelven enteras
+        """
+        # Arrange
+        block = _signal(100_003)
+        
+        # Act
+        reduced = decimate(block, 1000, "minmax", "x")
+        
+        # Assert
+        assert len(reduced) <= 1000
+        assert reduced["x"].max() == block["x"].max() == 5.0
+        assert reduced["x"].min() == block["x"].min()
+        assert np.all(np.diff(reduced["timestamp"]) > 0)
+        assert list(minmax_indices(np.arange(5.0), 10)) == [0, 1, 2, 3, 4]
+    
+    def test_lttb_matches_reference(self):
+        """
+        Test de LTTB frente a una implementación directa.
+        
+        Casos cubiertos:
+        - Éxito: Mismos índices que el algoritmo de referencia
+        - Estado: Primer y último punto siempre incluidos
+        """
+        # Arrange
+        block = _signal(5000, seed=3)
+        t, v = block["timestamp"], block["x"]
+        
+        # Act
+        indices = lttb_indices(t, v, 100)
+        
+        # Assert
+        assert list(indices) == _reference_lttb(t, v, 100)
+        assert indices[0] == 0 and indices[-1] == 4999
+    
+    def test_decimate_history(self):
+        """
+        Test de diezmado del historial de SensorManager.
+        
+        Casos cubiertos:
+        - Éxito: LTTB sobre la magnitud devuelve n_out filas del historial
+        - Error: Método o canal desconocidos lanzan ValueError
+        """
+        # Arrange
+        manager = SensorManager(history_size=10_000)
+        block = _signal(10_000)
+        manager.record_batch(SensorType.ACCELEROMETER, block["x"], block["y"], block["z"],
+                             block["timestamp"])
+        
+        # Act
+        reduced = decimate_history(manager, SensorType.ACCELEROMETER, 500)
+        
+        # Assert
+        assert len(reduced) == 500
+        assert 5.0 in reduced["x"]
+        with pytest.raises(ValueError):
+            decimate(block, 10, "mean")
+        with pytest.raises(ValueError):
+            decimate(block, 10, "lttb", "w")
+    
+    def test_performance(self):
+        """
+        Test de rendimiento.
+        
+        Casos cubiertos:
+        - ⚡ Performance: 1M de muestras a 2000 puntos en < 1 s por método
+        """
+        # Arrange
+        block = _signal(1_000_000)
+        
+        # Act & Assert
+        for method in ("lttb", "minmax"):
+            start = time.perf_counter()
+            decimate(block, 2000, method, "x")
+            assert time.perf_counter() - start < 1.0
+
+
+class TestStreamingDecimator:
+    """Tests para StreamingDecimator y decimate_session."""
+    
+    def test_streaming_minmax_matches_batch(self):
+        """
+        Test de min/max incremental.
+        
+        Casos cubiertos:
+        - Éxito: Bloques de cualquier tamaño dan las mismas cubetas que de una vez
+        - Estado: Primera y última muestra incluidas
+        """
+        # Arrange
+        block = _signal(1000)
+        whole = StreamingDecimator(50, "minmax", "x", max_points=None)
+        pieces = StreamingDecimator(50, "minmax", "x", max_points=None)
+        
+        # Act
+        whole.push(block)
+        for i in range(0, 1000, 13):
+            pieces.push(block[i:i + 13])
+        
+        # Assert
+        np.testing.assert_array_equal(whole.points(), pieces.points())
+        points = pieces.points()
+        assert points["timestamp"][0] == block["timestamp"][0]
+        assert points["timestamp"][-1] == block["timestamp"][-1]
+        assert 5.0 in points["x"]
+    
+    def test_bounded_output(self):
+        """
+        Test de salida acotada.
+        
+        Casos cubiertos:
+        - Límites: Los puntos no superan max_points y las cubetas crecen
+        - Éxito: El pico sobrevive a las fusiones en min/max
+        - Estado: LTTB incremental mantiene el orden temporal
+        """
+        # Arrange
+        block = _signal(200_000)
+        minmax = StreamingDecimator(8, "minmax", "x", max_points=500)
+        lttb = StreamingDecimator(8, "lttb", "x", max_points=500)
+        
+        # Act
+        for i in range(0, len(block), 64):
+            minmax.push(block[i:i + 64])
+            lttb.push(block[i:i + 64])
+        
+        # Assert
+        for decimator in (minmax, lttb):
+            points = decimator.points()
+            assert len(points) <= 500 + 4
+            assert decimator.bucket_size > 8
+            assert np.all(np.diff(points["timestamp"]) > 0)
+        assert 5.0 in minmax.points()["x"]
+    
+    def test_attach_and_session(self, tmp_path):
+        """
+        Test de diezmado en vivo y de sesiones grabadas.
+        
+        Casos cubiertos:
+        - Éxito: attach recibe los lotes de SensorManager
+        - Éxito: decimate_session diezma un sensor en flujo
+        - Error: Sensor no grabado lanza KeyError
+        """
+        # Arrange
+        manager = SensorManager()
+        live = StreamingDecimator(4, "lttb", "x")
+        live.attach(manager, SensorType.GYROSCOPE)
+        block = _signal(4000)
+        path = tmp_path / "session.snsr"
+        with SessionRecorder(path, [SensorType.ACCELEROMETER, SensorType.GYROSCOPE]) as recorder:
+            for i in range(0, 4000, 100):
+                recorder.record_block(SensorType.ACCELEROMETER, block[i:i + 100])
+                recorder.record_block(SensorType.GYROSCOPE, block[i:i + 10])
+        
+        # Act
+        manager.record_batch(SensorType.GYROSCOPE, block["x"][:100], block["y"][:100],
+                             block["z"][:100], block["timestamp"][:100])
+        reduced = decimate_session(SessionReader(path), SensorType.ACCELEROMETER, 200)
+        
+        # Assert
+        assert live.samples == 100
+        assert 20 <= len(live.points()) <= 30
+        assert 150 <= len(reduced) <= 204
+        assert reduced["x"].max() == 5.0
+        with pytest.raises(KeyError):
+            decimate_session(SessionReader(path), SensorType.GRAVITY, 200)
+    
+    def test_invalid_parameters(self):
+        """
+        Test de parámetros inválidos.
+        
+        Casos cubiertos:
+        - Error: bucket_size < 2 o max_points < 8 lanzan ValueError
+        - Límites: Sin muestras no hay puntos
+        """
+        # Act & Assert
+        with pytest.raises(ValueError):
+            StreamingDecimator(bucket_size=1)
+        with pytest.raises(ValueError):
+            StreamingDecimator(max_points=4)
+        assert len(StreamingDecimator().points()) == 0
@@ -0,0 +1,307 @@
+"""
+Tests para el módulo dispatch.py.
+
+Este módulo contiene tests para los despachadores de callbacks.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorManager, SensorType, SensorData
+from dispatch import AsyncDispatcher, ThreadPoolDispatcher, OverflowPolicy
+
+
+def make_data(i: int) -> SensorData:
+    """Crear una muestra de acelerómetro con timestamp i."""
+    return SensorData(SensorType.ACCELEROMETER, i, i, i, float(i))
+
+
+class TestAsyncDispatcher:
+    """Tests para AsyncDispatcher."""
+    
+    @pytest.mark.asyncio
+    async def test_delivery_in_order(self):
+        """
+        Test de entrega asíncrona ordenada.
+        
+        Casos cubiertos:
+        - Éxito: record_data no ejecuta el callback en línea
+        - Estado: Las muestras llegan en orden tras ceder el bucle
+        """
+        # Arrange
+        dispatcher = AsyncDispatcher()
+        manager = SensorManager(dispatcher=dispatcher)
+        received = []
+        manager.register_callback(SensorType.ACCELEROMETER, lambda d: received.append(d.timestamp))
+        await dispatcher.start()
+        
+        # Act
+        for i in range(5):
+            manager.record_data(SensorType.ACCELEROMETER, make_data(i))
+        inline = list(received)
+        await dispatcher.stop()
+        
+        # Assert
+        assert inline == []
+        assert received == [0.0, 1.0, 2.0, 3.0, 4.0]
+    
+    @pytest.mark.asyncio
+    async def test_slow_callback_does_not_block(self):
+        """
+        Test de callback lento.
+        
+        Casos cubiertos:
+        - Éxito: record_data retorna sin esperar a un callback lento
+        - Estado: Callbacks corrutina se esperan en el consumidor
+        """
+        # Arrange
+        dispatcher = AsyncDispatcher()
+        manager = SensorManager(dispatcher=dispatcher)
+        received = []
+        
+        async def slow(data):
+            await asyncio.sleep(0.05)
+            received.append(data.timestamp)
+        
+        manager.register_callback(SensorType.ACCELEROMETER, slow)
+        await dispatcher.start()
+        
+        # Act
+        start = time.perf_counter()
+        for i in range(3):
+            manager.record_data(SensorType.ACCELEROMETER, make_data(i))
+        elapsed = time.perf_counter() - start
+        await dispatcher.stop()
+        
+        # Assert
+        assert elapsed < 0.05
+        assert received == [0.0, 1.0, 2.0]
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("policy, expected, dropped", [
+        (OverflowPolicy.DROP_OLDEST, [7.0, 8.0, 9.0], 7),
+        (OverflowPolicy.DROP_NEWEST, [0.0, 1.0, 2.0], 7),
+        (OverflowPolicy.COALESCE, [9.0], 9),
+    ])
+    async def test_overflow_policies(self, policy, expected, dropped):
+        """
+        Test de políticas de desbordamiento.
+        
+        Casos cubiertos:
+        - Límites: Cola llena descarta según la política
+        - Estado: Contador de descartes en stats()
+        """
+        # Arrange
+        dispatcher = AsyncDispatcher(maxsize=3, policy=policy)
+        received = []
+        callback = lambda d: received.append(d.timestamp)
+        
+        # Act - encolar antes de iniciar para forzar desbordamiento
+        for i in range(10):
+            dispatcher.submit(SensorType.ACCELEROMETER, callback, make_data(i))
+        stats = dispatcher.stats()
+        await dispatcher.start()
+        await dispatcher.stop()
+        
+        # Assert
+        assert received == expected
+        assert stats[0]["dropped"] == dropped
+    
+    @pytest.mark.asyncio
+    async def test_submit_from_other_thread(self):
+        """
+        Test de envío desde un hilo de captura.
+        
+        Casos cubiertos:
+        - Éxito: submit desde otro hilo despierta al consumidor
+        """
+        # Arrange
+        dispatcher = AsyncDispatcher()
+        received = asyncio.Event()
+        await dispatcher.start()
+        
+        # Act
+        thread = threading.Thread(target=dispatcher.submit,
+                                  args=(SensorType.GYROSCOPE, lambda d: received.set(), make_data(0)))
+        thread.start()
+        thread.join()
+        await asyncio.wait_for(received.wait(), timeout=1.0)
+        await dispatcher.stop()
+        
+        # Assert
+        assert dispatcher.stats()[0]["delivered"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_callback_error_isolated(self):
+        """
+        Test de error en callback.
+        
+        Casos cubiertos:
+        - Error: Una excepción no detiene al consumidor
+        """
+        # Arrange
+        dispatcher = AsyncDispatcher()
+        received = []
+        
+        def flaky(data):
+            if data.timestamp == 0.0:
+                raise RuntimeError("fallo")
+            received.append(data.timestamp)
+        
+        await dispatcher.start()
+        
+        # Act
+        dispatcher.submit(SensorType.ACCELEROMETER, flaky, make_data(0))
+        dispatcher.submit(SensorType.ACCELEROMETER, flaky, make_data(1))
+        await dispatcher.stop()
+        
+        # Assert
+        assert received == [1.0]
+    
+    def test_invalid_maxsize(self):
+        """
+        Test de capacidad inválida.
+        
+        Casos cubiertos:
+        - Error: ValueError si maxsize no es positivo
+        """
+        # Act & Assert
+        with pytest.raises(ValueError):
+            AsyncDispatcher(maxsize=0)
+
+
+class TestThreadPoolDispatcher:
+    """Tests para ThreadPoolDispatcher."""
+    
+    def test_per_subscriber_ordering(self):
+        """
+        Test de orden por suscriptor.
+        
+        Casos cubiertos:
+        - Éxito: Cada par (sensor, callback) recibe sus datos en orden
+        - Estado: Contadores de entregas y retraso en stats()
+        """
+        # Arrange
+        dispatcher = ThreadPoolDispatcher(max_workers=4, batch_size=3)
+        manager = SensorManager(dispatcher=dispatcher)
+        received = {sensor_type: [] for sensor_type in (SensorType.ACCELEROMETER, SensorType.GYROSCOPE)}
+        for sensor_type, values in received.items():
+            manager.register_callback(sensor_type, lambda d, v=values: v.append(d.timestamp))
+        
+        # Act
+        for i in range(100):
+            for sensor_type in received:
+                manager.record_data(sensor_type, SensorData(sensor_type, i, i, i, float(i)))
+        dispatcher.shutdown(wait=True)
+        
+        # Assert
+        for values in received.values():
+            assert values == [float(i) for i in range(100)]
+        stats = dispatcher.stats()
+        assert all(s["delivered"] == 100 and s["queue_depth"] == 0 for s in stats)
+        assert all(s["max_lag_ms"] >= s["last_lag_ms"] >= 0 for s in stats)
+    
+    def test_subscribers_run_in_parallel(self):
+        """
+        Test de ejecución en paralelo entre suscriptores.
+        
+        Casos cubiertos:
+        - Éxito: Un callback bloqueado no retrasa a otro sensor
+        - Éxito: record_data no espera al callback bloqueado
+        """
+        # Arrange
+        dispatcher = ThreadPoolDispatcher(max_workers=2)
+        manager = SensorManager(dispatcher=dispatcher)
+        release = threading.Event()
+        fast_done = threading.Event()
+        manager.register_callback(SensorType.ACCELEROMETER, lambda d: release.wait(1.0))
+        manager.register_callback(SensorType.GYROSCOPE, lambda d: fast_done.set())
+        
+        # Act
+        start = time.perf_counter()
+        manager.record_data(SensorType.ACCELEROMETER, make_data(0))
+        manager.record_data(SensorType.GYROSCOPE, SensorData(SensorType.GYROSCOPE, 0, 0, 0, 0.0))
+        elapsed = time.perf_counter() - start
+        fast_ran = fast_done.wait(1.0)
+        release.set()
+        dispatcher.shutdown(wait=True)
+        
+        # Assert
+        assert elapsed < 0.5
+        assert fast_ran
+    
+    def test_overflow_drop_newest(self):
+        """
+        Test de desbordamiento con callback bloqueado.
+        
+        Casos cubiertos:
+        - Límites: La cola acotada descarta lo entrante y lo cuenta
+        """
+        # Arrange
+        dispatcher = ThreadPoolDispatcher(max_workers=1, maxsize=2, policy=OverflowPolicy.DROP_NEWEST)
+        release = threading.Event()
+        received = []
+        
+        def blocking(data):
+            release.wait(1.0)
+            received.append(data.timestamp)
+        
+        # Act
+        for i in range(6):
+            dispatcher.submit(SensorType.ACCELEROMETER, blocking, make_data(i))
+        release.set()
+        dispatcher.shutdown(wait=True)
+        
+        # Assert
+        stats = dispatcher.stats()[0]
+        assert received[0] == 0.0
+        assert stats["delivered"] + stats["dropped"] == 6
+        assert stats["dropped"] >= 3
+    
+    def test_submit_after_shutdown(self):
+        """
+        Test de envío tras el cierre.
+        
+        Casos cubiertos:
+        - Límites: Las invocaciones tras shutdown se descartan sin error
+        """
+        # Arrange
+        dispatcher = ThreadPoolDispatcher()
+        dispatcher.shutdown()
+        
+        # Act
+        dispatcher.submit(SensorType.ACCELEROMETER, lambda d: None, make_data(0))
+        
+        # Assert
+        assert dispatcher.stats()[0]["dropped"] == 1
+        assert dispatcher.queue_depth == 0
+    
+    def test_submit_races_executor_shutdown(self):
+        """
+        Test de envío con el pool ya cerrado.
+        
+        Casos cubiertos:
+        - Error: RuntimeError del executor no se propaga al hilo de captura
+        - Estado: La invocación cuenta como descartada y no queda programada
+        """
+        # Arrange
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.shutdown()
+        dispatcher = ThreadPoolDispatcher(executor=executor)
+        callback = lambda d: None
+        
+        # Act
+        dispatcher.submit(SensorType.ACCELEROMETER, callback, make_data(0))
+        dispatcher.submit(SensorType.ACCELEROMETER, callback, make_data(1))
+        
+        # Assert
+        assert dispatcher.stats()[0]["dropped"] == 2
+        assert dispatcher.queue_depth == 0
+        assert dispatcher.join(timeout=0.1)
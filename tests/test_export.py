@@ -0,0 +1,107 @@
+"""
+Tests para el módulo export.py.
+
+Este módulo contiene tests para la exportación columnar .npy/.npz.
+"""
+
+import pytest
+import sys
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorManager, SensorType, SensorData
+from recording import SessionReader
+from compression import CompressedSessionReader, compress_session
+from export import export_history, export_session, load_columns, load_export, load_manifest
+
+
+class TestExport:
+    """Tests para export_history, export_session y los cargadores."""
+    
+    def test_export_history(self, tmp_path):
+        """
+        Test de exportación del historial.
+        
+        Casos cubiertos:
+        - Éxito: Las columnas coinciden con get_array
+        - Estado: Los cargadores npy devuelven memmaps de solo lectura
+        """
+        # Arrange
+        manager = SensorManager(history_size=50)
+        values = np.arange(80, dtype=float)
+        manager.record_batch(SensorType.ACCELEROMETER, values, -values, values * 2, values / 10)
+        manager.record_data(SensorType.GRAVITY, SensorData(SensorType.GRAVITY, 0.0, 0.0, 1.0, 5.0))
+        
+        # Act
+        counts = export_history(manager, tmp_path / "history")
+        columns = load_columns(tmp_path / "history", SensorType.ACCELEROMETER)
+        
+        # Assert
+        assert counts == {SensorType.ACCELEROMETER: 50, SensorType.GRAVITY: 1}
+        assert isinstance(columns["x"], np.memmap)
+        assert not columns["x"].flags.writeable
+        expected = manager.get_array(SensorType.ACCELEROMETER)
+        for name in ("timestamp", "x", "y", "z"):
+            np.testing.assert_array_equal(columns[name], expected[name])
+        assert load_manifest(tmp_path / "history")["source"] == "history"
+    
+    def test_export_session_npy(self, tmp_path, recorded_session):
+        """
+        Test de exportación de una sesión a columnas npy.
+        
+        Casos cubiertos:
+        - Éxito: Cada sensor coincide con SessionReader.sensor_array
+        - Límites: Un sensor sin muestras produce columnas vacías
+        - Estado: El manifiesto conserva frecuencia e inicio
+        """
+        # Arrange
+        path = recorded_session(idle=(SensorType.GRAVITY,))
+        reader = SessionReader(path)
+        
+        # Act
+        counts = export_session(path, tmp_path / "out")
+        exported = load_export(tmp_path / "out")
+        
+        # Assert
+        assert counts == {SensorType.ACCELEROMETER: 500, SensorType.GYROSCOPE: 500,
+                          SensorType.GRAVITY: 0}
+        gyro = reader.sensor_array(SensorType.GYROSCOPE)
+        np.testing.assert_array_equal(exported[SensorType.GYROSCOPE]["x"], gyro["x"])
+        np.testing.assert_array_equal(exported[SensorType.GYROSCOPE]["timestamp"], gyro["timestamp"])
+        assert len(exported[SensorType.GRAVITY]["z"]) == 0
+        manifest = load_manifest(tmp_path / "out")
+        assert manifest["rate_hz"] == 100.0
+        assert manifest["start_time"] == reader.start_time
+    
+    def test_export_session_npz_and_compressed_source(self, tmp_path, recorded_session):
+        """
+        Test de exportación a npz desde una sesión comprimida.
+        
+        Casos cubiertos:
+        - Éxito: El npz contiene las columnas del sensor seleccionado
+        - Error: Sensores no exportados o no grabados lanzan KeyError
+        - Error: Formato desconocido lanza ValueError
+        """
+        # Arrange
+        path = recorded_session(idle=(SensorType.GRAVITY,))
+        compress_session(path, tmp_path / "session.snsz", block_records=64)
+        packed = CompressedSessionReader(tmp_path / "session.snsz")
+        
+        # Act
+        counts = export_session(packed, tmp_path / "out", [SensorType.ACCELEROMETER],
+                                fmt="npz", compressed=True)
+        columns = load_columns(tmp_path / "out", SensorType.ACCELEROMETER)
+        
+        # Assert
+        assert counts == {SensorType.ACCELEROMETER: 500}
+        np.testing.assert_allclose(columns["x"], np.arange(500), atol=1e-4)
+        columns.close()
+        with pytest.raises(KeyError):
+            load_columns(tmp_path / "out", SensorType.GYROSCOPE)
+        with pytest.raises(KeyError):
+            export_session(packed, tmp_path / "bad", [SensorType.MAGNETOMETER])
+        with pytest.raises(ValueError):
+            export_session(packed, tmp_path / "bad", fmt="csv")
+        packed.close()
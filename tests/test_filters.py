@@ -0,0 +1,249 @@
+"""
+Tests para el módulo utils/filters.py.
+
+Este módulo contiene tests para los filtros de señal incrementales.
+"""
+
+import pytest
+import subprocess
+import sys
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorManager, SensorType
+from utils.filters import (
+    StreamFilter, LowPassFilter, HighPassFilter, MedianFilter, ComplementaryFilter, FilterChain,
+)
+
+
+def noisy_signal(n: int = 150, seed: int = 0) -> np.ndarray:
+    """Señal (n, 3) con tendencia lenta y ruido."""
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0, 3, n)[:, None]
+    return np.sin(t * [1.0, 2.0, 3.0]) + rng.normal(0, 0.2, (n, 3))
+
+
+def run_scalar(stage, samples: np.ndarray) -> np.ndarray:
+    """Aplicar un filtro muestra a muestra."""
+    return np.array([stage.update(*row) for row in samples])
+
+
+class TestStreamFilters:
+    """Tests para los filtros de una entrada."""
+    
+    @pytest.mark.parametrize("factory", [
+        lambda: LowPassFilter(0.1),
+        lambda: HighPassFilter(0.3),
+        lambda: MedianFilter(5),
+        lambda: MedianFilter(4),
+        lambda: FilterChain(MedianFilter(3), LowPassFilter(0.2)),
+    ])
+    def test_block_matches_scalar(self, factory):
+        """
+        Test de equivalencia entre vía por muestra y vía por bloques.
+        
+        Casos cubiertos:
+        - Éxito: process_block produce lo mismo que update
+        - Límites: Bloques mayores que un tramo y bloques partidos
+        """
+        # Arrange
+        samples = noisy_signal()
+        
+        # Act
+        scalar = run_scalar(factory(), samples)
+        whole = factory().process_block(samples)
+        split_filter = factory()
+        split = np.vstack([split_filter.process_block(samples[:2]),
+                           split_filter.process_block(samples[2:70]),
+                           run_scalar(split_filter, samples[70:80]),
+                           split_filter.process_block(samples[80:])])
+        
+        # Assert
+        np.testing.assert_allclose(whole, scalar, atol=1e-12)
+        np.testing.assert_allclose(split, scalar, atol=1e-12)
+    
+    def test_lowpass_smooths(self):
+        """
+        Test de suavizado del paso bajo.
+        
+        Casos cubiertos:
+        - Éxito: La varianza de la señal filtrada se reduce
+        - Estado: La primera muestra inicializa el estado
+        """
+        # Arrange
+        samples = np.random.default_rng(1).normal(0, 1, (500, 3))
+        lowpass = LowPassFilter.from_cutoff(cutoff_hz=2.0, sample_rate_hz=200.0)
+        
+        # Act
+        out = lowpass.process_block(samples)
+        
+        # Assert
+        np.testing.assert_array_equal(out[0], samples[0])
+        assert np.all(out[50:].std(axis=0) < samples.std(axis=0) / 3)
+    
+    def test_highpass_removes_constant(self):
+        """
+        Test de eliminación de componente constante.
+        
+        Casos cubiertos:
+        - Éxito: Una señal constante (gravedad) se anula
+        """
+        # Arrange
+        highpass = HighPassFilter(0.5)
+        
+        # Act
+        results = [highpass.update(0.0, 0.0, 9.81) for _ in range(10)]
+        
+        # Assert
+        assert results[-1] == pytest.approx((0.0, 0.0, 0.0))
+    
+    def test_median_removes_spike(self):
+        """
+        Test de eliminación de picos aislados.
+        
+        Casos cubiertos:
+        - Éxito: Un pico aislado no aparece en la salida
+        """
+        # Arrange
+        samples = np.zeros((10, 3))
+        samples[5] = 100.0
+        
+        # Act
+        out = MedianFilter(3).process_block(samples)
+        
+        # Assert
+        assert np.all(out == 0.0)
+    
+    def test_reset(self):
+        """
+        Test de reinicio del estado.
+        
+        Casos cubiertos:
+        - Estado: Tras reset la siguiente muestra reinicia el filtro
+        """
+        # Arrange
+        chain = FilterChain(LowPassFilter(0.1), MedianFilter(3))
+        chain.update(5.0, 5.0, 5.0)
+        
+        # Act
+        chain.reset()
+        
+        # Assert
+        assert chain.update(1.0, 2.0, 3.0) == (1.0, 2.0, 3.0)
+    
+    def test_invalid_parameters(self):
+        """
+        Test de parámetros inválidos.
+        
+        Casos cubiertos:
+        - Error: ValueError para alpha, ventana, k o forma de bloque inválidos
+        """
+        # Act & Assert
+        with pytest.raises(ValueError):
+            LowPassFilter(0.0)
+        with pytest.raises(ValueError):
+            MedianFilter(0)
+        with pytest.raises(ValueError):
+            ComplementaryFilter(1.5)
+        with pytest.raises(ValueError):
+            LowPassFilter(0.5).process_block(np.zeros((4, 2)))
+    
+    def test_abstract_interface(self):
+        """
+        Test de la interfaz abstracta.
+        
+        Casos cubiertos:
+        - Error: StreamFilter y subclases incompletas no se instancian
+        - Estado: Importar utils no carga NumPy ni el gestor de sensores
+        """
+        # Arrange
+        class Incomplete(StreamFilter):
+            def update(self, x, y, z):
+                return (x, y, z)
+        
+        src = Path(__file__).parent.parent / "src"
+        code = ("import sys; sys.path.insert(0, sys.argv[1]); import utils; "
+                "print('numpy' in sys.modules, 'sensors' in sys.modules, "
+                "utils.LowPassFilter.__name__)")
+        
+        # Act
+        result = subprocess.run([sys.executable, "-c", code, str(src)],
+                                capture_output=True, text=True, check=True)
+        
+        # Assert
+        with pytest.raises(TypeError):
+            StreamFilter()
+        with pytest.raises(TypeError):
+            Incomplete()
+        assert result.stdout.split() == ["False", "False", "LowPassFilter"]
+
+
+class TestComplementaryFilter:
+    """Tests para ComplementaryFilter."""
+    
+    def test_block_matches_scalar(self):
+        """
+        Test de equivalencia entre vía por muestra y vía por bloques.
+        
+        Casos cubiertos:
+        - Éxito: process_block produce lo mismo que update
+        """
+        # Arrange
+        deltas = noisy_signal(120, seed=2) * 0.01
+        references = noisy_signal(120, seed=3)
+        scalar_filter = ComplementaryFilter(0.95)
+        
+        # Act
+        scalar = np.array([scalar_filter.update(d, r) for d, r in zip(deltas, references)])
+        block_filter = ComplementaryFilter(0.95)
+        block = np.vstack([block_filter.process_block(deltas[:1], references[:1]),
+                           block_filter.process_block(deltas[1:], references[1:])])
+        
+        # Assert
+        np.testing.assert_allclose(block, scalar, atol=1e-12)
+    
+    def test_converges_to_reference(self):
+        """
+        Test de corrección de deriva.
+        
+        Casos cubiertos:
+        - Éxito: Con incrementos nulos converge a la referencia
+        """
+        # Arrange
+        fusion = ComplementaryFilter(0.9)
+        fusion.update((0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+        
+        # Act
+        out = fusion.process_block(np.zeros((200, 3)), np.ones((200, 3)))
+        
+        # Assert
+        np.testing.assert_allclose(out[-1], [1.0, 1.0, 1.0], atol=1e-6)
+
+
+class TestFilterChainAttach:
+    """Tests para el enganche de FilterChain a SensorManager."""
+    
+    def test_attach_filters_batches(self):
+        """
+        Test de filtrado de un flujo de SensorManager.
+        
+        Casos cubiertos:
+        - Éxito: El receptor recibe bloques filtrados con timestamps intactos
+        - Estado: El historial del gestor conserva los datos crudos
+        """
+        # Arrange
+        manager = SensorManager()
+        chain = FilterChain(LowPassFilter(0.5))
+        received = []
+        chain.attach(manager, SensorType.ACCELEROMETER, lambda t, b: received.append(b))
+        
+        # Act
+        manager.record_batch(SensorType.ACCELEROMETER, [0.0, 2.0], [0.0, 2.0], [0.0, 2.0], [1.0, 2.0])
+        
+        # Assert
+        assert len(received) == 1
+        assert list(received[0]["x"]) == [0.0, 1.0]
+        assert list(received[0]["timestamp"]) == [1.0, 2.0]
+        assert manager.get_data(SensorType.ACCELEROMETER)[-1].x == 2.0
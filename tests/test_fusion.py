@@ -0,0 +1,231 @@
+"""
+Tests para el módulo fusion.py.
+
+Este módulo contiene tests para los filtros de orientación y OrientationEngine.
+"""
+
+import math
+import pytest
+import sys
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorManager, SensorType
+from fusion import (
+    MadgwickFilter, MahonyFilter, OrientationEngine, OrientationFilter, quaternion_to_euler,
+)
+
+FILTERS = [lambda: MadgwickFilter(beta=0.5), lambda: MahonyFilter(kp=2.0, ki=0.1)]
+
+
+def repeat(row, n: int) -> np.ndarray:
+    """Repetir una fila n veces como array (n, 3)."""
+    return np.tile(np.asarray(row, dtype=np.float64), (n, 1))
+
+
+class TestQuaternionToEuler:
+    """Tests para quaternion_to_euler."""
+    
+    def test_identity_and_rotations(self):
+        """
+        Test de conversión a ángulos de Euler.
+        
+        Casos cubiertos:
+        - Éxito: Identidad da ángulos nulos
+        - Éxito: Rotaciones sobre x y z dan roll y yaw
+        """
+        # Arrange
+        half = 0.3
+        quaternions = [(1.0, 0.0, 0.0, 0.0),
+                       (math.cos(half), math.sin(half), 0.0, 0.0),
+                       (math.cos(half), 0.0, 0.0, math.sin(half))]
+        
+        # Act
+        euler = quaternion_to_euler(quaternions)
+        
+        # Assert
+        np.testing.assert_allclose(euler, [[0, 0, 0], [0.6, 0, 0], [0, 0, 0.6]], atol=1e-12)
+
+
+class TestOrientationFilters:
+    """Tests para MadgwickFilter y MahonyFilter."""
+    
+    @pytest.mark.parametrize("factory", FILTERS)
+    def test_converges_to_tilt(self, factory):
+        """
+        Test de convergencia a la inclinación medida.
+        
+        Casos cubiertos:
+        - Éxito: Con gravedad inclinada el roll converge al ángulo real
+        """
+        # Arrange
+        fusion = factory()
+        angle = 0.5
+        
+        # Act
+        q = fusion.update_block(np.zeros((2000, 3)),
+                                repeat((0.0, math.sin(angle), math.cos(angle)), 2000), None, 0.01)
+        
+        # Assert
+        assert quaternion_to_euler(q[-1])[0] == pytest.approx(angle, abs=0.02)
+    
+    @pytest.mark.parametrize("factory", FILTERS)
+    def test_converges_to_heading(self, factory):
+        """
+        Test de convergencia del rumbo con magnetómetro.
+        
+        Casos cubiertos:
+        - Éxito: El yaw converge al rumbo implícito en el campo medido
+        """
+        # Arrange
+        fusion = factory()
+        heading = 0.7
+        field = np.array([1.0, 0.0, -1.0]) / math.sqrt(2.0)
+        mag = (math.cos(heading) * field[0], -math.sin(heading) * field[0], field[2])
+        
+        # Act
+        q = fusion.update_block(np.zeros((3000, 3)), repeat((0, 0, 1), 3000), repeat(mag, 3000), 0.01)
+        
+        # Assert
+        assert quaternion_to_euler(q[-1])[2] == pytest.approx(heading, abs=0.02)
+    
+    @pytest.mark.parametrize("factory", FILTERS)
+    def test_gyro_integration(self, factory):
+        """
+        Test de integración del giroscopio sin corrección.
+        
+        Casos cubiertos:
+        - Éxito: 1 rad/s durante 1 s sobre z da yaw de 1 rad
+        - Límites: Acelerómetro nulo omite la corrección
+        """
+        # Arrange
+        fusion = factory()
+        
+        # Act
+        q = fusion.update_block(repeat((0, 0, 1.0), 100), np.zeros((100, 3)), None, 0.01)
+        
+        # Assert
+        assert quaternion_to_euler(q[-1])[2] == pytest.approx(1.0, abs=1e-3)
+    
+    @pytest.mark.parametrize("factory", FILTERS)
+    def test_block_matches_scalar(self, factory):
+        """
+        Test de equivalencia entre update y update_block.
+        
+        Casos cubiertos:
+        - Éxito: Ambas vías producen el mismo cuaternión
+        """
+        # Arrange
+        rng = np.random.default_rng(0)
+        gyros, accels, mags = rng.normal(size=(3, 50, 3))
+        scalar_filter, block_filter = factory(), factory()
+        
+        # Act
+        for g, a, m in zip(gyros, accels, mags):
+            scalar_filter.update(g, a, m, 0.005)
+        block_filter.update_block(gyros, accels, mags, 0.005)
+        
+        # Assert
+        np.testing.assert_allclose(block_filter.quaternion, scalar_filter.quaternion, atol=1e-12)
+    
+    def test_base_is_abstract(self):
+        """
+        Test de la base abstracta.
+        
+        Casos cubiertos:
+        - Error: OrientationFilter sin _step no se instancia
+        """
+        # Act & Assert
+        with pytest.raises(TypeError):
+            OrientationFilter()
+
+
+class TestOrientationEngine:
+    """Tests para OrientationEngine."""
+    
+    def test_publishes_virtual_sensor(self):
+        """
+        Test de publicación de la orientación en SensorManager.
+        
+        Casos cubiertos:
+        - Éxito: Cada muestra de giroscopio produce una de ORIENTATION
+        - Estado: Callbacks de cuaterniones reciben el bloque
+        - Estado: Se usa el acelerómetro más reciente del historial
+        """
+        # Arrange
+        manager = SensorManager(history_size=1000)
+        engine = OrientationEngine(manager, MadgwickFilter(beta=1.0), use_magnetometer=False)
+        received = []
+        engine.on_quaternion(lambda ts, q: received.append(q))
+        angle = 0.4
+        manager.record_batch(SensorType.ACCELEROMETER, [0.0], [math.sin(angle)], [math.cos(angle)], [0.0])
+        
+        # Act
+        timestamps = np.arange(1, 801) * 0.005
+        zeros = np.zeros(800)
+        manager.record_batch(SensorType.GYROSCOPE, zeros, zeros, zeros, timestamps)
+        
+        # Assert
+        orientation = manager.get_array(SensorType.ORIENTATION)
+        assert len(orientation) == 800
+        assert orientation["timestamp"][-1] == pytest.approx(4.0)
+        assert orientation["x"][-1] == pytest.approx(angle, abs=0.02)
+        assert received[0].shape == (800, 4)
+    
+    def test_cost_budget(self):
+        """
+        Test de coste medido por actualización.
+        
+        Casos cubiertos:
+        - ⚡ Performance: La fusión MARG sostiene más de 200 Hz
+        """
+        # Arrange
+        manager = SensorManager()
+        engine = OrientationEngine(manager)
+        rng = np.random.default_rng(1)
+        for sensor_type in (SensorType.ACCELEROMETER, SensorType.MAGNETOMETER):
+            manager.record_batch(sensor_type, *rng.normal(size=(3, 10)), np.arange(10) * 0.005)
+        
+        # Act
+        for block in range(20):
+            ts = (np.arange(10) + 10 * block) * 0.005
+            manager.record_batch(SensorType.GYROSCOPE, *rng.normal(size=(3, 10)), ts)
+        
+        # Assert
+        stats = engine.stats()
+        assert stats["updates"] == 200
+        assert stats["max_rate_hz"] > 200
+    
+    def test_latest_before_reads_bounded_tail(self):
+        """
+        Test de búsqueda del acelerómetro en la cola del historial.
+        
+        Casos cubiertos:
+        - Éxito: Coincide con la búsqueda sobre el historial completo
+        - Límites: Un bloque de giroscopio retrasado amplía la cola leída
+        - ⚡ Performance: No se lee el historial completo en cada bloque
+        """
+        # Arrange
+        manager = SensorManager(history_size=50000)
+        engine = OrientationEngine(manager, MadgwickFilter(), use_magnetometer=False)
+        rng = np.random.default_rng(2)
+        accel_ts = np.arange(50000) * 0.001
+        manager.record_batch(SensorType.ACCELEROMETER, *rng.normal(size=(3, 50000)), accel_ts)
+        history = manager.get_array(SensorType.ACCELEROMETER).copy()
+        counts = []
+        get_array = manager.get_array
+        manager.get_array = lambda sensor_type, count=None: (
+            counts.append(count), get_array(sensor_type, count))[1]
+        
+        for timestamps in (accel_ts[-10:] + 0.0005, accel_ts[-1000:-990] + 0.0005):
+            # Act
+            values = engine._latest_before(SensorType.ACCELEROMETER, timestamps)
+            
+            # Assert
+            idx = np.searchsorted(history["timestamp"], timestamps, side="right") - 1
+            expected = np.column_stack((history["x"][idx], history["y"][idx], history["z"][idx]))
+            np.testing.assert_array_equal(values, expected)
+        assert None not in counts
+        assert max(counts) < 50000
@@ -0,0 +1,189 @@
+"""
+Tests para el módulo gestures.py.
+
+Este módulo contiene tests para GestureDetector.
+"""
+
+import math
+import pytest
+import sys
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorManager, SensorType
+from gestures import GestureDetector, GestureType, GestureEvent
+
+RATE = 200.0
+
+
+def timeline(seconds: float, start: float = 0.0) -> np.ndarray:
+    """Timestamps a RATE Hz."""
+    return start + np.arange(int(seconds * RATE)) / RATE
+
+
+def detect(detector: GestureDetector, xyz: np.ndarray, timestamps: np.ndarray) -> list:
+    """Procesar una señal (n, 3) y devolver los tipos de evento."""
+    events = detector.process_block(xyz[:, 0], xyz[:, 1], xyz[:, 2], timestamps)
+    return [e.type for e in events]
+
+
+class TestGestureDetector:
+    """Tests para GestureDetector."""
+    
+    def test_tap(self):
+        """
+        Test de golpe seco.
+        
+        Casos cubiertos:
+        - Éxito: Un pico corto y fuerte se detecta como tap
+        """
+        # Arrange
+        detector = GestureDetector()
+        ts = timeline(0.5)
+        xyz = np.zeros((len(ts), 3))
+        xyz[20, 2] = 2.0
+        
+        # Act
+        events = detect(detector, xyz, ts)
+        
+        # Assert
+        assert events == [GestureType.TAP]
+    
+    def test_flick_direction(self):
+        """
+        Test de lanzamiento.
+        
+        Casos cubiertos:
+        - Éxito: Un pulso de ~100 ms se detecta como flick
+        - Estado: La dirección apunta al eje del pico
+        """
+        # Arrange
+        detector = GestureDetector()
+        received = []
+        detector.on_gesture(received.append)
+        ts = timeline(0.6)
+        xyz = np.zeros((len(ts), 3))
+        xyz[10:30, 0] = 1.3 * np.sin(np.linspace(0, math.pi, 20))
+        xyz[30:50, 0] = -0.5 * np.sin(np.linspace(0, math.pi, 20))
+        
+        # Act
+        events = detect(detector, xyz, ts)
+        
+        # Assert
+        assert events == [GestureType.FLICK]
+        assert received[0].direction == pytest.approx((1.0, 0.0, 0.0))
+        assert received[0].magnitude == pytest.approx(1.3, abs=0.05)
+    
+    def test_shake(self):
+        """
+        Test de sacudida.
+        
+        Casos cubiertos:
+        - Éxito: Una oscilación fuerte de 5 Hz se detecta como shake
+        """
+        # Arrange
+        detector = GestureDetector()
+        ts = timeline(1.2)
+        xyz = np.zeros((len(ts), 3))
+        xyz[:, 1] = 1.5 * np.sin(2 * math.pi * 5 * ts)
+        
+        # Act
+        events = detect(detector, xyz, ts)
+        
+        # Assert
+        assert GestureType.SHAKE in events
+        assert GestureType.TAP not in events
+    
+    def test_stroke_start_and_end(self):
+        """
+        Test de inicio y fin de trazo.
+        
+        Casos cubiertos:
+        - Éxito: Movimiento sostenido inicia un trazo
+        - Éxito: Quietud prolongada lo termina
+        - Estado: stroke_active refleja el trazo en curso
+        """
+        # Arrange
+        detector = GestureDetector()
+        rng = np.random.default_rng(0)
+        moving = timeline(0.8)
+        still = timeline(1.0, start=0.8)
+        motion = np.abs(rng.normal(0.3, 0.05, (len(moving), 3))) / math.sqrt(3)
+        
+        # Act
+        started = detect(detector, motion, moving)
+        active_during = detector.stroke_active
+        ended = detect(detector, np.zeros((len(still), 3)), still)
+        
+        # Assert
+        assert started == [GestureType.STROKE_START]
+        assert active_during
+        assert ended == [GestureType.STROKE_END]
+        assert not detector.stroke_active
+    
+    def test_remove_gravity(self):
+        """
+        Test con acelerómetro crudo.
+        
+        Casos cubiertos:
+        - Éxito: Con remove_gravity la gravedad constante no genera eventos
+        """
+        # Arrange
+        detector = GestureDetector(remove_gravity=True)
+        ts = timeline(2.0)
+        xyz = np.tile([0.0, 0.0, -1.0], (len(ts), 1))
+        
+        # Act
+        events = detect(detector, xyz, ts)
+        
+        # Assert
+        assert events == []
+    
+    def test_attach_and_budget(self):
+        """
+        Test de enganche a SensorManager y coste por muestra.
+        
+        Casos cubiertos:
+        - Éxito: Los bloques del gestor se analizan en cada muestra
+        - ⚡ Performance: Coste medio por muestra muy inferior a 5 ms (200 Hz)
+        """
+        # Arrange
+        manager = SensorManager()
+        detector = GestureDetector()
+        received = []
+        detector.on_gesture(received.append)
+        detector.attach(manager)
+        ts = timeline(1.0)
+        xyz = np.zeros((len(ts), 3))
+        xyz[50, 0] = 2.0
+        
+        # Act
+        for i in range(0, len(ts), 20):
+            block = slice(i, i + 20)
+            manager.record_batch(SensorType.USER_ACCELERATION, xyz[block, 0], xyz[block, 1],
+                                 xyz[block, 2], ts[block])
+        
+        # Assert
+        assert [e.type for e in received] == [GestureType.TAP]
+        stats = detector.stats()
+        assert stats["samples"] == len(ts)
+        assert stats["mean_sample_us"] < 200
+    
+    def test_event_to_dict(self):
+        """
+        Test de conversión de evento a diccionario.
+        
+        Casos cubiertos:
+        - Éxito: Retorna diccionario con todos los campos
+        """
+        # Arrange
+        event = GestureEvent(GestureType.FLICK, 1.5, 1.2, (0.0, 1.0, 0.0))
+        
+        # Act
+        result = event.to_dict()
+        
+        # Assert
+        assert result == {"type": "flick", "timestamp": 1.5, "magnitude": 1.2,
+                          "direction": [0.0, 1.0, 0.0]}
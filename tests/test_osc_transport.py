@@ -0,0 +1,287 @@
+"""
+Tests para el módulo osc_transport.py.
+
+Este módulo contiene tests para AsyncOSCTransport y send_osc_async.
+"""
+
+import asyncio
+import socket
+import threading
+import time
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from communication import CommunicationManager, OSCEncoder, OSCMessage
+from dispatch import OverflowPolicy
+from osc_transport import AsyncOSCTransport, parse_target
+
+
+class LoopbackReceiver(asyncio.DatagramProtocol):
+    """Receptor UDP local que guarda los datagramas recibidos."""
+    
+    def __init__(self):
+        self.received = []
+        self.transport = None
+    
+    def connection_made(self, transport):
+        self.transport = transport
+        sock = transport.get_extra_info("socket")
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+    
+    def datagram_received(self, data, addr):
+        self.received.append(data)
+    
+    @property
+    def target(self) -> str:
+        return f"127.0.0.1:{self.transport.get_extra_info('sockname')[1]}"
+
+
+async def open_receiver() -> LoopbackReceiver:
+    loop = asyncio.get_running_loop()
+    _, receiver = await loop.create_datagram_endpoint(LoopbackReceiver,
+                                                      local_addr=("127.0.0.1", 0))
+    return receiver
+
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    """Ceder el bucle hasta que se cumpla la condición o venza el plazo."""
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        await asyncio.sleep(0.001)
+
+
+class TestAsyncOSCTransport:
+    """Tests para AsyncOSCTransport."""
+    
+    @pytest.mark.asyncio
+    async def test_fan_out_throughput(self):
+        """
+        Test de envío a varios destinos por loopback.
+        
+        Casos cubiertos:
+        - Éxito: Cada destino recibe todos sus datagramas en orden
+        - Estado: stats() cuenta los enviados por destino
+        - ⚡ Performance: 3 × 5000 datagramas en < 2 s
+        """
+        # Arrange
+        receivers = [await open_receiver() for _ in range(3)]
+        transport = AsyncOSCTransport(maxsize=10000)
+        await transport.start()
+        encoder = OSCEncoder()
+        messages = [encoder.encode_bytes("/sensor/accelerometer", [float(i), 0.0, 0.0])
+                    for i in range(5000)]
+        
+        # Act
+        start = time.perf_counter()
+        for dgram in messages:
+            for receiver in receivers:
+                transport.submit(receiver.target, dgram)
+        await wait_for(lambda: all(len(r.received) == 5000 for r in receivers))
+        elapsed = time.perf_counter() - start
+        await transport.stop()
+        
+        # Assert
+        for receiver in receivers:
+            assert receiver.received == messages
+            receiver.transport.close()
+        assert [s["sent"] for s in transport.stats()] == [5000, 5000, 5000]
+        assert elapsed < 2.0
+    
+    @pytest.mark.asyncio
+    async def test_submit_from_thread_does_not_block(self):
+        """
+        Test de encolado desde otro hilo.
+        
+        Casos cubiertos:
+        - Éxito: submit() desde un hilo de captura retorna sin esperar al socket
+        - Estado: Los datagramas se entregan en el bucle
+        """
+        # Arrange
+        receiver = await open_receiver()
+        transport = AsyncOSCTransport()
+        await transport.start()
+        timings = []
+        
+        def capture():
+            for i in range(1000):
+                start = time.perf_counter()
+                transport.submit(receiver.target, b"/t\x00\x00,i\x00\x00" + i.to_bytes(4, "big"))
+                timings.append(time.perf_counter() - start)
+        
+        # Act
+        thread = threading.Thread(target=capture)
+        thread.start()
+        while thread.is_alive():
+            await asyncio.sleep(0.001)
+        await wait_for(lambda: len(receiver.received) == 1000)
+        await transport.stop()
+        receiver.transport.close()
+        
+        # Assert
+        assert len(receiver.received) == 1000
+        assert max(timings) < 0.05
+    
+    @pytest.mark.asyncio
+    async def test_overflow_and_awaitable_send(self):
+        """
+        Test de desbordamiento y envío esperable.
+        
+        Casos cubiertos:
+        - Límites: DROP_NEWEST descarta lo que no cabe antes de iniciar
+        - Éxito: send() se resuelve con True al entregar al socket
+        - Error: send() sin iniciar lanza RuntimeError; destino inválido, ValueError
+        """
+        # Arrange
+        receiver = await open_receiver()
+        transport = AsyncOSCTransport(maxsize=10, policy=OverflowPolicy.DROP_NEWEST)
+        
+        # Act
+        with pytest.raises(RuntimeError):
+            await transport.send(receiver.target, b"/x\x00\x00,\x00\x00\x00")
+        for _ in range(25):
+            transport.submit(receiver.target, b"/x\x00\x00,\x00\x00\x00")
+        await transport.start()
+        await wait_for(lambda: len(receiver.received) == 10)
+        sent = await transport.send(receiver.target, b"/y\x00\x00,\x00\x00\x00")
+        await wait_for(lambda: len(receiver.received) == 11)
+        await transport.stop()
+        receiver.transport.close()
+        
+        # Assert
+        assert sent is True
+        assert transport.stats()[0]["dropped"] == 15
+        assert len(receiver.received) == 11
+        with pytest.raises(ValueError):
+            parse_target("localhost")
+
+
+class TestSendOscAsync:
+    """Tests para CommunicationManager.send_osc_async."""
+    
+    @pytest.mark.asyncio
+    async def test_send_osc_async(self):
+        """
+        Test de envío asíncrono desde CommunicationManager.
+        
+        Casos cubiertos:
+        - Éxito: Fire-and-forget y esperable llegan al receptor
+        - Estado: Los mensajes se registran en el historial
+        - Error: Sin start_async lanza RuntimeError
+        """
+        # Arrange
+        receiver = await open_receiver()
+        manager = CommunicationManager()
+        with pytest.raises(RuntimeError):
+            manager.send_osc_async(OSCMessage("/a", [1.0]), receiver.target)
+        await manager.start_async()
+        
+        # Act
+        assert manager.send_osc_async(OSCMessage("/a", [1.0]), receiver.target) is None
+        sent = await manager.send_osc_async(OSCMessage("/b", [2.0]), receiver.target, wait=True)
+        await wait_for(lambda: len(receiver.received) == 2)
+        await manager.stop_async()
+        receiver.transport.close()
+        
+        # Assert
+        assert sent is True
+        assert receiver.received == [OSCEncoder().encode_bytes("/a", [1.0]),
+                                     OSCEncoder().encode_bytes("/b", [2.0])]
+        assert [e["message"]["address"] for e in manager.get_history()] == ["/a", "/b"]
+        assert manager.is_active is False
+    
+    @pytest.mark.asyncio
+    async def test_send_osc_async_group(self):
+        """
+        Test de envío asíncrono a un grupo.
+        
+        Casos cubiertos:
+        - Éxito: El futuro del grupo se resuelve cuando todos los destinos lo reciben
+        - Estado: Un solo registro de historial para el grupo
+        """
+        # Arrange
+        receivers = [await open_receiver() for _ in range(3)]
+        manager = CommunicationManager()
+        manager.add_target_group("mirrors", [r.target for r in receivers])
+        await manager.start_async()
+        
+        # Act
+        sent = await manager.send_osc_async(OSCMessage("/g", [1.0]), "mirrors", wait=True)
+        await wait_for(lambda: all(r.received for r in receivers))
+        await manager.stop_async()
+        
+        # Assert
+        assert sent is True
+        for receiver in receivers:
+            assert receiver.received == [OSCEncoder().encode_bytes("/g", [1.0])]
+            receiver.transport.close()
+        assert len(manager.message_history) == 1
+
+
+class TestTransportFailures:
+    """Tests de fallos y concurrencia de AsyncOSCTransport."""
+    
+    @pytest.mark.asyncio
+    async def test_endpoint_failure_resolves_sends(self):
+        """
+        Test de destino cuyo socket no puede abrirse.
+        
+        Casos cubiertos:
+        - Error: send() se resuelve con False en lugar de quedarse esperando
+        - Estado: Los envíos posteriores se rechazan y cuentan como descartados
+        - Estado: start() vuelve a intentar abrir el destino
+        """
+        # Arrange
+        transport = AsyncOSCTransport()
+        target = "host.invalid:9000"
+        await transport.start()
+        
+        # Act
+        first = await asyncio.wait_for(transport.send(target, b"/x\x00\x00,\x00\x00\x00"), 5.0)
+        later = await asyncio.wait_for(transport.send(target, b"/x\x00\x00,\x00\x00\x00"), 1.0)
+        stats = transport.stats()[0]
+        await transport.stop()
+        await transport.start()
+        
+        # Assert
+        assert first is False and later is False
+        assert stats["failed"] is True and stats["dropped"] >= 1
+        assert transport._targets[target].failed is False
+        await transport.stop()
+    
+    @pytest.mark.asyncio
+    async def test_eviction_from_thread(self):
+        """
+        Test de descarte desde otro hilo.
+        
+        Casos cubiertos:
+        - Límites: Un send() desplazado por envíos de otro hilo se resuelve con False
+        - Estado: La cola conserva los más recientes sin superar maxsize
+        """
+        # Arrange
+        receiver = await open_receiver()
+        transport = AsyncOSCTransport(maxsize=10)
+        await transport.start()
+        await transport.send(receiver.target, b"/w\x00\x00,\x00\x00\x00")
+        queue = transport._targets[receiver.target]
+        queue.writable.clear()  # Simular pause_writing() del protocolo
+        pending = asyncio.ensure_future(transport.send(receiver.target, b"/p\x00\x00,\x00\x00\x00"))
+        await asyncio.sleep(0.01)
+        
+        # Act
+        thread = threading.Thread(target=lambda: [
+            transport.submit(receiver.target, b"/t\x00\x00,\x00\x00\x00") for _ in range(100)])
+        thread.start()
+        while thread.is_alive():
+            await asyncio.sleep(0.001)
+        result = await asyncio.wait_for(pending, 1.0)
+        depth = len(queue.queue)
+        queue.writable.set()
+        await transport.stop()
+        receiver.transport.close()
+        
+        # Assert
+        assert result is False
+        assert depth <= 10
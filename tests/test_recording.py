@@ -0,0 +1,187 @@
+"""
+Tests para el módulo recording.py.
+
+Este módulo contiene tests para SessionRecorder y SessionReader.
+"""
+
+import pytest
+import sys
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorManager, SensorType, SensorData
+from recording import (SessionRecorder, SessionReader, HEADER_SIZE, RECORD_DTYPE,
+                       INDEX_DTYPE, index_path)
+
+
+class TestSessionRecorder:
+    """Tests para SessionRecorder y SessionReader."""
+    
+    def test_record_and_read(self, tmp_path):
+        """
+        Test de grabación y lectura.
+        
+        Casos cubiertos:
+        - Éxito: Muestras individuales y bloques se leen en orden
+        - Estado: La cabecera conserva sensores, frecuencia e inicio
+        - Estado: El archivo se trunca al cerrar
+        """
+        # Arrange
+        path = tmp_path / "session.snsr"
+        
+        # Act
+        with SessionRecorder(path, [SensorType.ACCELEROMETER, SensorType.GYROSCOPE],
+                             rate_hz=200.0, chunk_records=4) as recorder:
+            recorder.record(SensorType.GYROSCOPE, SensorData(SensorType.GYROSCOPE, 1.0, 2.0, 3.0, 0.5))
+            block = np.zeros(10, dtype=[("x", "f8"), ("y", "f8"), ("z", "f8"), ("timestamp", "f8")])
+            block["x"] = np.arange(10)
+            block["timestamp"] = np.arange(10) + 1.0
+            recorder.record_block(SensorType.ACCELEROMETER, block)
+        reader = SessionReader(path)
+        
+        # Assert
+        assert len(reader) == 11
+        assert reader.sensor_types == [SensorType.ACCELEROMETER, SensorType.GYROSCOPE]
+        assert reader.rate_hz == 200.0
+        assert path.stat().st_size == HEADER_SIZE + 11 * RECORD_DTYPE.itemsize
+        gyro = reader.sensor_array(SensorType.GYROSCOPE)
+        assert gyro.tolist() == [(1.0, 2.0, 3.0, 0.5)]
+        accel = reader.sensor_array(SensorType.ACCELEROMETER)
+        assert list(accel["x"]) == list(range(10))
+        assert isinstance(reader.records, np.memmap)
+    
+    def test_attach_to_manager(self, tmp_path):
+        """
+        Test de grabación de un SensorManager.
+        
+        Casos cubiertos:
+        - Éxito: record_data y record_batch quedan grabados
+        - Límites: Crecimiento del archivo en varios tramos
+        """
+        # Arrange
+        path = tmp_path / "manager.snsr"
+        manager = SensorManager()
+        recorder = SessionRecorder(path, chunk_records=16)
+        recorder.attach(manager)
+        
+        # Act
+        manager.record_data(SensorType.GRAVITY, SensorData(SensorType.GRAVITY, 0.0, 0.0, 1.0, 0.0))
+        ts = np.arange(1, 101) * 0.005
+        manager.record_batch(SensorType.USER_ACCELERATION, ts, ts, ts, ts)
+        recorder.close()
+        
+        # Assert
+        reader = SessionReader(path)
+        assert len(reader) == 101
+        np.testing.assert_allclose(reader.sensor_array(SensorType.USER_ACCELERATION)["timestamp"], ts)
+        assert sum(len(b) for b in reader.iter_blocks(block_size=30)) == 101
+    
+    def test_unclosed_session_is_readable(self, tmp_path):
+        """
+        Test de lectura de una sesión no cerrada.
+        
+        Casos cubiertos:
+        - Límites: Se leen los registros contados aunque el archivo tenga relleno
+        """
+        # Arrange
+        path = tmp_path / "live.snsr"
+        recorder = SessionRecorder(path, chunk_records=100)
+        recorder.record(SensorType.GRAVITY, SensorData(SensorType.GRAVITY, 0.0, 0.0, 1.0, 1.0))
+        recorder.flush()
+        
+        # Act
+        reader = SessionReader(path)
+        
+        # Assert
+        assert len(reader) == 1
+        recorder.close()
+    
+    def test_sparse_index_and_read_range(self, tmp_path):
+        """
+        Test del índice disperso y las consultas por intervalo.
+        
+        Casos cubiertos:
+        - Éxito: read_range coincide con un filtrado completo
+        - Estado: El índice se escribe junto a la sesión al cerrar
+        - Límites: Intervalos antes, después y en los bordes de la sesión
+        """
+        # Arrange
+        path = tmp_path / "session.snsr"
+        block = np.zeros(1000, dtype=[("x", "f8"), ("y", "f8"), ("z", "f8"), ("timestamp", "f8")])
+        block["x"] = np.arange(1000)
+        block["timestamp"] = np.arange(1000) / 100.0
+        with SessionRecorder(path, [SensorType.ACCELEROMETER, SensorType.GYROSCOPE],
+                             index_interval=64) as recorder:
+            for i in range(0, 1000, 7):
+                recorder.record_block(SensorType.ACCELEROMETER, block[i:i + 7])
+                recorder.record(SensorType.GYROSCOPE,
+                                SensorData(SensorType.GYROSCOPE, float(i), 0.0, 0.0, i / 100.0))
+        reader = SessionReader(path)
+        
+        # Act
+        accel = reader.read_range(SensorType.ACCELEROMETER, 2.005, 4.5)
+        gyro = reader.read_range(SensorType.GYROSCOPE, 0.0, 0.5)
+        
+        # Assert
+        entries = np.load(index_path(path))
+        assert entries.dtype == INDEX_DTYPE
+        assert len(entries[entries["sensor"] == 0]) == -(-1000 // 64)
+        assert list(accel["x"]) == list(range(201, 451))
+        assert list(gyro["x"]) == list(range(0, 51, 7))
+        assert len(reader.read_range(SensorType.ACCELEROMETER, 20.0, 30.0)) == 0
+        assert len(reader.read_range(SensorType.ACCELEROMETER, -5.0, -1.0)) == 0
+        assert len(reader.read_range(SensorType.ACCELEROMETER, -1.0, 100.0)) == 1000
+    
+    def test_read_range_without_index_file(self, tmp_path):
+        """
+        Test de consultas sobre una sesión sin archivo de índice.
+        
+        Casos cubiertos:
+        - Éxito: El índice se reconstruye recorriendo la sesión
+        - Éxito: Coincide con el índice grabado
+        - Error: Sensor no incluido lanza KeyError
+        """
+        # Arrange
+        path = tmp_path / "session.snsr"
+        with SessionRecorder(path, [SensorType.GRAVITY], index_interval=16) as recorder:
+            for i in range(100):
+                recorder.record(SensorType.GRAVITY, SensorData(SensorType.GRAVITY, float(i), 0, 0, float(i)))
+        recorded = np.load(index_path(path))
+        index_path(path).unlink()
+        reader = SessionReader(path)
+        
+        # Act
+        rebuilt = reader.build_index(16)
+        values = reader.read_range(SensorType.GRAVITY, 10.0, 12.0)
+        
+        # Assert
+        assert rebuilt.tolist() == recorded.tolist()
+        assert list(values["x"]) == [10.0, 11.0, 12.0]
+        with pytest.raises(KeyError):
+            reader.read_range(SensorType.GYROSCOPE, 0.0, 1.0)
+    
+    def test_errors(self, tmp_path):
+        """
+        Test de errores.
+        
+        Casos cubiertos:
+        - Error: Archivo que no es una sesión
+        - Error: Sensor no incluido en la sesión
+        - Error: Grabar tras cerrar
+        """
+        # Arrange
+        bogus = tmp_path / "bogus.bin"
+        bogus.write_bytes(b"x" * 64)
+        path = tmp_path / "s.snsr"
+        recorder = SessionRecorder(path, [SensorType.GRAVITY])
+        recorder.close()
+        
+        # Act & Assert
+        with pytest.raises(ValueError):
+            SessionReader(bogus)
+        with pytest.raises(KeyError):
+            SessionReader(path).sensor_array(SensorType.GYROSCOPE)
+        with pytest.raises(ValueError):
+            recorder.record(SensorType.GRAVITY, SensorData(SensorType.GRAVITY, 0, 0, 0, 0.0))
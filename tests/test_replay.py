@@ -0,0 +1,190 @@
+"""
+Tests para el módulo replay.py.
+
+Este módulo contiene tests para SessionReplayer.
+"""
+
+import pytest
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorManager, SensorType
+from recording import SessionRecorder, SessionReader
+from replay import SessionReplayer, ReplayMode, ReplayReport
+from dispatch import AsyncDispatcher, ThreadPoolDispatcher
+
+
+class TestSessionReplayer:
+    """Tests para SessionReplayer."""
+    
+    def test_fast_replay(self, tmp_path, recorded_session):
+        """
+        Test de reproducción en modo FAST.
+        
+        Casos cubiertos:
+        - Éxito: Todas las muestras llegan al gestor en orden por sensor
+        - Estado: El informe cuenta muestras y latencias
+        - Estado: Los callbacks de sondeo se eliminan al terminar
+        """
+        # Arrange
+        path = recorded_session(samples=200, rate_hz=200.0, start=100.0)
+        manager = SensorManager(history_size=1000)
+        received = []
+        manager.register_callback(SensorType.GYROSCOPE, received.append)
+        replayer = SessionReplayer(path, manager, mode=ReplayMode.FAST, block_size=64)
+        
+        # Act
+        report = replayer.run()
+        
+        # Assert
+        assert isinstance(report, ReplayReport)
+        assert report.samples == 400
+        assert report.blocks == 7
+        assert report.throughput_hz > 0
+        assert report.latency_max_ms >= report.latency_mean_ms >= 0
+        assert [d.x for d in received] == list(range(200))
+        accel = manager.get_array(SensorType.ACCELEROMETER)
+        assert list(accel["x"]) == list(range(200))
+        assert manager.batch_callbacks == {}
+    
+    def test_scaled_replay_timing(self, tmp_path, recorded_session):
+        """
+        Test de reproducción con tiempo escalado.
+        
+        Casos cubiertos:
+        - Éxito: Una sesión de 1 s a 10× dura unos 0.1 s
+        - Límites: Tramos por tick en lugar de por bloque
+        """
+        # Arrange
+        path = recorded_session(samples=200, rate_hz=200.0, start=100.0)
+        manager = SensorManager(history_size=1000)
+        replayer = SessionReplayer(path, manager, mode=ReplayMode.SCALED, speed=10.0, tick=0.01)
+        
+        # Act
+        start = time.perf_counter()
+        report = replayer.run()
+        elapsed = time.perf_counter() - start
+        
+        # Assert
+        assert report.samples == 400
+        assert report.blocks == 100
+        assert report.session_s == pytest.approx(199 / 200.0)
+        assert 0.09 <= elapsed < 0.5
+        assert report.speed_achieved > 2.0
+    
+    def test_per_sample_injection(self, tmp_path, recorded_session):
+        """
+        Test de inyección muestra a muestra.
+        
+        Casos cubiertos:
+        - Éxito: use_batch=False usa record_data y mide cada muestra
+        """
+        # Arrange
+        path = recorded_session(samples=20, rate_hz=200.0, start=100.0)
+        manager = SensorManager()
+        replayer = SessionReplayer(SessionReader(path), manager, mode=ReplayMode.FAST,
+                                   use_batch=False)
+        
+        # Act
+        report = replayer.run()
+        
+        # Assert
+        assert report.samples == 40
+        assert len(replayer._latencies) == 40
+        assert len(manager.get_data(SensorType.GYROSCOPE)) == 20
+    
+    def test_fast_replay_keeps_capture_order(self, tmp_path, recorded_session):
+        """
+        Test de orden entre sensores en modo FAST.
+        
+        Casos cubiertos:
+        - Éxito: Las tandas llegan en el orden grabado entre sensores
+        - Estado: run() espera al pool de hilos antes de medir la latencia
+        """
+        # Arrange
+        path = recorded_session(samples=200, rate_hz=200.0, start=100.0)
+        manager = SensorManager(history_size=1000)
+        order = []
+        for sensor_type in (SensorType.ACCELEROMETER, SensorType.GYROSCOPE):
+            manager.register_callback(
+                sensor_type, lambda t, block: order.append((t, float(block["x"][0]))), batch=True)
+        dispatcher = ThreadPoolDispatcher(max_workers=2)
+        pooled = SensorManager(history_size=1000, dispatcher=dispatcher)
+        pooled.register_callback(SensorType.GYROSCOPE, lambda t, block: time.sleep(0.001),
+                                 batch=True)
+        
+        # Act
+        SessionReplayer(path, manager, mode=ReplayMode.FAST, block_size=4096).run()
+        replayer = SessionReplayer(path, pooled, mode=ReplayMode.FAST, block_size=4096)
+        report = replayer.run()
+        pending, measured = len(replayer._sent), len(replayer._latencies)
+        dispatcher.shutdown()
+        
+        # Assert
+        expected = [(sensor_type, float(i)) for i in range(0, 200, 10)
+                    for sensor_type in (SensorType.ACCELEROMETER, SensorType.GYROSCOPE)]
+        assert order == expected
+        assert pending == 0 and measured == 40
+        assert report.latency_max_ms >= report.latency_mean_ms > 0
+    
+    def test_invalid_parameters(self, tmp_path, recorded_session):
+        """
+        Test de parámetros inválidos.
+        
+        Casos cubiertos:
+        - Error: speed no positivo lanza ValueError
+        """
+        # Arrange
+        path = recorded_session(samples=10, rate_hz=200.0, start=100.0)
+        
+        # Act & Assert
+        with pytest.raises(ValueError):
+            SessionReplayer(path, SensorManager(), mode=ReplayMode.SCALED, speed=0.0)
+    
+    def test_empty_session(self, tmp_path):
+        """
+        Test de sesión vacía.
+        
+        Casos cubiertos:
+        - Límites: Sin registros el informe queda a cero
+        """
+        # Arrange
+        path = tmp_path / "empty.snsr"
+        SessionRecorder(path, [SensorType.ACCELEROMETER]).close()
+        
+        # Act
+        report = SessionReplayer(path, SensorManager(), mode=ReplayMode.REALTIME).run()
+        
+        # Assert
+        assert report.samples == 0
+        assert report.session_s == 0.0
+    
+    @pytest.mark.asyncio
+    async def test_async_replay_with_dispatcher(self, tmp_path, recorded_session):
+        """
+        Test de reproducción asíncrona con AsyncDispatcher.
+        
+        Casos cubiertos:
+        - Éxito: Los callbacks despachados reciben toda la sesión
+        - Estado: La latencia incluye la cola del despachador
+        """
+        # Arrange
+        path = recorded_session(samples=200, rate_hz=200.0, start=100.0)
+        dispatcher = AsyncDispatcher(maxsize=1024)
+        await dispatcher.start()
+        manager = SensorManager(history_size=1000, dispatcher=dispatcher)
+        received = []
+        manager.register_callback(SensorType.ACCELEROMETER, received.append)
+        replayer = SessionReplayer(path, manager, mode=ReplayMode.FAST, block_size=50)
+        
+        # Act
+        report = await replayer.run_async()
+        await dispatcher.stop()
+        
+        # Assert
+        assert report.samples == 400
+        assert len(replayer._latencies) == 40  # Una tanda por cada 10 registros
+        assert len(received) == 200
@@ -0,0 +1,151 @@
+"""
+Tests para el módulo resampling.py.
+
+Este módulo contiene tests para SensorResampler.
+"""
+
+import pytest
+import sys
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorManager, SensorType
+from resampling import SensorResampler
+
+
+def record_linear(manager: SensorManager, sensor_type: SensorType, timestamps, slope: float) -> None:
+    """Registrar una señal lineal x = y = z = slope * t."""
+    ts = np.asarray(timestamps, dtype=np.float64)
+    manager.record_batch(sensor_type, slope * ts, slope * ts, slope * ts, ts)
+
+
+class TestSensorResampler:
+    """Tests para SensorResampler."""
+    
+    def test_aligns_sensors_on_common_clock(self):
+        """
+        Test de alineación de sensores con relojes distintos.
+        
+        Casos cubiertos:
+        - Éxito: Ticks uniformes a la frecuencia pedida
+        - Éxito: Valores interpolados en el instante de cada tick
+        - Límites: Solo ticks cubiertos por todos los sensores
+        """
+        # Arrange
+        manager = SensorManager(history_size=1000)
+        record_linear(manager, SensorType.ACCELEROMETER, np.arange(0.003, 1.0, 0.01), 1.0)
+        record_linear(manager, SensorType.GYROSCOPE, np.arange(0.011, 0.9, 0.007), -2.0)
+        resampler = SensorResampler(manager, [SensorType.ACCELEROMETER, SensorType.GYROSCOPE], rate_hz=100.0)
+        
+        # Act
+        ticks, frames = resampler.update()
+        
+        # Assert
+        assert ticks[0] >= 0.011 and ticks[-1] <= 0.9
+        np.testing.assert_allclose(np.diff(ticks), 0.01)
+        assert frames.shape == (len(ticks), 2, 3)
+        np.testing.assert_allclose(frames[:, 0, 0], ticks)
+        np.testing.assert_allclose(frames[:, 1, 2], -2.0 * ticks)
+    
+    def test_incremental_updates(self):
+        """
+        Test de actualización incremental.
+        
+        Casos cubiertos:
+        - Estado: Cada update produce solo ticks nuevos, sin repetir
+        - Límites: Sin datos nuevos no se producen ticks
+        """
+        # Arrange
+        manager = SensorManager(history_size=1000)
+        resampler = SensorResampler(manager, [SensorType.ACCELEROMETER], rate_hz=50.0)
+        record_linear(manager, SensorType.ACCELEROMETER, np.arange(0.0, 0.5, 0.005), 1.0)
+        
+        # Act
+        first_ticks, _ = resampler.update()
+        repeated, _ = resampler.update()
+        record_linear(manager, SensorType.ACCELEROMETER, np.arange(0.5, 1.0, 0.005), 1.0)
+        second_ticks, second_frames = resampler.update()
+        
+        # Assert
+        assert len(repeated) == 0
+        assert second_ticks[0] == pytest.approx(first_ticks[-1] + 0.02)
+        assert resampler.latest_tick == second_ticks[-1]
+        np.testing.assert_allclose(resampler.latest_frame, second_frames[-1])
+    
+    def test_incremental_update_reads_tail(self):
+        """
+        Test de lectura incremental del historial.
+        
+        Casos cubiertos:
+        - Éxito: Los frames coinciden con la interpolación sobre todo el historial
+        - ⚡ Performance: Tras el primer update solo se lee la cola reciente
+        """
+        # Arrange
+        manager = SensorManager(history_size=100000)
+        sensors = [SensorType.ACCELEROMETER, SensorType.GYROSCOPE]
+        for sensor_type, slope in zip(sensors, (1.0, -2.0)):
+            record_linear(manager, sensor_type, np.arange(100000) * 0.001, slope)
+        resampler = SensorResampler(manager, sensors, rate_hz=120.0)
+        resampler.update()
+        counts = []
+        get_array = manager.get_array
+        manager.get_array = lambda sensor_type, count=None: (
+            counts.append(count), get_array(sensor_type, count))[1]
+        
+        # Act
+        for sensor_type, slope in zip(sensors, (1.0, -2.0)):
+            record_linear(manager, sensor_type, 100.0 + np.arange(50) * 0.001, slope)
+        ticks, frames = resampler.update()
+        
+        # Assert
+        assert len(ticks) == 6
+        np.testing.assert_allclose(frames[:, 0, 0], ticks)
+        np.testing.assert_allclose(frames[:, 1, 1], -2.0 * ticks)
+        assert None not in counts and max(counts) <= 128
+    
+    def test_max_ticks_and_callbacks(self):
+        """
+        Test de límite de ticks y callbacks.
+        
+        Casos cubiertos:
+        - Límites: max_ticks limita la salida y el resto queda pendiente
+        - Estado: Callbacks reciben cada lote de frames
+        """
+        # Arrange
+        manager = SensorManager(history_size=1000)
+        record_linear(manager, SensorType.GRAVITY, np.arange(0.0, 1.0, 0.01), 1.0)
+        resampler = SensorResampler(manager, [SensorType.GRAVITY], rate_hz=10.0)
+        batches = []
+        resampler.on_frames(lambda ticks, frames: batches.append(len(ticks)))
+        
+        # Act
+        resampler.update(max_ticks=3)
+        resampler.update()
+        
+        # Assert
+        assert batches == [3, 7]
+    
+    def test_missing_sensor_and_invalid(self):
+        """
+        Test de sensor sin datos y parámetros inválidos.
+        
+        Casos cubiertos:
+        - Límites: Sin datos de algún sensor no hay ticks
+        - Error: ValueError sin sensores o con frecuencia no positiva
+        """
+        # Arrange
+        manager = SensorManager()
+        record_linear(manager, SensorType.ACCELEROMETER, [0.0, 1.0], 1.0)
+        resampler = SensorResampler(manager, [SensorType.ACCELEROMETER, SensorType.MAGNETOMETER])
+        
+        # Act
+        ticks, frames = resampler.update()
+        
+        # Assert
+        assert len(ticks) == 0 and frames.shape == (0, 2, 3)
+        with pytest.raises(ValueError):
+            SensorResampler(manager, [])
+        with pytest.raises(ValueError):
+            SensorResampler(manager, [SensorType.GRAVITY], rate_hz=0)
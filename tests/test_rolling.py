@@ -0,0 +1,117 @@
+"""
+Tests para el módulo rolling.py.
+
+Este módulo contiene tests para RollingWindowStats y su integración
+con SensorManager.
+"""
+
+import math
+import pytest
+import sys
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorManager, SensorType, SensorData
+from rolling import RollingWindowStats
+
+
+class TestRollingWindowStats:
+    """Tests para RollingWindowStats."""
+    
+    def test_matches_numpy_over_window(self):
+        """
+        Test de agregados frente a cálculo directo.
+        
+        Casos cubiertos:
+        - Éxito: Media, varianza, min, max y energía de la ventana
+        - Límites: La ventana se desliza al superar su tamaño
+        """
+        # Arrange
+        rng = np.random.default_rng(0)
+        samples = rng.normal(0, 2, (500, 3))
+        stats = RollingWindowStats(window=50)
+        
+        # Act & Assert
+        for i, (x, y, z) in enumerate(samples):
+            stats.push(x, y, z)
+            if i % 37 == 0 or i == len(samples) - 1:
+                window = samples[max(0, i - 49):i + 1]
+                magnitude = np.linalg.norm(window, axis=1)
+                assert stats.count == len(window)
+                assert stats.mean("x") == pytest.approx(window[:, 0].mean())
+                assert stats.variance("y") == pytest.approx(window[:, 1].var(), abs=1e-9)
+                assert stats.min("z") == window[:, 2].min()
+                assert stats.max("magnitude") == pytest.approx(magnitude.max())
+                assert stats.energy() == pytest.approx((magnitude ** 2).mean())
+    
+    def test_empty_and_invalid(self):
+        """
+        Test de ventana vacía y parámetros inválidos.
+        
+        Casos cubiertos:
+        - Límites: Ventana vacía devuelve 0 y nan
+        - Error: ValueError para ventana o canal inválidos
+        """
+        # Arrange
+        stats = RollingWindowStats(window=3)
+        
+        # Act & Assert
+        assert stats.mean() == 0.0
+        assert math.isnan(stats.min())
+        with pytest.raises(ValueError):
+            stats.mean("w")
+        with pytest.raises(ValueError):
+            RollingWindowStats(window=0)
+    
+    def test_snapshot(self):
+        """
+        Test de instantánea de agregados.
+        
+        Casos cubiertos:
+        - Éxito: Contiene todos los canales y la energía
+        """
+        # Arrange
+        stats = RollingWindowStats(window=2)
+        stats.push(3.0, 4.0, 0.0)
+        
+        # Act
+        snapshot = stats.snapshot()
+        
+        # Assert
+        assert snapshot["count"] == 1
+        assert snapshot["magnitude"]["mean"] == 5.0
+        assert snapshot["energy"] == pytest.approx(25.0)
+
+
+class TestSensorManagerWindows:
+    """Tests para las ventanas de SensorManager."""
+    
+    def test_updated_by_record_data_and_batch(self):
+        """
+        Test de actualización como efecto de registrar datos.
+        
+        Casos cubiertos:
+        - Éxito: record_data y record_batch actualizan las ventanas
+        - Estado: track_window inicializa con el historial existente
+        - Estado: Ventanas de distinto tamaño por sensor
+        """
+        # Arrange
+        manager = SensorManager(history_size=100)
+        sensor_type = SensorType.ACCELEROMETER
+        for i in range(5):
+            manager.record_data(sensor_type, SensorData(sensor_type, float(i), 0.0, 0.0, float(i)))
+        
+        # Act
+        short = manager.track_window(sensor_type, 3)
+        long = manager.track_window(sensor_type, 10)
+        manager.record_batch(sensor_type, [10.0, 20.0], [0.0, 0.0], [0.0, 0.0], [5.0, 6.0])
+        
+        # Assert
+        assert short.mean("x") == pytest.approx((4.0 + 10.0 + 20.0) / 3)
+        assert long.count == 7
+        assert long.min("x") == 0.0
+        assert manager.get_window_stats(sensor_type, 3) is short
+        assert manager.track_window(sensor_type, 3) is short
+        assert manager.get_window_stats(SensorType.GYROSCOPE, 3) is None
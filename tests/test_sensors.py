@@ -6,11 +6,12 @@ Este módulo contiene tests para SensorManager.
 
 import pytest
 import sys
+import numpy as np
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from sensors import SensorManager, SensorType, SensorData
+from sensors import SensorManager, SensorType, SensorData, SensorRingBuffer
 
 
 class TestSensorManager:
@@ -149,6 +150,387 @@ class TestSensorManager:
         # Assert
         assert len(manager.data_history[sensor_type]) == 100
     
+    def test_configurable_history_size(self):
+        """
+        Test de capacidad configurable del historial.
+        
+        Casos cubiertos:
+        - Éxito: La capacidad se respeta al superar el límite
+        - Estado: Se conservan las muestras más recientes en orden
+        """
+        # Arrange
+        manager = SensorManager(history_size=1000)
+        sensor_type = SensorType.GYROSCOPE
+        
+        # Act
+        for i in range(1500):
+            manager.record_data(sensor_type, SensorData(sensor_type, i, i, i, float(i)))
+        
+        # Assert
+        history = manager.get_data(sensor_type)
+        assert len(history) == 1000
+        assert history[0].timestamp == 500.0
+        assert history[-1].timestamp == 1499.0
+    
+    def test_record_batch(self):
+        """
+        Test de registro de un bloque de muestras.
+        
+        Casos cubiertos:
+        - Éxito: El bloque completo se añade al historial
+        - Estado: Callbacks por muestra reciben un SensorData por fila
+        - Estado: Callbacks por lotes reciben el bloque una sola vez
+        """
+        # Arrange
+        manager = SensorManager()
+        sensor_type = SensorType.ACCELEROMETER
+        per_sample = []
+        blocks = []
+        manager.register_callback(sensor_type, per_sample.append)
+        manager.register_callback(sensor_type, lambda t, b: blocks.append((t, b)), batch=True)
+        
+        # Act
+        manager.record_batch(sensor_type, [1, 2, 3], [4, 5, 6], [7, 8, 9], [0.1, 0.2, 0.3])
+        
+        # Assert
+        assert len(manager.get_data(sensor_type)) == 3
+        assert [d.x for d in per_sample] == [1.0, 2.0, 3.0]
+        assert len(blocks) == 1
+        assert blocks[0][0] == sensor_type
+        assert list(blocks[0][1]["z"]) == [7.0, 8.0, 9.0]
+        assert not blocks[0][1].flags.writeable
+    
+    def test_record_batch_wraparound(self):
+        """
+        Test de bloques que superan o rodean la capacidad.
+        
+        Casos cubiertos:
+        - Límites: Bloque mayor que la capacidad conserva el final
+        - Límites: Bloque que cruza el final del buffer mantiene el orden
+        """
+        # Arrange
+        manager = SensorManager(history_size=5)
+        sensor_type = SensorType.GYROSCOPE
+        ts = [float(i) for i in range(8)]
+        
+        # Act & Assert
+        manager.record_batch(sensor_type, ts, ts, ts, ts)
+        assert [d.timestamp for d in manager.get_data(sensor_type)] == [3.0, 4.0, 5.0, 6.0, 7.0]
+        
+        manager.record_batch(sensor_type, [8, 9, 10], [0] * 3, [0] * 3, [8.0, 9.0, 10.0])
+        assert [d.timestamp for d in manager.get_data(sensor_type)] == [6.0, 7.0, 8.0, 9.0, 10.0]
+    
+    def test_record_batch_length_mismatch(self):
+        """
+        Test de bloque con columnas de distinta longitud.
+        
+        Casos cubiertos:
+        - Error: ValueError si las longitudes no coinciden
+        """
+        # Arrange
+        manager = SensorManager()
+        
+        # Act & Assert
+        with pytest.raises(ValueError):
+            manager.record_batch(SensorType.GRAVITY, [1, 2], [1], [1, 2], [0.0, 1.0])
+    
+    def test_batch_callback_on_record_data(self):
+        """
+        Test de callback por lotes con registro individual.
+        
+        Casos cubiertos:
+        - Éxito: record_data entrega un bloque de una fila
+        """
+        # Arrange
+        manager = SensorManager()
+        blocks = []
+        manager.register_callback(SensorType.GRAVITY, lambda t, b: blocks.append(b), batch=True)
+        
+        # Act
+        manager.record_data(SensorType.GRAVITY, SensorData(SensorType.GRAVITY, 1.0, 2.0, 3.0, 4.0))
+        
+        # Assert
+        assert len(blocks) == 1
+        assert blocks[0].shape == (1,)
+        assert blocks[0]["timestamp"][0] == 4.0
+    
+    def test_unregister_callback(self):
+        """
+        Test de eliminación de callbacks.
+        
+        Casos cubiertos:
+        - Éxito: El callback eliminado deja de recibir datos
+        - Error: Eliminar un callback no registrado devuelve False
+        """
+        # Arrange
+        manager = SensorManager()
+        received = []
+        callback = lambda t, b: received.append(b)
+        manager.register_callback(SensorType.GRAVITY, callback, batch=True)
+        
+        # Act
+        removed = manager.unregister_callback(SensorType.GRAVITY, callback, batch=True)
+        manager.record_data(SensorType.GRAVITY, SensorData(SensorType.GRAVITY, 1.0, 2.0, 3.0, 4.0))
+        
+        # Assert
+        assert removed is True
+        assert received == []
+        assert manager.unregister_callback(SensorType.GRAVITY, callback, batch=True) is False
+        assert manager.unregister_callback(SensorType.GRAVITY, callback) is False
+    
+    def test_deadband_with_keepalive(self):
+        """
+        Test de supresión por deadband.
+        
+        Casos cubiertos:
+        - Éxito: El ruido por debajo del umbral no se emite
+        - Éxito: Un cambio grande se emite de inmediato
+        - Estado: keepalive emite periódicamente aunque no haya cambio
+        - Estado: El historial conserva todas las muestras
+        """
+        # Arrange
+        manager = SensorManager(history_size=1000)
+        received = []
+        manager.register_callback(SensorType.ACCELEROMETER, received.append,
+                                  deadband=0.05, keepalive=0.5)
+        noise = np.random.default_rng(0).normal(0.0, 0.005, 300)
+        
+        # Act
+        for i in range(300):
+            x = noise[i] + (1.0 if i >= 260 else 0.0)
+            manager.record_data(SensorType.ACCELEROMETER,
+                                SensorData(SensorType.ACCELEROMETER, x, 0.0, 0.0, i / 100.0))
+        
+        # Assert
+        times = [d.timestamp for d in received]
+        assert times[:6] == [0.0, 0.5, 1.0, 1.5, 2.0, 2.5]
+        assert times[6] == 2.6 and len(times) == 7
+        assert len(manager.get_data(SensorType.ACCELEROMETER)) == 300
+        stats = manager.get_gate_stats(SensorType.ACCELEROMETER)
+        assert stats[0]["passed"] == 7 and stats[0]["suppressed"] == 293
+    
+    def test_max_rate_and_min_interval(self):
+        """
+        Test de limitación de frecuencia.
+        
+        Casos cubiertos:
+        - Éxito: max_rate limita las emisiones por segundo
+        - Estado: Cada suscripción tiene su propio filtro
+        - Límites: Si el tiempo retrocede se vuelve a emitir
+        """
+        # Arrange
+        manager = SensorManager()
+        limited, everything = [], []
+        manager.register_callback(SensorType.GYROSCOPE, limited.append, max_rate=25.0,
+                                  min_interval=0.01)
+        manager.register_callback(SensorType.GYROSCOPE, everything.append)
+        values = np.arange(200, dtype=float)
+        
+        # Act
+        manager.record_batch(SensorType.GYROSCOPE, values, values, values, values / 100.0)
+        manager.record_data(SensorType.GYROSCOPE, SensorData(SensorType.GYROSCOPE, 0, 0, 0, 0.0))
+        
+        # Assert
+        assert len(everything) == 201
+        assert [d.timestamp for d in limited[:3]] == [0.0, 0.04, 0.08]
+        assert len(limited) == 51
+    
+    def test_gate_parameters(self):
+        """
+        Test de parámetros de supresión.
+        
+        Casos cubiertos:
+        - Error: Opciones de supresión con batch=True lanzan ValueError
+        - Error: Valores negativos lanzan ValueError
+        - Error: Repetir un callback con filtro de emisión lanza ValueError
+        - Estado: Al eliminar el callback se elimina su filtro
+        """
+        # Arrange
+        manager = SensorManager()
+        callback = lambda d: None
+        plain = lambda d: None
+        
+        # Act & Assert
+        with pytest.raises(ValueError):
+            manager.register_callback(SensorType.GRAVITY, lambda t, b: None, batch=True, deadband=0.1)
+        with pytest.raises(ValueError):
+            manager.register_callback(SensorType.GRAVITY, callback, deadband=-1.0)
+        with pytest.raises(ValueError):
+            manager.register_callback(SensorType.GRAVITY, callback, max_rate=0.0)
+        manager.register_callback(SensorType.GRAVITY, callback, deadband=0.1)
+        with pytest.raises(ValueError):
+            manager.register_callback(SensorType.GRAVITY, callback, deadband=0.5)
+        with pytest.raises(ValueError):
+            manager.register_callback(SensorType.GRAVITY, callback)
+        manager.register_callback(SensorType.GRAVITY, plain)
+        with pytest.raises(ValueError):
+            manager.register_callback(SensorType.GRAVITY, plain, max_rate=10.0)
+        manager.register_callback(SensorType.GRAVITY, plain)
+        assert manager.unregister_callback(SensorType.GRAVITY, callback)
+        assert manager.callback_gates == {}
+    
+    def test_rate_reduction_modes(self):
+        """
+        Test de suscripciones con frecuencia reducida.
+        
+        Casos cubiertos:
+        - Éxito: rate entrega una muestra por periodo con latest, mean y max_magnitude
+        - Estado: Las suscripciones sin rate siguen recibiendo todas las muestras
+        - Estado: stop() entrega el periodo abierto
+        """
+        # Arrange
+        manager = SensorManager()
+        latest, mean, peak, everything = [], [], [], []
+        manager.register_callback(SensorType.ACCELEROMETER, latest.append, rate=10.0)
+        manager.register_callback(SensorType.ACCELEROMETER, mean.append, rate=10.0, reduce="mean")
+        manager.register_callback(SensorType.ACCELEROMETER, peak.append, rate=10.0,
+                                  reduce="max_magnitude")
+        manager.register_callback(SensorType.ACCELEROMETER, everything.append)
+        timestamps = np.arange(100) / 100.0
+        xs = np.arange(100, dtype=float)
+        xs[55] = 1000.0
+        
+        # Act
+        manager.record_batch(SensorType.ACCELEROMETER, xs, np.zeros(100), np.zeros(100), timestamps)
+        manager.stop()
+        
+        # Assert
+        assert len(everything) == 100
+        assert len(latest) == len(mean) == len(peak) == 10
+        assert [d.x for d in latest[:2]] == [9.0, 19.0]
+        assert mean[0].x == pytest.approx(4.5)
+        assert mean[0].timestamp == pytest.approx(0.045)
+        assert peak[5].x == 1000.0 and peak[5].timestamp == 0.55
+        stats = manager.get_rate_stats(SensorType.ACCELEROMETER)
+        assert [s["emitted"] for s in stats] == [10, 10, 10]
+        assert stats[0]["samples_in"] == 100
+    
+    def test_rate_block_matches_per_sample(self):
+        """
+        Test de reducción por bloques.
+        
+        Casos cubiertos:
+        - Éxito: Bloques de cualquier tamaño dan lo mismo que muestra a muestra
+        - Estado: Los periodos abiertos se arrastran entre bloques
+        """
+        # Arrange
+        rng = np.random.default_rng(7)
+        n = 2000
+        xs, ys, zs = rng.normal(size=(3, n))
+        timestamps = np.cumsum(rng.uniform(0.001, 0.01, n))
+        results = {}
+        
+        for mode in ("latest", "mean", "max_magnitude"):
+            per_sample, per_block = [], []
+            manager = SensorManager()
+            manager.register_callback(SensorType.GYROSCOPE, per_sample.append, rate=30.0, reduce=mode)
+            other = SensorManager()
+            other.register_callback(SensorType.GYROSCOPE, per_block.append, rate=30.0, reduce=mode)
+            
+            # Act
+            for i in range(n):
+                manager.record_data(SensorType.GYROSCOPE,
+                                    SensorData(SensorType.GYROSCOPE, xs[i], ys[i], zs[i], timestamps[i]))
+            for start in range(0, n, 37):
+                stop = start + 37
+                other.record_batch(SensorType.GYROSCOPE, xs[start:stop], ys[start:stop],
+                                   zs[start:stop], timestamps[start:stop])
+            manager.flush_rates()
+            other.flush_rates()
+            results[mode] = (per_sample, per_block)
+        
+        # Assert
+        for per_sample, per_block in results.values():
+            assert len(per_sample) == len(per_block) > 100
+            for a, b in zip(per_sample, per_block):
+                assert a.timestamp == pytest.approx(b.timestamp)
+                assert (a.x, a.y, a.z) == pytest.approx((b.x, b.y, b.z))
+    
+    def test_rate_parameters(self):
+        """
+        Test de parámetros de frecuencia.
+        
+        Casos cubiertos:
+        - Error: rate con batch=True, rate no positivo o modo desconocido lanzan ValueError
+        - Éxito: rate se combina con deadband sobre las muestras reducidas
+        - Error: Repetir un callback con rate lanza ValueError
+        - Estado: Al eliminar el callback se elimina su reductor
+        """
+        # Arrange
+        manager = SensorManager()
+        received = []
+        
+        # Act & Assert
+        with pytest.raises(ValueError):
+            manager.register_callback(SensorType.GRAVITY, lambda t, b: None, batch=True, rate=10.0)
+        with pytest.raises(ValueError):
+            manager.register_callback(SensorType.GRAVITY, received.append, rate=0.0)
+        with pytest.raises(ValueError):
+            manager.register_callback(SensorType.GRAVITY, received.append, rate=10.0, reduce="median")
+        manager.register_callback(SensorType.GRAVITY, received.append, rate=10.0, deadband=0.5,
+                                  keepalive=None)
+        manager.record_batch(SensorType.GRAVITY, np.ones(100), np.zeros(100), np.zeros(100),
+                             np.arange(100) / 100.0)
+        assert len(received) == 1
+        rated = lambda d: None
+        manager.register_callback(SensorType.GRAVITY, rated, rate=10.0)
+        with pytest.raises(ValueError):
+            manager.register_callback(SensorType.GRAVITY, rated, rate=20.0)
+        with pytest.raises(ValueError):
+            manager.register_callback(SensorType.GRAVITY, rated)
+        assert len(manager.callbacks[SensorType.GRAVITY]) == 2
+        assert manager.unregister_callback(SensorType.GRAVITY, rated)
+        assert manager.unregister_callback(SensorType.GRAVITY, received.append)
+        assert manager.callback_reducers == {} and manager.callback_gates == {}
+    
+    def test_get_array(self):
+        """
+        Test de obtención de datos como array.
+        
+        Casos cubiertos:
+        - Éxito: Columnas nombradas con las últimas N muestras
+        - Estado: El array es de solo lectura
+        - Límites: Sensor sin datos devuelve array vacío
+        """
+        # Arrange
+        manager = SensorManager()
+        sensor_type = SensorType.ACCELEROMETER
+        for i in range(5):
+            manager.record_data(sensor_type, SensorData(sensor_type, i, 2 * i, 3 * i, float(i)))
+        
+        # Act
+        result = manager.get_array(sensor_type, count=3)
+        
+        # Assert
+        assert list(result["x"]) == [2.0, 3.0, 4.0]
+        assert list(result["y"]) == [4.0, 6.0, 8.0]
+        assert not result.flags.writeable
+        assert len(manager.get_array(SensorType.MAGNETOMETER)) == 0
+    
+    def test_get_array_views_and_wrap(self):
+        """
+        Test de vistas sin copia y ventanas que dan la vuelta.
+        
+        Casos cubiertos:
+        - Éxito: Ventana contigua es una vista del buffer
+        - Límites: Ventana que cruza el final se devuelve ordenada
+        """
+        # Arrange
+        manager = SensorManager(history_size=4)
+        sensor_type = SensorType.GYROSCOPE
+        for i in range(6):
+            manager.record_data(sensor_type, SensorData(sensor_type, i, i, i, float(i)))
+        buffer = manager.data_history[sensor_type]
+        
+        # Act
+        contiguous = manager.get_array(sensor_type, count=2)
+        wrapped = manager.get_array(sensor_type)
+        
+        # Assert
+        assert np.shares_memory(contiguous, buffer._buffer)
+        assert list(contiguous["timestamp"]) == [4.0, 5.0]
+        assert list(wrapped["timestamp"]) == [2.0, 3.0, 4.0, 5.0]
+    
     def test_start_stop(self):
         """
         Test de inicio y detención.
@@ -169,6 +551,87 @@ class TestSensorManager:
         assert manager.is_active is False
 
 
+class TestSensorRingBuffer:
+    """Tests para SensorRingBuffer."""
+    
+    def test_append_and_index(self):
+        """
+        Test de inserción e indexado.
+        
+        Casos cubiertos:
+        - Éxito: Las muestras se recuperan como SensorData
+        - Estado: Índices negativos y slices funcionan
+        """
+        # Arrange
+        buffer = SensorRingBuffer(SensorType.ACCELEROMETER, capacity=4)
+        
+        # Act
+        for i in range(3):
+            buffer.append(i, i + 0.5, -i, float(i))
+        
+        # Assert
+        assert len(buffer) == 3
+        assert buffer[0] == SensorData(SensorType.ACCELEROMETER, 0.0, 0.5, 0.0, 0.0)
+        assert buffer[-1].x == 2.0
+        assert [d.timestamp for d in buffer[1:]] == [1.0, 2.0]
+    
+    def test_wraparound(self):
+        """
+        Test de sobrescritura circular.
+        
+        Casos cubiertos:
+        - Límites: Al llenarse se descarta la muestra más antigua
+        - Estado: El orden lógico se mantiene tras dar la vuelta
+        """
+        # Arrange
+        buffer = SensorRingBuffer(SensorType.GRAVITY, capacity=3)
+        
+        # Act
+        for i in range(7):
+            buffer.append(i, i, i, float(i))
+        
+        # Assert
+        assert len(buffer) == 3
+        assert [d.timestamp for d in buffer] == [4.0, 5.0, 6.0]
+    
+    def test_index_out_of_range(self):
+        """
+        Test de índice fuera de rango.
+        
+        Casos cubiertos:
+        - Error: IndexError para índices inválidos
+        - Error: ValueError para capacidad no positiva
+        """
+        # Arrange
+        buffer = SensorRingBuffer(SensorType.GRAVITY, capacity=2)
+        buffer.append(1.0, 1.0, 1.0, 1.0)
+        
+        # Act & Assert
+        with pytest.raises(IndexError):
+            buffer[1]
+        with pytest.raises(ValueError):
+            SensorRingBuffer(SensorType.GRAVITY, capacity=0)
+    
+    def test_clear(self):
+        """
+        Test de vaciado del buffer.
+        
+        Casos cubiertos:
+        - Éxito: El buffer queda vacío y reutilizable
+        """
+        # Arrange
+        buffer = SensorRingBuffer(SensorType.GRAVITY, capacity=2)
+        buffer.append(1.0, 1.0, 1.0, 1.0)
+        
+        # Act
+        buffer.clear()
+        buffer.append(2.0, 2.0, 2.0, 2.0)
+        
+        # Assert
+        assert len(buffer) == 1
+        assert buffer[0].x == 2.0
+
+
 class TestSensorData:
     """Tests para SensorData."""
     
@@ -189,6 +652,22 @@ class TestSensorData:
         assert data.z == 3.0
         assert data.timestamp == 1234567890.0
     
+    def test_slots(self):
+        """
+        Test de almacenamiento compacto.
+        
+        Casos cubiertos:
+        - Estado: Sin __dict__ por instancia
+        - Error: No se pueden añadir atributos arbitrarios
+        """
+        # Arrange
+        data = SensorData(SensorType.GRAVITY, 0.0, 0.0, 9.8, 1.0)
+        
+        # Act & Assert
+        assert not hasattr(data, "__dict__")
+        with pytest.raises(AttributeError):
+            data.extra = 1
+    
     def test_to_dict(self):
         """
         Test de conversión a diccionario.
@@ -0,0 +1,232 @@
+"""
+Tests para el módulo storage.py.
+
+Este módulo contiene tests para HistoryWriter.
+"""
+
+import asyncio
+import pytest
+import sys
+import time
+import sqlite3
+from datetime import datetime
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensors import SensorManager, SensorType, SensorData
+from communication import CommunicationManager, OSCMessage, MIDIEvent
+from storage import HistoryWriter
+
+
+class TestHistoryWriter:
+    """Tests para HistoryWriter."""
+    
+    @pytest.mark.asyncio
+    async def test_persist_sensor_data(self, tmp_path):
+        """
+        Test de persistencia de muestras.
+        
+        Casos cubiertos:
+        - Éxito: Muestras individuales y bloques se escriben y consultan
+        - Estado: La base usa WAL e índice por (sensor_type, timestamp)
+        - Límites: Consulta por rango temporal
+        """
+        # Arrange
+        writer = HistoryWriter(tmp_path / "history.db", batch_size=64)
+        await writer.start()
+        manager = SensorManager()
+        manager.register_callback(SensorType.GYROSCOPE, writer.record_data)
+        writer.attach(manager, [SensorType.ACCELEROMETER])
+        
+        # Act
+        manager.record_data(SensorType.GYROSCOPE, SensorData(SensorType.GYROSCOPE, 1.0, 2.0, 3.0, 0.5))
+        values = np.arange(200, dtype=float)
+        manager.record_batch(SensorType.ACCELEROMETER, values, values, values, values)
+        written = await writer.flush()
+        in_range = await writer.fetch_sensor_data(SensorType.ACCELEROMETER, 10.0, 19.0)
+        gyro = await writer.fetch_sensor_data(SensorType.GYROSCOPE)
+        await writer.stop()
+        
+        # Assert
+        assert written == 201
+        assert writer.transactions == 4
+        assert [d.x for d in in_range] == list(range(10, 20))
+        assert gyro[0].to_dict()["x"] == 1.0 and gyro[0].type == SensorType.GYROSCOPE
+        with sqlite3.connect(tmp_path / "history.db") as db:
+            assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            indexes = {row[1] for row in db.execute("PRAGMA index_list(sensor_data)")}
+            assert "idx_sensor_data_type_time" in indexes
+    
+    @pytest.mark.asyncio
+    async def test_persist_messages(self, tmp_path):
+        """
+        Test de persistencia del historial de mensajes.
+        
+        Casos cubiertos:
+        - Éxito: Las entradas OSC y MIDI se recuperan con su formato
+        - Estado: El volcado periódico escribe sin flush explícito
+        """
+        # Arrange
+        writer = HistoryWriter(tmp_path / "history.db", flush_interval=0.01)
+        await writer.start()
+        comm = CommunicationManager()
+        writer.attach(comm_manager=comm)
+        
+        # Act
+        comm.send_osc(OSCMessage("/a", [1, 2.5]), "localhost:8000")
+        comm.send_midi(MIDIEvent(60, 100))
+        deadline = time.perf_counter() + 2.0
+        while writer.rows_written < 2 and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+        osc = await writer.fetch_messages("osc")
+        everything = await writer.fetch_messages()
+        await writer.stop()
+        
+        # Assert
+        assert writer.pending == 0
+        assert osc == [comm.message_history[0]]
+        assert [e["type"] for e in everything] == ["osc", "midi"]
+    
+    @pytest.mark.asyncio
+    async def test_message_timestamps(self, tmp_path):
+        """
+        Test de marcas de tiempo de los mensajes persistidos.
+        
+        Casos cubiertos:
+        - Éxito: Se guarda la marca numérica del registro, sin reinterpretarla
+        - Éxito: Las entradas construidas conservan sus microsegundos
+        - Error: Una entrada sin timestamp lanza ValueError
+        """
+        # Arrange
+        writer = HistoryWriter(tmp_path / "history.db", flush_interval=60.0)
+        await writer.start()
+        comm = CommunicationManager()
+        records = []
+        comm.on_message(lambda *record: records.append(record), record=True)
+        writer.attach(comm_manager=comm)
+        entry = {"type": "osc", "message": {"address": "/m", "args": [1],
+                                            "timestamp": "2026-10-18T12:00:00.123456"},
+                 "target": "localhost:8000", "sent": False}
+        
+        # Act
+        comm.send_osc(OSCMessage("/a", [1.0]), "localhost:8000")
+        writer.record_message(entry)
+        with pytest.raises(ValueError):
+            writer.record_message({"type": "midi", "message": {"note": 60}, "sent": False})
+        await writer.flush()
+        fetched = await writer.fetch_messages("osc")
+        await writer.stop()
+        
+        # Assert
+        with sqlite3.connect(tmp_path / "history.db") as db:
+            epochs = [row[0] for row in db.execute("SELECT timestamp FROM messages ORDER BY id")]
+        assert epochs[0] == records[0][3] / 1e9
+        assert epochs[1] == pytest.approx(datetime.fromisoformat(
+            "2026-10-18T12:00:00.123456").timestamp(), abs=1e-6)
+        assert comm.message_history[0] in fetched and entry in fetched
+    
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending(self, tmp_path):
+        """
+        Test de cierre con filas pendientes.
+        
+        Casos cubiertos:
+        - Estado: stop() escribe la cola antes de cerrar
+        - Límites: La cola acotada descarta las filas más antiguas
+        """
+        # Arrange
+        writer = HistoryWriter(tmp_path / "history.db", flush_interval=60.0, max_pending=5)
+        await writer.start()
+        
+        # Act
+        for i in range(8):
+            writer.record_data(SensorData(SensorType.GRAVITY, float(i), 0.0, 0.0, float(i)))
+        await writer.stop()
+        
+        # Assert
+        assert writer.dropped == 3
+        with sqlite3.connect(tmp_path / "history.db") as db:
+            xs = [row[0] for row in db.execute("SELECT x FROM sensor_data ORDER BY timestamp")]
+        assert xs == [3.0, 4.0, 5.0, 6.0, 7.0]
+    
+    @pytest.mark.asyncio
+    async def test_flush_bounded_under_producer(self, tmp_path):
+        """
+        Test de volcado con un productor continuo.
+        
+        Casos cubiertos:
+        - Estado: flush() escribe solo lo pendiente al empezar y termina
+        - Estado: Lo encolado durante el volcado queda para el siguiente
+        - Error: Consultar antes de start() lanza RuntimeError
+        """
+        # Arrange
+        writer = HistoryWriter(tmp_path / "history.db", batch_size=10, flush_interval=60.0)
+        with pytest.raises(RuntimeError):
+            await writer.fetch_sensor_data(SensorType.GRAVITY)
+        with pytest.raises(RuntimeError):
+            await writer.fetch_messages()
+        await writer.start()
+        for i in range(50):
+            writer.record_data(SensorData(SensorType.GRAVITY, float(i), 0.0, 0.0, float(i)))
+        take = writer._take
+        
+        def take_and_produce(rows, limit):
+            # Simular un hilo de captura que encola más filas en cada lote
+            taken = take(rows, limit)
+            for _ in range(limit):
+                writer.record_data(SensorData(SensorType.GRAVITY, 0.0, 0.0, 0.0, 1e6))
+            return taken
+        
+        writer._take = take_and_produce
+        
+        # Act
+        written = await asyncio.wait_for(writer.flush(), 2.0)
+        pending = writer.pending
+        writer._take = take
+        await writer.stop()
+        
+        # Assert
+        assert written == 50
+        assert pending > 0
+        assert writer.rows_written == 50 + pending
+    
+    def test_invalid_parameters(self, tmp_path):
+        """
+        Test de parámetros inválidos.
+        
+        Casos cubiertos:
+        - Error: batch_size no positivo lanza ValueError
+        """
+        # Act & Assert
+        with pytest.raises(ValueError):
+            HistoryWriter(tmp_path / "history.db", batch_size=0)
+    
+    @pytest.mark.asyncio
+    async def test_throughput(self, tmp_path):
+        """
+        Test de rendimiento de escritura.
+        
+        Casos cubiertos:
+        - ⚡ Performance: Encolar 20k filas es barato y se escriben > 5k filas/s
+        """
+        # Arrange
+        writer = HistoryWriter(tmp_path / "history.db", batch_size=5000, flush_interval=60.0)
+        await writer.start()
+        block = np.zeros(20000, dtype=[("x", "f8"), ("y", "f8"), ("z", "f8"), ("timestamp", "f8")])
+        block["timestamp"] = np.arange(20000) / 100.0
+        
+        # Act
+        start = time.perf_counter()
+        writer.record_block(SensorType.ACCELEROMETER, block)
+        enqueue = time.perf_counter() - start
+        start = time.perf_counter()
+        written = await writer.flush()
+        elapsed = time.perf_counter() - start
+        await writer.stop()
+        
+        # Assert
+        assert written == 20000
+        assert enqueue < 0.5
+        assert written / elapsed > 5000